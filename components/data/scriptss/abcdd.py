@@ -33,6 +33,13 @@ from imblearn.combine import SMOTETomek
 from skopt import BayesSearchCV
 from skopt.space import Real, Integer, Categorical
 
+# Dtype schema shared with the generator
+from sysdata import apply_schema
+# Feature engineering shared with benchmark.py
+from features import (FEATURES, HISTORY_FEATURES, MODEL_CATEGORICAL_FEATURES, MODEL_NUMERICAL_FEATURES,
+                      FeatureState, days_to_nearest_holiday, engineer_features, identify_demand_spikes,
+                      model_input_columns)
+
 # Set random seed for reproducibility
 np.random.seed(42)
 
@@ -41,6 +48,56 @@ model_dir = "models"
 if not os.path.exists(model_dir):
     os.makedirs(model_dir)
 
+# Synthetic dataset written by sysdata.py, as a CSV or a Parquet directory
+# partitioned by Year, City and Area (python sysdata.py --format parquet)
+DATASET_CSV = 'mumbai_healthcare_demand_dataset.csv'
+DATASET_PARQUET = 'mumbai_healthcare_demand_dataset.parquet'
+
+def load_dataset(start_date=None, end_date=None, areas=None, parquet_path=DATASET_PARQUET, csv_path=DATASET_CSV,
+                 cities=None):
+    """Load the synthetic dataset, from the Parquet store when it exists, else from the CSV.
+
+    Rows are limited to start_date..end_date (inclusive) and the given cities and
+    areas. With Parquet the filters are pushed down: only matching Year/City/Area
+    partitions are opened and row groups outside the dates are skipped. Either way
+    the frame comes back in the sysdata SCHEMA dtypes.
+    """
+    start = None if start_date is None else pd.Timestamp(start_date)
+    end = None if end_date is None else pd.Timestamp(end_date)
+    if not os.path.exists(parquet_path):
+        # 'None' is an Insurance category, not a missing value
+        df = pd.read_csv(csv_path, keep_default_na=False)
+        # Convert date to datetime
+        df['Date'] = pd.to_datetime(df['Date'])
+        mask = pd.Series(True, index=df.index)
+        if start is not None:
+            mask &= df['Date'] >= start
+        if end is not None:
+            mask &= df['Date'] <= end
+        if cities is not None:
+            mask &= df['City'].isin(cities)
+        if areas is not None:
+            mask &= df['Area'].isin(areas)
+        return apply_schema(df[mask].reset_index(drop=True))
+
+    filters = []
+    if start is not None:
+        filters += [('Year', '>=', start.year), ('Date', '>=', start)]
+    if end is not None:
+        filters += [('Year', '<=', end.year), ('Date', '<=', end)]
+    if cities is not None:
+        filters.append(('City', 'in', list(cities)))
+    if areas is not None:
+        filters.append(('Area', 'in', list(areas)))
+    df = pd.read_parquet(parquet_path, filters=filters or None)
+
+    # Partition columns come back last and as categories; restore the CSV layout
+    for col in ['Area', 'City']:
+        df.insert(df.columns.get_loc('Gender') + 1, col, df.pop(col))
+    df = apply_schema(df)
+    # Partitions are read one Year/City/Area at a time; restore date order
+    return df.sort_values('Date', kind='stable').reset_index(drop=True)
+
 # Function to check if models are already trained and saved
 def models_exist():
     required_files = [
@@ -49,152 +106,11 @@ def models_exist():
         f"{model_dir}/spike_model.pkl",
         f"{model_dir}/area_models.pkl",
         f"{model_dir}/area_results.pkl",
-        f"{model_dir}/optimal_threshold.pkl"
+        f"{model_dir}/optimal_threshold.pkl",
+        f"{model_dir}/feature_state.pkl"
     ]
     return all(os.path.exists(file) for file in required_files)
 
-# Advanced Feature Engineering
-def advanced_feature_engineering(df):
-    # Create a copy to avoid modifying the original
-    data = df.copy()
-    
-    # Extract date components
-    data['DayOfWeek'] = data['Date'].dt.dayofweek
-    data['Month'] = data['Date'].dt.month
-    data['Year'] = data['Date'].dt.year
-    data['Day'] = data['Date'].dt.day
-    data['Quarter'] = data['Date'].dt.quarter
-    data['IsWeekend'] = (data['DayOfWeek'] >= 5).astype(int)
-    data['DayOfYear'] = data['Date'].dt.dayofyear
-    data['WeekOfYear'] = data['Date'].dt.isocalendar().week
-    
-    # Create holiday proximity feature (days before/after holiday)
-    holiday_dates = data[data['IsHoliday'] == 1]['Date'].unique()
-    data['DaysToHoliday'] = 100  # Default large value
-    
-    for date in data['Date'].unique():
-        days_to_holiday = min([abs((date - pd.Timestamp(hdate)).days) for hdate in holiday_dates], default=100)
-        data.loc[data['Date'] == date, 'DaysToHoliday'] = days_to_holiday
-    
-    # Create seasonal indicators using sine and cosine transforms for cyclical features
-    data['MonthSin'] = np.sin(2 * np.pi * data['Month']/12)
-    data['MonthCos'] = np.cos(2 * np.pi * data['Month']/12)
-    data['DayOfYearSin'] = np.sin(2 * np.pi * data['DayOfYear']/365)
-    data['DayOfYearCos'] = np.cos(2 * np.pi * data['DayOfYear']/365)
-    
-    # Create lag features for time series
-    for lag in [7, 14, 28]:  # 1 week, 2 weeks, 4 weeks
-        data[f'ER_Lag_{lag}'] = data.groupby(['Area'])['ER_Visits'].transform(
-            lambda x: x.shift(lag))
-        data[f'OPD_Lag_{lag}'] = data.groupby(['Area'])['OPD_Visits'].transform(
-            lambda x: x.shift(lag))
-    
-    # Create rolling averages
-    for window in [7, 14, 28]:
-        data[f'ER_RollingMean_{window}'] = data.groupby(['Area'])['ER_Visits'].transform(
-            lambda x: x.shift(1).rolling(window=window, min_periods=1).mean())
-        data[f'OPD_RollingMean_{window}'] = data.groupby(['Area'])['OPD_Visits'].transform(
-            lambda x: x.shift(1).rolling(window=window, min_periods=1).mean())
-    
-    # Add moving averages with different windows
-    for window in [3, 5]:
-        data[f'ER_MA_{window}'] = data.groupby(['Area'])['ER_Visits'].transform(
-            lambda x: x.shift(1).rolling(window=window, min_periods=1).mean())
-        data[f'OPD_MA_{window}'] = data.groupby(['Area'])['OPD_Visits'].transform(
-            lambda x: x.shift(1).rolling(window=window, min_periods=1).mean())
-    
-    # Add exponentially weighted moving averages
-    data['ER_EWMA'] = data.groupby(['Area'])['ER_Visits'].transform(
-        lambda x: x.shift(1).ewm(span=7).mean())
-    data['OPD_EWMA'] = data.groupby(['Area'])['OPD_Visits'].transform(
-        lambda x: x.shift(1).ewm(span=7).mean())
-    
-    # Add lag differences (rate of change)
-    for lag in [7, 14]:
-        data[f'ER_Diff_{lag}'] = data['ER_Visits'] - data[f'ER_Lag_{lag}']
-        data[f'OPD_Diff_{lag}'] = data['OPD_Visits'] - data[f'OPD_Lag_{lag}']
-    
-    # Aggregate environmental factors by area and date
-    env_cols = ['Temperature', 'Humidity', 'AQI', 'Precipitation']
-    area_date_env = data.groupby(['Area', 'Date'])[env_cols].mean().reset_index()
-    
-    # Merge back to get area-level environmental factors
-    data = data.merge(area_date_env, on=['Area', 'Date'], suffixes=('', '_AreaAvg'))
-    
-    # Create interaction features
-    data['TempHumidityInteraction'] = data['Temperature'] * data['Humidity'] / 100
-    data['ComorbidityCount'] = (data['HasDiabetes'] + data['HasHypertension'] + 
-                              data['HasAsthma'] + data['HasCOPD'] + data['HasHeartDisease'])
-    
-    # Add polynomial features for important numerical variables
-    for col in ['Age', 'Temperature', 'AQI']:
-        data[f'{col}_Squared'] = data[col] ** 2
-    
-    # Add more interaction terms
-    data['Age_Temperature'] = data['Age'] * data['Temperature'] / 100
-    data['AQI_Asthma'] = data['AQI'] * data['HasAsthma']
-    data['Temp_COPD'] = data['Temperature'] * data['HasCOPD']
-    data['Humidity_Asthma'] = data['Humidity'] * data['HasAsthma']
-    
-    # Create risk score based on multiple factors
-    data['HealthRiskScore'] = (
-        data['Age'] / 100 +  # Age factor
-        data['ComorbidityCount'] * 0.2 +  # Comorbidity factor
-        (data['Temperature'] > 32).astype(int) * 0.15 +  # High temperature
-        (data['Humidity'] > 80).astype(int) * 0.1 +  # High humidity
-        (data['AQI'] > 100).astype(int) * 0.15 +  # Poor air quality
-        data['IsVectorDiseaseRisk'] * 0.2 +  # Vector disease risk
-        data['IsFluSeason'] * 0.15 +  # Flu season
-        data['IsCycloneRisk'] * 0.25  # Cyclone risk
-    )
-    
-    # Create more complex risk scores
-    data['RespiratoryRiskScore'] = (
-        data['HasAsthma'] * 2 + 
-        data['HasCOPD'] * 2 + 
-        (data['AQI'] > 100).astype(int) * 1.5 +
-        (data['PollenCount'] > 100).astype(int) * 1.2
-    )
-    
-    data['CardioRiskScore'] = (
-        data['HasHeartDisease'] * 2 + 
-        data['HasHypertension'] * 1.5 + 
-        data['HasDiabetes'] * 1.2 +
-        (data['Age'] > 65).astype(int) * 1.5
-    )
-    
-    # Create area-specific features
-    data['IsSlum_HighTemp'] = data['IsSlumDwelling'] * (data['Temperature'] > 30).astype(int)
-    data['Age_Comorbidity'] = data['Age'] * data['ComorbidityCount']
-    data['SES_Numeric'] = data['SES'].map({
-        'Low': 0, 'Medium-Low': 1, 'Medium': 2, 'Medium-High': 3, 'High': 4
-    })
-    data['SES_Healthcare'] = data['SES_Numeric'] * data['HasPrimaryCare']
-    
-    # Create area-specific interaction terms
-    for area in data['Area'].unique():
-        # Create area dummy
-        data[f'Is_{area.replace(" ", "_")}'] = (data['Area'] == area).astype(int)
-        
-        # Create area-specific interaction terms
-        for feature in ['Temperature', 'Humidity', 'AQI']:
-            data[f'{feature}_{area.replace(" ", "_")}'] = data[feature] * data[f'Is_{area.replace(" ", "_")}']
-    
-    return data
-
-# Define healthcare demand spikes
-def identify_demand_spikes(data, er_threshold_percentile=90, opd_threshold_percentile=90):
-    # Calculate area-specific thresholds
-    area_er_thresholds = data.groupby('Area')['ER_Visits'].quantile(er_threshold_percentile/100).to_dict()
-    area_opd_thresholds = data.groupby('Area')['OPD_Visits'].quantile(opd_threshold_percentile/100).to_dict()
-    
-    # Create spike indicators
-    data['ER_Spike'] = data.apply(lambda x: 1 if x['ER_Visits'] > area_er_thresholds[x['Area']] else 0, axis=1)
-    data['OPD_Spike'] = data.apply(lambda x: 1 if x['OPD_Visits'] > area_opd_thresholds[x['Area']] else 0, axis=1)
-    data['Healthcare_Spike'] = ((data['ER_Spike'] + data['OPD_Spike']) > 0).astype(int)
-    
-    return data
-
 # Find the optimal threshold for classification
 def find_optimal_threshold(y_true, y_proba):
     precisions, recalls, thresholds = precision_recall_curve(y_true, y_proba)
@@ -240,7 +156,7 @@ def generate_early_warnings(forecast_df, threshold=0.7, consecutive_days=2):
     return pd.DataFrame(warnings) if warnings else pd.DataFrame(columns=['Area', 'Start_Date', 'End_Date', 'Duration', 'Average_Probability'])
 
 # Function to forecast future healthcare demand
-def forecast_future_demand(models, last_date, features_df, area_results, days=30):
+def forecast_future_demand(models, last_date, features_df, area_results, state, days=30):
     """
     Generate healthcare demand forecasts for the next specified number of days
     
@@ -254,6 +170,8 @@ def forecast_future_demand(models, last_date, features_df, area_results, days=30
         The dataset used for training
     area_results : dict
         Dictionary of area-specific results including optimal thresholds
+    state : FeatureState
+        Feature state at last_date, for the lag, rolling mean and EWMA inputs
     days : int
         Number of days to forecast
     
@@ -264,24 +182,10 @@ def forecast_future_demand(models, last_date, features_df, area_results, days=30
     # Create a date range for the forecast period
     future_dates = pd.date_range(start=last_date + timedelta(days=1), periods=days)
     
-    # Create a DataFrame for future dates
-    future_df = pd.DataFrame({'Date': future_dates})
-    
-    # Add date-based features
-    future_df['DayOfWeek'] = future_df['Date'].dt.dayofweek
-    future_df['Month'] = future_df['Date'].dt.month
-    future_df['Year'] = future_df['Date'].dt.year
-    future_df['Day'] = future_df['Date'].dt.day
-    future_df['Quarter'] = future_df['Date'].dt.quarter
-    future_df['IsWeekend'] = (future_df['DayOfWeek'] >= 5).astype(int)
-    future_df['DayOfYear'] = future_df['Date'].dt.dayofyear
-    future_df['WeekOfYear'] = future_df['Date'].dt.isocalendar().week
+    # Create a DataFrame for future dates, with the date parts the inputs below use
+    future_df = engineer_features(pd.DataFrame({'Date': future_dates}), ['Month', 'Day', 'Year'])
     
     # Add seasonal indicators
-    future_df['MonthSin'] = np.sin(2 * np.pi * future_df['Month']/12)
-    future_df['MonthCos'] = np.cos(2 * np.pi * future_df['Month']/12)
-    future_df['DayOfYearSin'] = np.sin(2 * np.pi * future_df['DayOfYear']/365)
-    future_df['DayOfYearCos'] = np.cos(2 * np.pi * future_df['DayOfYear']/365)
     future_df['Season'] = future_df['Month'].apply(lambda m: 'Winter' if m in [12, 1, 2] else
                                                 ('Summer' if m in [3, 4, 5] else
                                                  ('Monsoon' if m in [6, 7, 8, 9] else 'Post-Monsoon')))
@@ -294,15 +198,11 @@ def forecast_future_demand(models, last_date, features_df, area_results, days=30
     future_df.loc[(future_df['Month'] == 8) & (future_df['Day'] == 15), 'IsHoliday'] = 1
     
     # Add DaysToHoliday
-    future_df['DaysToHoliday'] = 100  # Default value
     holiday_dates = pd.to_datetime([
         f"{future_df['Year'].iloc[0]}-01-26",  # Republic Day
         f"{future_df['Year'].iloc[0]}-08-15",  # Independence Day
     ])
-    
-    for i, date in enumerate(future_df['Date']):
-        days_to_holiday = min([abs((date - hdate).days) for hdate in holiday_dates], default=100)
-        future_df.loc[i, 'DaysToHoliday'] = days_to_holiday
+    future_df['DaysToHoliday'] = days_to_nearest_holiday(future_df['Date'], holiday_dates)
     
     # Add environmental forecasts based on historical monthly averages
     for month in range(1, 13):
@@ -323,6 +223,14 @@ def forecast_future_demand(models, last_date, features_df, area_results, days=30
     # Create predictions for each area
     all_predictions = []
     
+    # Engineered columns the models read; the others are not computed
+    columns = model_input_columns(er_model, opd_model, *models.values())
+    
+    # Lags, rolling means, EWMA and differences of every area as the feature
+    # state gives them for the day after the data
+    history_columns = [col for col in columns if col in HISTORY_FEATURES]
+    history = state.next_day_features(history_columns)
+    
     for area in models.keys():
         area_df = future_df.copy()
         area_df['Area'] = area
@@ -348,109 +256,13 @@ def forecast_future_demand(models, last_date, features_df, area_results, days=30
                 cat_dist = features_df[cat].value_counts(normalize=True)
                 area_df[cat] = np.random.choice(cat_dist.index, size=len(area_df), p=cat_dist.values)
         
-        # Calculate polynomial features
-        area_df['Age_Squared'] = area_df['Age'] ** 2
-        area_df['Temperature_Squared'] = area_df['Temperature'] ** 2
-        area_df['AQI_Squared'] = area_df['AQI'] ** 2
-        
-        # Calculate ComorbidityCount
-        area_df['ComorbidityCount'] = (area_df['HasDiabetes'] + area_df['HasHypertension'] + 
-                                      area_df['HasAsthma'] + area_df['HasCOPD'] + area_df['HasHeartDisease'])
-        
-        # Calculate interaction terms
-        area_df['TempHumidityInteraction'] = area_df['Temperature'] * area_df['Humidity'] / 100
-        area_df['Age_Temperature'] = area_df['Age'] * area_df['Temperature'] / 100
-        area_df['AQI_Asthma'] = area_df['AQI'] * area_df['HasAsthma']
-        area_df['Temp_COPD'] = area_df['Temperature'] * area_df['HasCOPD']
-        area_df['Humidity_Asthma'] = area_df['Humidity'] * area_df['HasAsthma']
-        
-        # Calculate HealthRiskScore
-        area_df['HealthRiskScore'] = (
-            area_df['Age'] / 100 +
-            area_df['ComorbidityCount'] * 0.2 +
-            (area_df['Temperature'] > 32).astype(int) * 0.15 +
-            (area_df['Humidity'] > 80).astype(int) * 0.1 +
-            (area_df['AQI'] > 100).astype(int) * 0.15 +
-            area_df['IsVectorDiseaseRisk'] * 0.2 +
-            area_df['IsFluSeason'] * 0.15 +
-            area_df['IsCycloneRisk'] * 0.25
-        )
-        
-        # Calculate RespiratoryRiskScore
-        area_df['RespiratoryRiskScore'] = (
-            area_df['HasAsthma'] * 2 + 
-            area_df['HasCOPD'] * 2 + 
-            (area_df['AQI'] > 100).astype(int) * 1.5 +
-            (area_df['PollenCount'] > 100).astype(int) * 1.2
-        )
-        
-        # Calculate CardioRiskScore
-        area_df['CardioRiskScore'] = (
-            area_df['HasHeartDisease'] * 2 + 
-            area_df['HasHypertension'] * 1.5 + 
-            area_df['HasDiabetes'] * 1.2 +
-            (area_df['Age'] > 65).astype(int) * 1.5
-        )
-        
-        # Calculate SES_Numeric
-        area_df['SES_Numeric'] = area_df['SES'].map({
-            'Low': 0, 'Medium-Low': 1, 'Medium': 2, 'Medium-High': 3, 'High': 4
-        })
-        
-        # Calculate SES_Healthcare
-        area_df['SES_Healthcare'] = area_df['SES_Numeric'] * area_df['HasPrimaryCare']
-        
-        # Calculate IsSlum_HighTemp
-        area_df['IsSlum_HighTemp'] = area_df['IsSlumDwelling'] * (area_df['Temperature'] > 30).astype(int)
-        
-        # Calculate Age_Comorbidity
-        area_df['Age_Comorbidity'] = area_df['Age'] * area_df['ComorbidityCount']
-        
-        # Create area-specific interaction terms
-        for a in features_df['Area'].unique():
-            area_df[f'Is_{a.replace(" ", "_")}'] = (area_df['Area'] == a).astype(int)
-            
-            for feature in ['Temperature', 'Humidity', 'AQI']:
-                area_df[f'{feature}_{a.replace(" ", "_")}'] = area_df[feature] * area_df[f'Is_{a.replace(" ", "_")}']
-        
-        # Add rolling means from the last available data
-        last_month_data = features_df[(features_df['Area'] == area)].sort_values('Date').tail(30)
+        # History-based inputs from the feature state (none for an area it has not seen)
+        for col in history_columns:
+            area_df[col] = history.loc[area, col] if area in history.index else np.nan
         
-        if len(last_month_data) > 0:
-            for window in [7, 14, 28]:
-                area_df[f'ER_RollingMean_{window}'] = last_month_data['ER_Visits'].tail(window).mean()
-                area_df[f'OPD_RollingMean_{window}'] = last_month_data['OPD_Visits'].tail(window).mean()
-            
-            for window in [3, 5]:
-                area_df[f'ER_MA_{window}'] = last_month_data['ER_Visits'].tail(window).mean()
-                area_df[f'OPD_MA_{window}'] = last_month_data['OPD_Visits'].tail(window).mean()
-            
-            area_df['ER_EWMA'] = last_month_data['ER_Visits'].tail(7).mean()  # Simplified EWMA
-            area_df['OPD_EWMA'] = last_month_data['OPD_Visits'].tail(7).mean()  # Simplified EWMA
-            
-            for lag in [7, 14]:
-                if len(last_month_data) > lag:
-                    area_df[f'ER_Diff_{lag}'] = last_month_data['ER_Visits'].iloc[-1] - last_month_data['ER_Visits'].iloc[-lag-1]
-                    area_df[f'OPD_Diff_{lag}'] = last_month_data['OPD_Visits'].iloc[-1] - last_month_data['OPD_Visits'].iloc[-lag-1]
-                else:
-                    area_df[f'ER_Diff_{lag}'] = 0
-                    area_df[f'OPD_Diff_{lag}'] = 0
-        else:
-            # Fallback if no data for this area
-            for window in [7, 14, 28]:
-                area_df[f'ER_RollingMean_{window}'] = features_df['ER_Visits'].mean()
-                area_df[f'OPD_RollingMean_{window}'] = features_df['OPD_Visits'].mean()
-            
-            for window in [3, 5]:
-                area_df[f'ER_MA_{window}'] = features_df['ER_Visits'].mean()
-                area_df[f'OPD_MA_{window}'] = features_df['OPD_Visits'].mean()
-            
-            area_df['ER_EWMA'] = features_df['ER_Visits'].mean()
-            area_df['OPD_EWMA'] = features_df['OPD_Visits'].mean()
-            
-            for lag in [7, 14]:
-                area_df[f'ER_Diff_{lag}'] = 0
-                area_df[f'OPD_Diff_{lag}'] = 0
+        # The remaining features from their formulas; the time series ones and
+        # DaysToHoliday are the history-based values set above
+        area_df = engineer_features(area_df, columns, given=[col for col in area_df.columns if col in FEATURES])
         
         # Use the area-specific model to predict
         X_area = area_df.drop(['Date'], axis=1)
@@ -484,22 +296,21 @@ def forecast_future_demand(models, last_date, features_df, area_results, days=30
 
 # Function to train models and save them
 def train_and_save_models():
-    global er_model, opd_model, stacking_model, area_models, area_results, optimal_threshold
+    global er_model, opd_model, stacking_model, area_models, area_results, optimal_threshold, feature_state
     
     print("Starting healthcare demand prediction model with advanced techniques...")
     
     # Load the dataset
     print("Loading dataset...")
-    df = pd.read_csv('mumbai_healthcare_demand_dataset.csv')
-    
-    # Convert date to datetime
-    df['Date'] = pd.to_datetime(df['Date'])
+    df = load_dataset()
     
     print(f"Dataset shape: {df.shape}")
     
-    # Apply feature engineering
+    # Apply feature engineering, only for the columns the models read
     print("\nPerforming advanced feature engineering...")
-    engineered_df = advanced_feature_engineering(df)
+    engineered_df = engineer_features(df, MODEL_NUMERICAL_FEATURES + MODEL_CATEGORICAL_FEATURES)
+    # Feature state at the end of the data, for the forecast and later new days
+    feature_state = FeatureState.from_history(df)
     
     # Handle missing values from lag features
     engineered_df = engineered_df.dropna()
@@ -518,24 +329,8 @@ def train_and_save_models():
     print(f"Overall Healthcare Spikes: {healthcare_spikes} ({spike_df['Healthcare_Spike'].mean()*100:.2f}%)")
     
     # Define features and target variables
-    categorical_features = ['Area', 'Gender', 'SES', 'Insurance', 'Season']
-    numerical_features = [
-        'Age', 'Temperature', 'Humidity', 'AQI', 'Precipitation', 'PollenCount',
-        'IsCycloneRisk', 'IsVectorDiseaseRisk', 'IsFluSeason', 'IsHoliday',
-        'DistanceToHospital', 'HasPrimaryCare', 'HasTransportation',
-        'IsSlumDwelling', 'HasDiabetes', 'HasHypertension', 'HasAsthma',
-        'HasCOPD', 'HasHeartDisease', 'DaysToHoliday', 'MonthSin', 'MonthCos',
-        'DayOfYearSin', 'DayOfYearCos', 'ER_RollingMean_7', 'ER_RollingMean_14', 
-        'ER_RollingMean_28', 'OPD_RollingMean_7', 'OPD_RollingMean_14', 'OPD_RollingMean_28',
-        'ER_MA_3', 'ER_MA_5', 'OPD_MA_3', 'OPD_MA_5', 'ER_EWMA', 'OPD_EWMA',
-        'ER_Diff_7', 'ER_Diff_14', 'OPD_Diff_7', 'OPD_Diff_14',
-        'TempHumidityInteraction', 'ComorbidityCount', 'HealthRiskScore',
-        'Age_Squared', 'Temperature_Squared', 'AQI_Squared',
-        'Age_Temperature', 'AQI_Asthma', 'Temp_COPD', 'Humidity_Asthma',
-        'RespiratoryRiskScore', 'CardioRiskScore',
-        'IsSlum_HighTemp', 'Age_Comorbidity', 'SES_Numeric', 'SES_Healthcare',
-        'DayOfWeek', 'Month', 'IsWeekend', 'DayOfYear', 'WeekOfYear'
-    ]
+    categorical_features = MODEL_CATEGORICAL_FEATURES
+    numerical_features = MODEL_NUMERICAL_FEATURES
     
     # Create preprocessor
     preprocessor = ColumnTransformer(
@@ -980,7 +775,8 @@ def train_and_save_models():
     # Generate forecast for the next 30 days
     try:
         print("\nGenerating 30-day healthcare demand forecast...")
-        forecast = forecast_future_demand(area_models, spike_df['Date'].max(), spike_df, area_results, days=30)
+        forecast = forecast_future_demand(area_models, spike_df['Date'].max(), spike_df, area_results,
+                                          feature_state, days=30)
         
         # Visualize the forecast
         plt.figure(figsize=(15, 8))
@@ -1051,13 +847,17 @@ def train_and_save_models():
     with open(f"{model_dir}/optimal_threshold.pkl", "wb") as f:
         pickle.dump(optimal_threshold, f)
     
+    # Feature state at the end of the data, to engineer new days incrementally
+    with open(f"{model_dir}/feature_state.pkl", "wb") as f:
+        pickle.dump(feature_state, f)
+    
     print("Models saved successfully!")
     
     return er_model, opd_model, stacking_model, area_models, area_results, optimal_threshold
 
 # Function to load models
 def load_models():
-    global er_model, opd_model, stacking_model, area_models, area_results, optimal_threshold
+    global er_model, opd_model, stacking_model, area_models, area_results, optimal_threshold, feature_state
     
     print("Loading trained models...")
     with open(f"{model_dir}/er_model.pkl", "rb") as f:
@@ -1078,6 +878,9 @@ def load_models():
     with open(f"{model_dir}/optimal_threshold.pkl", "rb") as f:
         optimal_threshold = pickle.load(f)
     
+    with open(f"{model_dir}/feature_state.pkl", "rb") as f:
+        feature_state = pickle.load(f)
+    
     print("Models loaded successfully!")
     return er_model, opd_model, stacking_model, area_models, area_results, optimal_threshold
 
@@ -1222,21 +1025,32 @@ def predict():
         if 'Date' in input_df.columns:
             input_df['Date'] = pd.to_datetime(input_df['Date'])
         
-        # Apply feature engineering
-        input_df = advanced_feature_engineering(input_df)
-        
-        # Make predictions
+        # If area is specified and we have an area-specific model, use it,
+        # otherwise the general model
         area = input_df['Area'].iloc[0] if 'Area' in input_df.columns else None
+        spike_model = area_models[area] if area and area in area_models else stacking_model
+        
+        columns = model_input_columns(er_model, opd_model, spike_model)
         
-        # If area is specified and we have an area-specific model, use it
-        if area and area in area_models:
-            spike_prob = area_models[area].predict_proba(input_df.drop(['Date'], axis=1, errors='ignore'))[:, 1][0]
+        # History-based inputs that were not sent are those of the day after
+        # the training data, from the saved feature state
+        missing = [col for col in columns if col in HISTORY_FEATURES and col not in input_df.columns]
+        if missing and area in feature_state.areas:
+            history = feature_state.next_day_features(missing, [area])
+            for col in missing:
+                input_df[col] = history.loc[area, col]
+        
+        # Apply feature engineering for the columns the models read; features
+        # sent with the request are used as they are
+        input_df = engineer_features(input_df, columns, given=[col for col in input_df.columns if col in FEATURES])
+        
+        # Make predictions
+        spike_prob = spike_model.predict_proba(input_df.drop(['Date'], axis=1, errors='ignore'))[:, 1][0]
+        if spike_model is stacking_model:
+            spike_pred = 1 if spike_prob >= optimal_threshold else 0
+        else:
             threshold = area_results[area]['threshold']
             spike_pred = 1 if spike_prob >= threshold else 0
-        else:
-            # Use the general model
-            spike_prob = stacking_model.predict_proba(input_df.drop(['Date'], axis=1, errors='ignore'))[:, 1][0]
-            spike_pred = 1 if spike_prob >= optimal_threshold else 0
         
         # Predict ER and OPD visits
         er_pred = er_model.predict(input_df.drop(['Date'], axis=1, errors='ignore'))[0]
@@ -0,0 +1,148 @@
+# benchmark.py (in components/data/scriptss/)
+# Stage benchmarks for the synthetic data generator and the feature pipeline
+# (features.py), on datasets from sysdata.generate_dataset. Every stage is
+# timed and its peak RSS recorded at each size, and the results are saved as
+# JSON so that runs can be compared across commits.
+# Usage: python benchmark.py [generate features model_features spikes timeseries] [--rows 10000 200000 2000000]
+#                            [--repeat 3] [--output PATH] [--compare OLD.json]
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+
+import numpy as np
+import pandas as pd
+
+import features
+import sysdata
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+# ru_maxrss cannot be reset, so the peak of each run is read from VmHWM after
+# clearing it through /proc/self/clear_refs (Linux only)
+def _reset_peak():
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def _memory():
+    """(current, peak) RSS of this process in MB"""
+    with open('/proc/self/status') as f:
+        status = dict(line.split(':', 1) for line in f)
+    return int(status['VmRSS'].split()[0]) / 1024, int(status['VmHWM'].split()[0]) / 1024
+
+
+def measure(fn, repeat=3):
+    """fn's result with the median, all run times in seconds and the peak RSS in MB"""
+    samples, peaks = [], []
+    for _ in range(repeat):
+        # Drop the previous run's output so it does not count towards this peak
+        result = None
+        _reset_peak()
+        rss_before = _memory()[0]
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+        peak = _memory()[1]
+        peaks.append((peak, peak - rss_before))
+    return result, {'seconds': float(np.median(samples)), 'runs': [round(s, 4) for s in samples],
+                    'peak_rss_mb': round(max(p for p, _ in peaks), 1),
+                    'peak_increase_mb': round(max(d for _, d in peaks), 1)}
+
+
+# Each stage runs on the output of the stage it names, at the same size
+STAGES = {
+    'generate': (None, lambda n_rows, _: sysdata.generate_dataset(n_rows, seed=42)),
+    'features': ('generate', lambda _, data: features.advanced_feature_engineering(data)),
+    # Only the columns the models read, as in training
+    'model_features': ('generate', lambda _, data: features.engineer_features(
+        data, features.MODEL_NUMERICAL_FEATURES + features.MODEL_CATEGORICAL_FEATURES)),
+    'spikes': ('features', lambda _, data: features.identify_demand_spikes(data)),
+    'timeseries': ('generate', lambda _, data: features.time_series_features(data)),
+}
+
+
+def _needed(stages):
+    """The selected stages and the ones they run on, in STAGES order"""
+    needed = set()
+    for stage in stages:
+        while stage is not None:
+            needed.add(stage)
+            stage = STAGES[stage][0]
+    return [stage for stage in STAGES if stage in needed]
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run(stages, rows, repeat):
+    """Yield the measurements of the selected stages at each size as they finish"""
+    print(f"  {'stage':<16}{'rows':>10}{'seconds':>10}{'peak MB':>10}{'+MB':>8}")
+    needed = _needed(stages)
+    for n_rows in rows:
+        outputs = {}
+        # Stages that others run on are run (once) even if not selected
+        for i, name in enumerate(needed):
+            source, stage = STAGES[name]
+            output, result = measure(lambda: stage(n_rows, outputs.get(source)),
+                                     repeat if name in stages else 1)
+            # Keep only the outputs a later stage still runs on
+            outputs = {key: value for key, value in outputs.items()
+                       if any(STAGES[later][0] == key for later in needed[i + 1:])}
+            if any(STAGES[later][0] == name for later in needed[i + 1:]):
+                outputs[name] = output
+            del output
+            if name in stages:
+                print(f"  {name:<16}{n_rows:>10}{result['seconds']:>10.3f}{result['peak_rss_mb']:>10.0f}"
+                      f"{result['peak_increase_mb']:>8.0f}")
+                yield {'stage': name, 'rows': n_rows, **result}
+
+
+def compare(results, baseline_path):
+    """Print each stage's time and peak against the same stage and size in an earlier run"""
+    with open(baseline_path) as f:
+        baseline = {(r['stage'], r['rows']): r for r in json.load(f)['results']}
+    print(f"\nAgainst {baseline_path}:")
+    print(f"  {'stage':<16}{'rows':>10}{'seconds':>18}{'peak MB':>16}")
+    for r in results:
+        old = baseline.get((r['stage'], r['rows']))
+        if old is not None:
+            print(f"  {r['stage']:<16}{r['rows']:>10}{old['seconds']:>8.3f} ->{r['seconds']:>8.3f}"
+                  f"{old['peak_rss_mb']:>7.0f} ->{r['peak_rss_mb']:>7.0f}  x{old['seconds'] / r['seconds']:.2f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('stages', nargs='*', default=list(STAGES), help=f"any of: {', '.join(STAGES)}")
+    parser.add_argument('--rows', nargs='+', type=int, default=[10_000, 200_000, 2_000_000])
+    parser.add_argument('--repeat', type=int, default=3, help='runs per stage; the median time is kept')
+    parser.add_argument('--output', help='default: benchmarks/<commit>.json')
+    parser.add_argument('--compare', help='results JSON of an earlier run to compare against')
+    args = parser.parse_args()
+
+    commit = git_commit()
+    output = args.output or os.path.join(HERE, 'benchmarks', f'{commit}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    report = {'commit': commit, 'time': pd.Timestamp.now().isoformat(timespec='seconds'),
+              'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+              'machine': platform.machine(), 'cpus': os.cpu_count(), 'repeat': args.repeat, 'results': []}
+    results = report['results']
+    for result in run(args.stages, args.rows, args.repeat):
+        results.append(result)
+        # Saved after every stage, so a run killed at a large size keeps the smaller ones
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=1)
+    print(f"Results saved as '{output}'")
+    if args.compare:
+        compare(results, args.compare)
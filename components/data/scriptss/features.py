@@ -0,0 +1,459 @@
+# features.py (in components/data/scriptss/)
+# Feature engineering for the healthcare demand models: the holiday helper, the
+# time series features and their incremental state, the feature registry and
+# the spike labels. It needs only numpy and pandas and has no side effects on
+# import, so abcdd.py (training and the API) and benchmark.py share it.
+from collections import deque
+import copy
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+# Days from each date to the nearest holiday date (default when there are none)
+def days_to_nearest_holiday(dates, holiday_dates, default=100):
+    holidays = np.unique(np.asarray(holiday_dates, dtype='datetime64[D]').astype(np.int64))
+    # Work on the distinct dates only and map the result back through the codes
+    codes, unique_dates = pd.factorize(np.asarray(dates, dtype='datetime64[D]').astype(np.int64))
+    if len(holidays) == 0:
+        return np.full(len(codes), default, dtype=np.int64)
+    # The nearest holiday is the one at or just after the date, or the one before it
+    after = np.searchsorted(holidays, unique_dates)
+    before = np.maximum(after - 1, 0)
+    after = np.minimum(after, len(holidays) - 1)
+    nearest = np.minimum(np.abs(unique_dates - holidays[before]), np.abs(holidays[after] - unique_dates))
+    return nearest[codes]
+
+# Lag and trailing-average features of ER and OPD visits per area:
+# lags (1, 2 and 4 weeks), rolling means of the previous days (RollingMean for
+# weeks, MA for a few days) and an EWMA of the previous days
+TS_COLUMNS = ['ER_Visits', 'OPD_Visits']
+TS_LAGS = [7, 14, 28]
+TS_WINDOWS = [('RollingMean', 7), ('RollingMean', 14), ('RollingMean', 28), ('MA', 3), ('MA', 5)]
+TS_EWMA_SPAN = 7
+
+# Names of the time series features in their original column order: each
+# feature for ER, then for OPD
+def _time_series_names(columns, lags, windows):
+    prefixes = [col.split('_')[0] for col in columns]
+    names = [f'{prefix}_Lag_{lag}' for lag in lags for prefix in prefixes]
+    names += [f'{prefix}_{name}_{window}' for name, window in windows for prefix in prefixes]
+    return names + [f'{prefix}_EWMA' for prefix in prefixes]
+
+# All the time series features in one pass instead of a grouped lambda each.
+# Rows are sorted once by (Area, Date), so every area is one contiguous slice:
+# lags are offsets into it, trailing means differences of prefix sums, and the
+# EWMA is one grouped ewm() over all the columns. Same values (and column order)
+# as groupby('Area')[col].transform(lambda x: x.shift(...)...) on date-sorted rows
+def time_series_features(data, columns=TS_COLUMNS, lags=TS_LAGS, windows=TS_WINDOWS, span=TS_EWMA_SPAN):
+    prefixes = [col.split('_')[0] for col in columns]
+    names = _time_series_names(columns, lags, windows)
+    # One block for all the features, filled in place in the original row order
+    features = np.empty((len(names), len(data)))
+    column = {name: features[i] for i, name in enumerate(names)}
+
+    area = pd.factorize(data['Area'])[0]
+    order = np.lexsort((data['Date'].to_numpy(), area))
+    area = area[order]
+    rows = np.arange(len(area))
+    # Row number within its area, counted from the first row of the area
+    is_start = np.r_[True, area[1:] != area[:-1]] if len(area) else np.zeros(0, dtype=bool)
+    position = rows - np.maximum.accumulate(np.where(is_start, rows, 0))
+
+    previous = {}
+    for col, prefix in zip(columns, prefixes):
+        values = data[col].to_numpy()[order]
+        for lag in lags:
+            column[f'{prefix}_Lag_{lag}'][order] = np.where(position >= lag, values[rows - lag], np.nan)
+        # Sums of integer counts are exact, so the means equal rolling().mean()'s
+        sums = np.r_[0, np.cumsum(values, dtype=np.int64 if values.dtype.kind in 'iub' else np.float64)]
+        for name, window in windows:
+            count = np.minimum(position, window)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                column[f'{prefix}_{name}_{window}'][order] = np.where(
+                    count > 0, (sums[rows] - sums[rows - count]) / count, np.nan)
+        previous[f'{prefix}_EWMA'] = np.where(position >= 1, values[rows - 1], np.nan)
+    ewma = pd.DataFrame(previous).groupby(area, sort=True).ewm(span=span).mean()
+    for name in previous:
+        column[name][order] = ewma[name].to_numpy()
+    return pd.DataFrame(features.T, index=data.index, columns=names, copy=False)
+
+# Everything the history-dependent features need to go on from the end of a
+# dataset without it, so new days are engineered in O(window) per row: for each
+# area a ring buffer of its last counts, the row count, and the EWMA as pandas'
+# ewm() carries it (weighted mean and total weight); the last holiday seen; and
+# the areas in order of appearance (for the area dummies). Counts are integers,
+# so the trailing means are exact and the rows equal the batch output.
+class FeatureState:
+    def __init__(self, columns=TS_COLUMNS, lags=TS_LAGS, windows=TS_WINDOWS, span=TS_EWMA_SPAN):
+        self.columns, self.lags, self.windows, self.span = list(columns), list(lags), list(windows), span
+        self.size = max(self.lags + [window for _, window in self.windows])
+        # ewm(span=...) weights: alpha = 1 / (1 + com), com = (span - 1) / 2
+        self.decay = 1. - 1. / (1. + (span - 1) / 2)
+        self.areas = []
+        self.counts = {}
+        self.buffers = {}
+        self.ewma = {}
+        self.last_date = None
+        self.last_holiday = None
+
+    @classmethod
+    def from_history(cls, data, **params):
+        """State at the end of data, read off the batch features over it"""
+        state = cls(**params)
+        features = time_series_features(data, state.columns, state.lags, state.windows, state.span)
+        codes, areas = pd.factorize(data['Area'])
+        order = np.lexsort((data['Date'].to_numpy(), codes))
+        counts = np.bincount(codes, minlength=len(areas))
+        # Last row of each area in (Area, Date) order
+        for end in np.cumsum(counts) - 1:
+            code = codes[order[end]]
+            area = areas[code]
+            rows = order[max(0, end - state.size + 1):end + 1]
+            rows = rows[codes[rows] == code]
+            count = int(counts[code])
+            state.counts[area] = count
+            state.buffers[area] = {col: deque(data[col].to_numpy()[rows].tolist(), maxlen=state.size)
+                                   for col in state.columns}
+            # The EWMA of the last row has taken in every count but that row's
+            observations = count - 1
+            old_wt = 1.
+            for _ in range(observations - 1):
+                previous, old_wt = old_wt, old_wt * state.decay + 1.
+                if old_wt == previous:
+                    break
+            state.ewma[area] = {col: [features[f'{col.split("_")[0]}_EWMA'].to_numpy()[order[end]], old_wt]
+                                for col in state.columns}
+        state.areas = list(areas)
+        state.last_date = data['Date'].max() if len(data) else None
+        holidays = data.loc[data['IsHoliday'] == 1, 'Date']
+        state.last_holiday = holidays.max() if len(holidays) else None
+        return state
+
+    def days_to_holiday(self, data):
+        """DaysToHoliday of new days, counting the last holiday before them"""
+        holidays = data.loc[data['IsHoliday'] == 1, 'Date'].tolist()
+        if self.last_holiday is not None:
+            holidays.append(self.last_holiday)
+        return days_to_nearest_holiday(data['Date'], holidays)
+
+    def _ewma_step(self, ewma, value):
+        # The update of pandas' ewm(adjust=True) for one more observation
+        weighted, old_wt = ewma
+        if weighted != weighted:
+            ewma[0] = value
+            return
+        old_wt *= self.decay
+        if weighted != value:
+            weighted = (old_wt * weighted + value) / (old_wt + 1.)
+        ewma[:] = [weighted, old_wt + 1.]
+
+    def update(self, data):
+        """time_series_features() of the new whole days in data, advancing the state past them"""
+        if self.last_date is not None and len(data) and data['Date'].min() <= self.last_date:
+            raise ValueError(f"new rows must come after {self.last_date:%Y-%m-%d}")
+        names = _time_series_names(self.columns, self.lags, self.windows)
+        features = np.full((len(names), len(data)), np.nan)
+        column = {name: features[i] for i, name in enumerate(names)}
+        codes, new_areas = pd.factorize(data['Area'])
+        for area in new_areas:
+            if area not in self.counts:
+                self.areas.append(area)
+                self.counts[area] = 0
+                self.buffers[area] = {col: deque(maxlen=self.size) for col in self.columns}
+                self.ewma[area] = {col: [np.nan, 1.] for col in self.columns}
+        areas = data['Area'].tolist()
+        values = {col: data[col].tolist() for col in self.columns}
+        for row in np.lexsort((data['Date'].to_numpy(), codes)):
+            area = areas[row]
+            count = self.counts[area]
+            for col in self.columns:
+                prefix = col.split('_')[0]
+                buffer = self.buffers[area][col]
+                for lag in self.lags:
+                    if count >= lag:
+                        column[f'{prefix}_Lag_{lag}'][row] = buffer[-lag]
+                for name, window in self.windows:
+                    n = min(count, window)
+                    if n:
+                        column[f'{prefix}_{name}_{window}'][row] = sum(islice(buffer, len(buffer) - n, None)) / n
+                if count:
+                    self._ewma_step(self.ewma[area][col], buffer[-1])
+                    column[f'{prefix}_EWMA'][row] = self.ewma[area][col][0]
+                buffer.append(values[col][row])
+            self.counts[area] = count + 1
+        if len(data):
+            self.last_date = data['Date'].max()
+            holidays = data.loc[data['IsHoliday'] == 1, 'Date']
+            if len(holidays):
+                self.last_holiday = holidays.max()
+        return pd.DataFrame(features.T, index=data.index, columns=names, copy=False)
+
+    def next_day_features(self, columns, areas=None):
+        """The given features of one more row per area (all by default), indexed by area.
+
+        The state is not advanced. Each row repeats its area's last counts: the
+        lags, trailing means and EWMA are exactly those of the next row, and the
+        differences take its counts to equal the last ones.
+        """
+        areas = self.areas if areas is None else list(areas)
+        rows = pd.DataFrame({'Area': areas, 'Date': self.last_date + pd.Timedelta(days=1), 'IsHoliday': 0})
+        for col in self.columns:
+            rows[col] = [self.buffers[area][col][-1] if self.buffers.get(area) and self.buffers[area][col]
+                         else np.nan for area in areas]
+        features = engineer_features(rows, columns, state=copy.deepcopy(self))
+        return features.set_index('Area')[list(columns)]
+
+# Feature registry: every engineered column with the columns it is computed from
+# and its formula, in dependency order. engineer_features() computes only what
+# the requested columns need, so training, /predict and the forecast share one
+# definition of each feature. Formulas take a _FeatureFrame, which reads the
+# columns computed so far and then the input frame
+FEATURES = {}
+
+def register_feature(names, inputs, compute):
+    names = [names] if isinstance(names, str) else list(names)
+    unknown = [col for col in inputs if col in names]
+    if unknown:
+        raise ValueError(f"{', '.join(unknown)} cannot be computed from itself")
+    for name in names:
+        FEATURES[name] = (tuple(names), list(inputs), compute)
+
+class _FeatureFrame:
+    def __init__(self, data, state=None):
+        self.data, self.state, self.computed = data, state, {}
+
+    def __getitem__(self, col):
+        return self.computed[col] if col in self.computed else self.data[col]
+
+# Calendar
+register_feature('DayOfWeek', ['Date'], lambda d: d['Date'].dt.dayofweek)
+register_feature('Month', ['Date'], lambda d: d['Date'].dt.month)
+register_feature('Year', ['Date'], lambda d: d['Date'].dt.year)
+register_feature('Day', ['Date'], lambda d: d['Date'].dt.day)
+register_feature('Quarter', ['Date'], lambda d: d['Date'].dt.quarter)
+register_feature('IsWeekend', ['DayOfWeek'], lambda d: (d['DayOfWeek'] >= 5).astype(int))
+register_feature('DayOfYear', ['Date'], lambda d: d['Date'].dt.dayofyear)
+register_feature('WeekOfYear', ['Date'], lambda d: d['Date'].dt.isocalendar().week)
+
+# Holiday proximity (days before/after holiday)
+register_feature('DaysToHoliday', ['Date', 'IsHoliday'], lambda d: (
+    days_to_nearest_holiday(d['Date'], d['Date'][d['IsHoliday'] == 1]) if d.state is None else
+    d.state.days_to_holiday(d.data)))
+
+# Seasonal indicators using sine and cosine transforms for cyclical features
+register_feature('MonthSin', ['Month'], lambda d: np.sin(2 * np.pi * d['Month']/12))
+register_feature('MonthCos', ['Month'], lambda d: np.cos(2 * np.pi * d['Month']/12))
+register_feature('DayOfYearSin', ['DayOfYear'], lambda d: np.sin(2 * np.pi * d['DayOfYear']/365))
+register_feature('DayOfYearCos', ['DayOfYear'], lambda d: np.cos(2 * np.pi * d['DayOfYear']/365))
+
+# Lag, rolling average, moving average and EWMA features for time series
+register_feature(_time_series_names(TS_COLUMNS, TS_LAGS, TS_WINDOWS), ['Area', 'Date'] + TS_COLUMNS, lambda d: (
+    time_series_features(d.data) if d.state is None else d.state.update(d.data)))
+
+# Lag differences (rate of change)
+for lag in [7, 14]:
+    for prefix in ['ER', 'OPD']:
+        register_feature(f'{prefix}_Diff_{lag}', [f'{prefix}_Visits', f'{prefix}_Lag_{lag}'],
+                         lambda d, prefix=prefix, lag=lag: d[f'{prefix}_Visits'] - d[f'{prefix}_Lag_{lag}'])
+
+# Features computed from the earlier rows of each area, which a FeatureState carries
+HISTORY_FEATURES = _time_series_names(TS_COLUMNS, TS_LAGS, TS_WINDOWS) + [
+    f'{prefix}_Diff_{lag}' for lag in [7, 14] for prefix in ['ER', 'OPD']]
+
+# Environmental factors averaged by area and date
+ENV_COLUMNS = ['Temperature', 'Humidity', 'AQI', 'Precipitation']
+register_feature([f'{col}_AreaAvg' for col in ENV_COLUMNS], ['Area', 'Date'] + ENV_COLUMNS, lambda d: (
+    d.data.groupby(['Area', 'Date'], observed=True)[ENV_COLUMNS].transform('mean').add_suffix('_AreaAvg')))
+
+# Interaction features
+register_feature('TempHumidityInteraction', ['Temperature', 'Humidity'],
+                 lambda d: d['Temperature'] * d['Humidity'] / 100)
+register_feature('ComorbidityCount', ['HasDiabetes', 'HasHypertension', 'HasAsthma', 'HasCOPD', 'HasHeartDisease'],
+                 lambda d: (d['HasDiabetes'] + d['HasHypertension'] +
+                            d['HasAsthma'] + d['HasCOPD'] + d['HasHeartDisease']))
+
+# Polynomial features for important numerical variables
+for col in ['Age', 'Temperature', 'AQI']:
+    register_feature(f'{col}_Squared', [col], lambda d, col=col: d[col] ** 2)
+
+# More interaction terms
+register_feature('Age_Temperature', ['Age', 'Temperature'], lambda d: d['Age'] * d['Temperature'] / 100)
+register_feature('AQI_Asthma', ['AQI', 'HasAsthma'], lambda d: d['AQI'] * d['HasAsthma'])
+register_feature('Temp_COPD', ['Temperature', 'HasCOPD'], lambda d: d['Temperature'] * d['HasCOPD'])
+register_feature('Humidity_Asthma', ['Humidity', 'HasAsthma'], lambda d: d['Humidity'] * d['HasAsthma'])
+
+# Risk score based on multiple factors
+register_feature('HealthRiskScore', ['Age', 'ComorbidityCount', 'Temperature', 'Humidity', 'AQI',
+                                     'IsVectorDiseaseRisk', 'IsFluSeason', 'IsCycloneRisk'], lambda d: (
+    d['Age'] / 100 +  # Age factor
+    d['ComorbidityCount'] * 0.2 +  # Comorbidity factor
+    (d['Temperature'] > 32).astype(int) * 0.15 +  # High temperature
+    (d['Humidity'] > 80).astype(int) * 0.1 +  # High humidity
+    (d['AQI'] > 100).astype(int) * 0.15 +  # Poor air quality
+    d['IsVectorDiseaseRisk'] * 0.2 +  # Vector disease risk
+    d['IsFluSeason'] * 0.15 +  # Flu season
+    d['IsCycloneRisk'] * 0.25  # Cyclone risk
+))
+
+# More complex risk scores
+register_feature('RespiratoryRiskScore', ['HasAsthma', 'HasCOPD', 'AQI', 'PollenCount'], lambda d: (
+    d['HasAsthma'] * 2 +
+    d['HasCOPD'] * 2 +
+    (d['AQI'] > 100).astype(int) * 1.5 +
+    (d['PollenCount'] > 100).astype(int) * 1.2
+))
+register_feature('CardioRiskScore', ['HasHeartDisease', 'HasHypertension', 'HasDiabetes', 'Age'], lambda d: (
+    d['HasHeartDisease'] * 2 +
+    d['HasHypertension'] * 1.5 +
+    d['HasDiabetes'] * 1.2 +
+    (d['Age'] > 65).astype(int) * 1.5
+))
+
+# Area-specific features
+register_feature('IsSlum_HighTemp', ['IsSlumDwelling', 'Temperature'],
+                 lambda d: d['IsSlumDwelling'] * (d['Temperature'] > 30).astype(int))
+register_feature('Age_Comorbidity', ['Age', 'ComorbidityCount'], lambda d: d['Age'] * d['ComorbidityCount'])
+# SES may be categorical; map() then keeps it categorical, so convert to numbers
+register_feature('SES_Numeric', ['SES'], lambda d: d['SES'].map({
+    'Low': 0, 'Medium-Low': 1, 'Medium': 2, 'Medium-High': 3, 'High': 4
+}).astype(float))
+register_feature('SES_Healthcare', ['SES_Numeric', 'HasPrimaryCare'], lambda d: d['SES_Numeric'] * d['HasPrimaryCare'])
+
+# Area dummies and their interactions with these columns. Their names depend on
+# the areas in the data, so they come after the registry
+AREA_INTERACTIONS = ['Temperature', 'Humidity', 'AQI']
+
+def _area_feature_names(area):
+    key = area.replace(" ", "_")
+    return [f'Is_{key}'] + [f'{feature}_{key}' for feature in AREA_INTERACTIONS]
+
+# Columns the models read: the ColumnTransformer inputs of training
+MODEL_CATEGORICAL_FEATURES = ['Area', 'Gender', 'SES', 'Insurance', 'Season']
+MODEL_NUMERICAL_FEATURES = [
+    'Age', 'Temperature', 'Humidity', 'AQI', 'Precipitation', 'PollenCount',
+    'IsCycloneRisk', 'IsVectorDiseaseRisk', 'IsFluSeason', 'IsHoliday',
+    'DistanceToHospital', 'HasPrimaryCare', 'HasTransportation',
+    'IsSlumDwelling', 'HasDiabetes', 'HasHypertension', 'HasAsthma',
+    'HasCOPD', 'HasHeartDisease', 'DaysToHoliday', 'MonthSin', 'MonthCos',
+    'DayOfYearSin', 'DayOfYearCos', 'ER_RollingMean_7', 'ER_RollingMean_14', 
+    'ER_RollingMean_28', 'OPD_RollingMean_7', 'OPD_RollingMean_14', 'OPD_RollingMean_28',
+    'ER_MA_3', 'ER_MA_5', 'OPD_MA_3', 'OPD_MA_5', 'ER_EWMA', 'OPD_EWMA',
+    'ER_Diff_7', 'ER_Diff_14', 'OPD_Diff_7', 'OPD_Diff_14',
+    'TempHumidityInteraction', 'ComorbidityCount', 'HealthRiskScore',
+    'Age_Squared', 'Temperature_Squared', 'AQI_Squared',
+    'Age_Temperature', 'AQI_Asthma', 'Temp_COPD', 'Humidity_Asthma',
+    'RespiratoryRiskScore', 'CardioRiskScore',
+    'IsSlum_HighTemp', 'Age_Comorbidity', 'SES_Numeric', 'SES_Healthcare',
+    'DayOfWeek', 'Month', 'IsWeekend', 'DayOfYear', 'WeekOfYear'
+]
+
+# Input columns the 'preprocessor' ColumnTransformer of each pipeline reads
+def model_input_columns(*models):
+    columns = []
+    for model in models:
+        for _, _, cols in model.named_steps['preprocessor'].transformers:
+            columns += [col for col in cols if col not in columns]
+    return columns
+
+def engineer_features(df, columns=None, state=None, given=()):
+    """df with the requested engineered columns added (all registered ones by default).
+
+    Only the features the requested columns depend on are computed, once each and
+    in registry order; intermediates that were not requested are left out.
+    Requested columns that are not features (raw inputs) are passed through.
+    Features listed in `given` are taken from df as they are.
+    With a FeatureState, df holds only whole new days after the state's history:
+    the features that depend on the history come from the state, which is always
+    advanced past df, and the rows equal those of the batch run over the history
+    and df for the same days.
+    """
+    frame = _FeatureFrame(df, state)
+    if columns is None:
+        wanted = [name for name in FEATURES if name not in given]
+    else:
+        wanted = [col for col in columns if col in FEATURES and col not in given]
+        unknown = [col for col in columns if col not in FEATURES and col not in df.columns and
+                   not col.startswith(('Is_',) + tuple(f'{feature}_' for feature in AREA_INTERACTIONS))]
+        if unknown:
+            raise KeyError(f"unknown features: {', '.join(unknown)}")
+
+    # Dependency closure of the requested features
+    needed = set()
+    stack = list(wanted)
+    if state is not None:
+        # The state has to see every new day
+        stack.append(_time_series_names(TS_COLUMNS, TS_LAGS, TS_WINDOWS)[0])
+    while stack:
+        name = stack.pop()
+        if name in needed or name in given or name not in FEATURES:
+            continue
+        names, inputs, _ = FEATURES[name]
+        needed.update(names)
+        stack += inputs
+
+    # Every formula runs once, in registry order
+    for name, (names, _, compute) in FEATURES.items():
+        if name in needed and name not in frame.computed:
+            values = compute(frame)
+            if len(names) == 1:
+                frame.computed[name] = values
+            else:
+                frame.computed.update({col: values[col] for col in names})
+
+    data = df.copy()
+    added = {}
+    for name in wanted:
+        # Columns already in df (e.g. Month) are replaced in place
+        if name in data.columns:
+            data[name] = frame.computed[name]
+        else:
+            added[name] = frame.computed[name]
+    areas = [] if 'Area' not in data.columns else data['Area'].unique() if state is None else state.areas
+    if columns is not None:
+        areas = [area for area in areas if set(_area_feature_names(area)) & set(columns)]
+    for area in areas:
+        is_area, *interactions = _area_feature_names(area)
+        added[is_area] = (data['Area'] == area).astype(int)
+        for feature, name in zip(AREA_INTERACTIONS, interactions):
+            added[name] = data[feature] * added[is_area]
+    if columns is not None:
+        added = {name: values for name, values in added.items()
+                 if name in columns or name in FEATURES}
+    # Every added column is new, so they need not be copied into one block
+    return pd.concat([data, pd.DataFrame(added, index=data.index, copy=False)], axis=1)
+
+# Advanced Feature Engineering: every registered feature (see engineer_features)
+def advanced_feature_engineering(df, state=None):
+    return engineer_features(df, state=state)
+
+# Spike labels for several percentile settings in one call, to sweep thresholds:
+# a visit count is a spike above the percentile of its area. The thresholds of
+# all the percentiles come from one grouped quantile per column and are looked
+# up by area code, so no Python runs per row
+def spike_labels(data, percentiles=(90,)):
+    codes, areas = pd.factorize(data['Area'])
+    levels = [p / 100 for p in percentiles]
+    labels = {}
+    for col, prefix in [('ER_Visits', 'ER'), ('OPD_Visits', 'OPD')]:
+        quantiles = data[col].groupby(codes).quantile(levels).unstack()
+        # (area code, percentile), plus a last row of NaN for rows without an area (code -1)
+        thresholds = quantiles.reindex(index=range(len(areas) + 1), columns=levels).to_numpy()
+        spikes = data[col].to_numpy()[:, None] > thresholds[codes]
+        for i, p in enumerate(percentiles):
+            labels[f'{prefix}_Spike_{p}'] = spikes[:, i].astype(int)
+    for p in percentiles:
+        labels[f'Healthcare_Spike_{p}'] = labels[f'ER_Spike_{p}'] | labels[f'OPD_Spike_{p}']
+    return pd.DataFrame(labels, index=data.index)
+
+# Define healthcare demand spikes
+def identify_demand_spikes(data, er_threshold_percentile=90, opd_threshold_percentile=90):
+    # Area-specific thresholds, looked up per row by area
+    labels = spike_labels(data, sorted({er_threshold_percentile, opd_threshold_percentile}))
+    
+    # Create spike indicators
+    data['ER_Spike'] = labels[f'ER_Spike_{er_threshold_percentile}']
+    data['OPD_Spike'] = labels[f'OPD_Spike_{opd_threshold_percentile}']
+    data['Healthcare_Spike'] = ((data['ER_Spike'] + data['OPD_Spike']) > 0).astype(int)
+    
+    return data
@@ -1,746 +1,1237 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import json
+import os
+import shutil
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import random
-from scipy import stats
+from datetime import datetime
 
-# Set random seed for reproducibility
-np.random.seed(42)
-
-# Define larger sample size
-n_samples = 200000  # Increased from 50,000 to 200,000
+# Generation is vectorised: every per-row draw is a lookup of its parameters in the
+# tables below by category code (area, SES, month, age band) followed by one
+# numpy call for all rows.
+#   python sysdata.py [--rows 200000] [--seed 42] [--format csv|parquet] [--output PATH]
+#                     [--chunk-size 500000] [--workers 4] [--memory-report]
+#                     [--scenarios scenarios.json] [--cities mumbai,pune|all]
+#   python sysdata.py --daily [--start-date 2015-01-01] [--end-date 2025-01-01]
+#                     [--patients-per-day 165] [--seed 42] [--format csv|parquet]
+#   python sysdata.py --append 1 [--daily] [--format csv|parquet] [--output PATH]
+# Rows come out in the SCHEMA dtypes (categorical text, int8 flags, float32).
+# --format parquet writes a directory of Parquet files partitioned by Year, City
+# and Area that keeps those dtypes.
+# --cities generates several CITY_PROFILES cities in the same vectorised run,
+# rows split by population; the default is Mumbai alone.
+# With --chunk-size the rows are generated and appended to the CSV one chunk at
+# a time, so memory stays bounded by the chunk size instead of --rows.
+# With --workers the chunks are generated by a process pool, one shard file per
+# chunk, and concatenated in order; the file is byte-identical for any number
+# of workers.
+# With --scenarios the dataset is generated once without outbreaks and every
+# scenario in the JSON file ({name: [event, ...]}, see OUTBREAKS) is applied to
+# it and written to <output>/<name>.<format>.
+# --daily writes one row per area and day with its patient, ER and OPD counts
+# (generate_daily) instead of one row per patient.
+# --append DAYS extends an existing --output (patient or --daily rows, CSV or
+# Parquet) by that many days as a live feed would, resuming the RNG from
+# <output>.state.json so the past is never regenerated (append_days).
 
 # Create date range covering multiple years to capture seasonal patterns
-start_date = datetime(2022, 1, 1)
-end_date = datetime(2025, 4, 26)  # Current date
-date_range = (end_date - start_date).days
-random_dates = [start_date + timedelta(days=np.random.randint(0, date_range)) for _ in range(n_samples)]
-random_dates.sort()  # Sort dates for time series analysis
-
-print("Generating Mumbai healthcare synthetic dataset...")
-
-# Generate demographic data based on Mumbai's population statistics
-# Age distribution
-age_distribution = np.concatenate([
-    np.random.normal(5, 3, size=int(n_samples*0.1)),    # Children (10%)
-    np.random.normal(25, 7, size=int(n_samples*0.25)),  # Young adults (25%)
-    np.random.normal(45, 10, size=int(n_samples*0.35)), # Middle-aged (35%)
-    np.random.normal(72, 8, size=int(n_samples*0.3))    # Elderly (30%)
+START_DATE = datetime(2022, 1, 1)
+END_DATE = datetime(2025, 4, 26)  # Current date
+
+# Age distribution as a mixture of normals: (share, mean, std)
+AGE_GROUPS = np.array([
+    (0.1, 5, 3),     # Children (10%)
+    (0.25, 25, 7),   # Young adults (25%)
+    (0.35, 45, 10),  # Middle-aged (35%)
+    (0.3, 72, 8),    # Elderly (30%)
 ])
-np.random.shuffle(age_distribution)
-ages = np.clip(age_distribution, 0, 105).astype(int)[:n_samples]
 
 # Gender distribution with recognition of non-binary individuals (4%)
-genders = np.random.choice(['Male', 'Female', 'Non-binary'], 
-                          size=n_samples, 
-                          p=[0.48, 0.48, 0.04])
-
-# Mumbai-specific geographic areas
-areas = ['South Mumbai', 'Western Suburbs', 'Eastern Suburbs', 'Navi Mumbai', 'Thane']
-area_distribution = np.random.choice(areas, size=n_samples, p=[0.15, 0.35, 0.2, 0.15, 0.15])
-
-# Create PIN codes that correlate with areas (actual Mumbai PIN codes)
-pin_codes = []
-for area in area_distribution:
-    if area == 'South Mumbai':
-        pin_codes.append(np.random.randint(400001, 400020))
-    elif area == 'Western Suburbs':
-        pin_codes.append(np.random.randint(400050, 400090))
-    elif area == 'Eastern Suburbs':
-        pin_codes.append(np.random.randint(400070, 400099))
-    elif area == 'Navi Mumbai':
-        pin_codes.append(np.random.randint(400700, 400710))
-    else:  # Thane
-        pin_codes.append(np.random.randint(400600, 400612))
-
-# Slum dwelling indicator - approximately 40% of Mumbai's population lives in slums
-is_slum_dwelling = []
-for area in area_distribution:
-    if area == 'South Mumbai':
-        is_slum_dwelling.append(np.random.binomial(1, 0.25))  # 25% in slums
-    elif area in ['Western Suburbs', 'Eastern Suburbs']:
-        is_slum_dwelling.append(np.random.binomial(1, 0.45))  # 45% in slums
-    else:  # Navi Mumbai, Thane
-        is_slum_dwelling.append(np.random.binomial(1, 0.35))  # 35% in slums
-
-# Generate socioeconomic status (SES) as SDOH factor
-ses_categories = ['Low', 'Medium-Low', 'Medium', 'Medium-High', 'High']
-# Create SES distribution that correlates with area and slum dwelling
-ses = []
-for i, area in enumerate(area_distribution):
-    if is_slum_dwelling[i]:
-        ses.append(np.random.choice(ses_categories, p=[0.6, 0.3, 0.1, 0.0, 0.0]))
-    elif area == 'South Mumbai':
-        ses.append(np.random.choice(ses_categories, p=[0.1, 0.15, 0.25, 0.25, 0.25]))
-    elif area == 'Western Suburbs':
-        ses.append(np.random.choice(ses_categories, p=[0.15, 0.2, 0.3, 0.2, 0.15]))
-    elif area == 'Eastern Suburbs':
-        ses.append(np.random.choice(ses_categories, p=[0.2, 0.25, 0.3, 0.15, 0.1]))
-    elif area == 'Navi Mumbai':
-        ses.append(np.random.choice(ses_categories, p=[0.15, 0.2, 0.35, 0.2, 0.1]))
-    else:  # Thane
-        ses.append(np.random.choice(ses_categories, p=[0.2, 0.25, 0.3, 0.15, 0.1]))
-
-# Generate insurance status - 73% of surveyed households did not have health insurance
-insurance_types = ['Private', 'Government', 'Employer', 'None']
-# Insurance distribution correlates with SES
-insurance = []
-for s in ses:
-    if s == 'Low':
-        insurance.append(np.random.choice(insurance_types, p=[0.05, 0.15, 0.05, 0.75]))
-    elif s == 'Medium-Low':
-        insurance.append(np.random.choice(insurance_types, p=[0.1, 0.15, 0.1, 0.65]))
-    elif s == 'Medium':
-        insurance.append(np.random.choice(insurance_types, p=[0.2, 0.1, 0.15, 0.55]))
-    elif s == 'Medium-High':
-        insurance.append(np.random.choice(insurance_types, p=[0.4, 0.05, 0.2, 0.35]))
-    else:  # High
-        insurance.append(np.random.choice(insurance_types, p=[0.6, 0.02, 0.18, 0.2]))
-
-# Determine season based on Mumbai's climate
-def get_mumbai_season(date):
-    month = date.month
-    if month in [12, 1, 2]:
-        return 'Winter'
-    elif month in [3, 4, 5]:
-        return 'Summer'
-    elif month in [6, 7, 8, 9]:
-        return 'Monsoon'
-    else:
-        return 'Post-Monsoon'
-
-seasons = [get_mumbai_season(d) for d in random_dates]
-
-# Generate weather data based on Mumbai's climate patterns
-temperature = []
-precipitation = []
-humidity = []
-for i, date in enumerate(random_dates):
-    month = date.month
-    
-    # Temperature patterns based on Mumbai's climate data
-    if month == 1:  # January
-        temp = np.random.normal(23.9, 3.3)
-    elif month == 2:  # February
-        temp = np.random.normal(25.4, 3.4)
-    elif month == 3:  # March
-        temp = np.random.normal(27.5, 3.0)
-    elif month == 4:  # April
-        temp = np.random.normal(28.6, 2.7)
-    elif month == 5:  # May
-        temp = np.random.normal(29.7, 2.1)
-    elif month == 6:  # June
-        temp = np.random.normal(28.4, 1.8)
-    elif month == 7:  # July
-        temp = np.random.normal(26.7, 0.9)
-    elif month == 8:  # August
-        temp = np.random.normal(26.3, 1.1)
-    elif month == 9:  # September
-        temp = np.random.normal(26.9, 1.8)
-    elif month == 10:  # October
-        temp = np.random.normal(28.8, 2.6)
-    elif month == 11:  # November
-        temp = np.random.normal(27.4, 3.0)
-    else:  # December
-        temp = np.random.normal(24.1, 3.3)
-    
-    temperature.append(temp)
-    
-    # Precipitation patterns based on Mumbai's monsoon
-    if month in [6, 7, 8, 9]:  # Monsoon season (June-September)
-        if month == 7:  # July is wettest
-            daily_precip_chance = 0.8
-            precip_amount = np.random.gamma(5, 6)
-            # Occasionally have extreme rainfall events
-            if np.random.random() < 0.05:
-                precip_amount = np.random.gamma(15, 10)  # Heavy rainfall events
-        elif month == 8:  # August also very wet
-            daily_precip_chance = 0.75
-            precip_amount = np.random.gamma(4, 5)
-        elif month == 6:  # June (beginning of monsoon)
-            daily_precip_chance = 0.6
-            precip_amount = np.random.gamma(3, 4)
-        else:  # September (end of monsoon)
-            daily_precip_chance = 0.5
-            precip_amount = np.random.gamma(2, 3)
-            
-        if np.random.random() < daily_precip_chance:
-            precipitation.append(precip_amount)
-        else:
-            precipitation.append(0)
-    elif month in [5, 10]:  # Pre and post monsoon
-        if np.random.random() < 0.3:
-            precipitation.append(np.random.gamma(1, 2))
-        else:
-            precipitation.append(0)
-    else:  # Dry season (November-April)
-        if np.random.random() < 0.05:  # Rare rainfall in dry season
-            precipitation.append(np.random.gamma(0.5, 1))
-        else:
-            precipitation.append(0)
-    
-    # Humidity patterns based on Mumbai's climate
-    if month == 1:  # January
-        humidity.append(np.random.normal(62, 5))
-    elif month == 2:  # February
-        humidity.append(np.random.normal(65, 5))
-    elif month == 3:  # March
-        humidity.append(np.random.normal(67, 5))
-    elif month == 4:  # April
-        humidity.append(np.random.normal(70, 5))
-    elif month == 5:  # May
-        humidity.append(np.random.normal(73, 5))
-    elif month == 6:  # June
-        humidity.append(np.random.normal(80, 5))
-    elif month == 7:  # July
-        humidity.append(np.random.normal(86, 3))
-    elif month == 8:  # August
-        humidity.append(np.random.normal(85, 3))
-    elif month == 9:  # September
-        humidity.append(np.random.normal(82, 4))
-    elif month == 10:  # October
-        humidity.append(np.random.normal(75, 5))
-    elif month == 11:  # November
-        humidity.append(np.random.normal(68, 5))
-    else:  # December
-        humidity.append(np.random.normal(64, 5))
-    
-    # Cap humidity between 30-100%
-    humidity[i] = max(30, min(100, humidity[i]))
-
-# Generate air quality index (AQI) specific to Mumbai
-aqi = []
-for i, date in enumerate(random_dates):
-    month = date.month
-    
-    # AQI is generally moderate in Mumbai (50-100)
-    # Higher in winter months due to less dispersion
-    if month in [11, 12, 1, 2]:  # Winter months
-        base_aqi = np.random.gamma(9, 15)  # Higher AQI in winter (120-150 range)
-    elif month in [3, 4]:  # Pre-monsoon
-        base_aqi = np.random.gamma(7, 12)  # Moderate to poor (80-120 range)
-    elif month in [6, 7, 8, 9]:  # Monsoon
-        base_aqi = np.random.gamma(4, 10)  # Better AQI during monsoon (40-80 range)
-    else:
-        base_aqi = np.random.gamma(6, 12)  # Moderate (70-100 range)
-    
-    aqi.append(min(base_aqi, 300))  # Cap at hazardous level
-
-# Generate pollen count - Mumbai has specific pollen patterns
-pollen_count = []
-for i, date in enumerate(random_dates):
-    month = date.month
-    
-    # Mumbai has lower pollen counts during monsoon, higher in winter/spring
-    if month in [1, 2, 3]:  # Winter/early spring - flowering season
-        base_pollen = np.random.gamma(5, 15)
-    elif month in [4, 5]:  # Late spring/early summer
-        base_pollen = np.random.gamma(3, 10)
-    elif month in [6, 7, 8, 9]:  # Monsoon - pollen washed away
-        base_pollen = np.random.gamma(1, 5)
-    else:  # Post-monsoon
-        base_pollen = np.random.gamma(2, 8)
-    
-    pollen_count.append(min(base_pollen, 200))  # Cap extreme values
-
-# Generate cyclone/extreme weather event indicator for Mumbai
-# Mumbai cyclone risk is highest in May-June (pre-monsoon) and October-November (post-monsoon)
-is_cyclone_risk = []
-for date in random_dates:
-    month = date.month
-    # Cyclone risk periods: May-June and October-November
-    if month in [5, 6, 10, 11]:
-        is_cyclone_risk.append(np.random.binomial(1, 0.05))  # 5% chance during risk periods
-    else:
-        is_cyclone_risk.append(0)
-
-# Generate flu season indicator for Mumbai (typically coincides with winter)
-is_flu_season = []
-for date in random_dates:
-    # Flu season in Mumbai typically runs from November to February
-    if date.month in [11, 12, 1, 2]:
-        is_flu_season.append(1)
-    else:
-        is_flu_season.append(0)
+GENDERS = ['Male', 'Female', 'Non-binary']
+GENDER_PROBS = [0.48, 0.48, 0.04]
 
-# Generate vector-borne disease risk indicator (higher during monsoon)
-is_vector_disease_risk = []
-for date in random_dates:
-    if date.month in [6, 7, 8, 9, 10]:  # Monsoon and post-monsoon
-        is_vector_disease_risk.append(np.random.binomial(1, 0.15))  # 15% chance during monsoon
-    else:
-        is_vector_disease_risk.append(np.random.binomial(1, 0.03))  # 3% chance other times
-
-# Generate comorbidity data based on Mumbai's health statistics
-# 60% of Mumbaikars struggle with weight issues
-is_overweight = np.random.binomial(1, 0.46, size=n_samples)  # 46% overweight
-is_obese = np.random.binomial(1, 0.12, size=n_samples)  # 12% obese
-
-# Diabetes - 18% of Mumbaikars aged 18-69 have diabetes
-has_diabetes = []
-for i, age in enumerate(ages):
-    if age < 18:
-        has_diabetes.append(0)
-    elif age >= 18 and age < 35:
-        has_diabetes.append(np.random.binomial(1, 0.05))  # 5% in younger adults
-    elif age >= 35 and age < 50:
-        has_diabetes.append(np.random.binomial(1, 0.15))  # 15% in middle-aged
-    else:
-        has_diabetes.append(np.random.binomial(1, 0.25))  # 25% in older adults
-    
-    # Adjust for obesity/overweight
-    if has_diabetes[i] == 0 and (is_overweight[i] or is_obese[i]):
-        has_diabetes[i] = np.random.binomial(1, 0.2)  # Higher chance if overweight/obese
-
-# Hypertension - 26% of Mumbai's adult population
-has_hypertension = []
-for i, age in enumerate(ages):
-    if age < 18:
-        has_hypertension.append(0)
-    elif age >= 18 and age < 35:
-        has_hypertension.append(np.random.binomial(1, 0.1))  # 10% in younger adults
-    elif age >= 35 and age < 50:
-        has_hypertension.append(np.random.binomial(1, 0.25))  # 25% in middle-aged
-    else:
-        has_hypertension.append(np.random.binomial(1, 0.4))  # 40% in older adults
-    
-    # Adjust for obesity/overweight
-    if has_hypertension[i] == 0 and (is_overweight[i] or is_obese[i]):
-        has_hypertension[i] = np.random.binomial(1, 0.3)  # Higher chance if overweight/obese
-
-# Asthma - rising in Mumbai, especially in children
-has_asthma = []
-for i, age in enumerate(ages):
-    if age < 18:
-        has_asthma.append(np.random.binomial(1, 0.15))  # 15% in children (increased rate)
-    else:
-        has_asthma.append(np.random.binomial(1, 0.09))  # 9% in adults
-
-# COPD
-has_copd = []
-for i, age in enumerate(ages):
-    if age < 18:
-        has_copd.append(0)  # No COPD in children
-    elif age >= 18 and age < 40:
-        has_copd.append(np.random.binomial(1, 0.02))  # 2% in young adults
-    elif age >= 40 and age < 60:
-        has_copd.append(np.random.binomial(1, 0.05))  # 5% in middle-aged
-    else:
-        has_copd.append(np.random.binomial(1, 0.1))  # 10% in older adults
-
-# Heart disease
-has_heart_disease = []
-for i, age in enumerate(ages):
-    if age < 18:
-        has_heart_disease.append(0)  # No heart disease in children
-    elif age >= 18 and age < 40:
-        has_heart_disease.append(np.random.binomial(1, 0.02))  # 2% in young adults
-    elif age >= 40 and age < 60:
-        has_heart_disease.append(np.random.binomial(1, 0.1))  # 10% in middle-aged
-    else:
-        has_heart_disease.append(np.random.binomial(1, 0.2))  # 20% in older adults
-    
-    # Adjust for diabetes and hypertension
-    if has_heart_disease[i] == 0 and (has_diabetes[i] or has_hypertension[i]):
-        has_heart_disease[i] = np.random.binomial(1, 0.15)  # Higher chance with comorbidities
-
-# Generate holiday/festival indicator (Indian holidays)
-is_holiday = []
-for date in random_dates:
-    # Major Indian holidays and periods
-    if (date.month == 1 and date.day == 26) or \
-       (date.month == 8 and date.day == 15) or \
-       (date.month == 10 and date.day >= 15 and date.day <= 25) or \
-       (date.month == 9 and date.day >= 1 and date.day <= 10) or \
-       (date.month == 3 and date.day >= 15 and date.day <= 20) or \
-       (date.month == 4 and date.day >= 10 and date.day <= 15):
-        is_holiday.append(1)
-    else:
-        is_holiday.append(0)
-
-# Generate distance to nearest hospital (km) - SDOH factor
-distance_to_hospital = []
-for i, area in enumerate(area_distribution):
-    if area == 'South Mumbai':
-        base_dist = 1.5
-    elif area == 'Western Suburbs':
-        base_dist = 2.5
-    elif area == 'Eastern Suburbs':
-        base_dist = 3.0
-    elif area == 'Navi Mumbai':
-        base_dist = 3.5
-    else:  # Thane
-        base_dist = 4.0
-        
-    if ses[i] == 'Low':
-        distance_to_hospital.append(max(0.5, np.random.gamma(base_dist, 1.5)))
-    elif ses[i] == 'Medium-Low':
-        distance_to_hospital.append(max(0.5, np.random.gamma(base_dist, 1.2)))
-    elif ses[i] == 'Medium':
-        distance_to_hospital.append(max(0.5, np.random.gamma(base_dist, 1.0)))
-    elif ses[i] == 'Medium-High':
-        distance_to_hospital.append(max(0.5, np.random.gamma(base_dist * 0.8, 0.8)))
-    else:  # High
-        distance_to_hospital.append(max(0.5, np.random.gamma(base_dist * 0.6, 0.6)))
-
-# Generate access to primary care (binary) - SDOH factor
-has_primary_care = []
-for i, s in enumerate(ses):
-    if is_slum_dwelling[i]:
-        base_access = 0.5  # Lower access in slums
-    else:
-        base_access = 0.7  # Higher access in non-slums
-        
-    if s == 'Low':
-        has_primary_care.append(np.random.binomial(1, base_access * 0.6))
-    elif s == 'Medium-Low':
-        has_primary_care.append(np.random.binomial(1, base_access * 0.7))
-    elif s == 'Medium':
-        has_primary_care.append(np.random.binomial(1, base_access * 0.8))
-    elif s == 'Medium-High':
-        has_primary_care.append(np.random.binomial(1, base_access * 0.9))
-    else:  # High
-        has_primary_care.append(np.random.binomial(1, base_access))
-
-# Generate transportation access (binary) - SDOH factor
-has_transportation = []
-for i, s in enumerate(ses):
-    area = area_distribution[i]
-    # Mumbai has good public transport overall, but varies by area and SES
-    if area == 'South Mumbai':
-        base_prob = 0.9
-    elif area in ['Western Suburbs', 'Eastern Suburbs']:
-        base_prob = 0.85
-    elif area == 'Navi Mumbai':
-        base_prob = 0.8
-    else:  # Thane
-        base_prob = 0.75
-        
-    if s == 'Low':
-        has_transportation.append(np.random.binomial(1, base_prob * 0.8))
-    elif s == 'Medium-Low':
-        has_transportation.append(np.random.binomial(1, base_prob * 0.9))
-    elif s == 'Medium':
-        has_transportation.append(np.random.binomial(1, base_prob * 0.95))
-    elif s == 'Medium-High':
-        has_transportation.append(np.random.binomial(1, base_prob * 0.98))
-    else:  # High
-        has_transportation.append(np.random.binomial(1, base_prob))
-
-# Calculate synthetic healthcare demand data
-# Base rates
-er_base_rate = 0.5
-opd_base_rate = 1.2
-admission_base_rate = 0.25
-
-# Calculate modifiers and generate healthcare utilization metrics
-er_visits = []
-opd_visits = []
-admission_rate = []
-los_days = []
-
-for i in range(n_samples):
-    # Season and weather modifiers
-    season_mod_er = 1.0
-    season_mod_opd = 1.0
-    
-    # Flu season effect
-    if is_flu_season[i]:
-        season_mod_er *= 1.3
-        season_mod_opd *= 1.2
-    
-    # Vector-borne disease effect (dengue, malaria)
-    if is_vector_disease_risk[i]:
-        season_mod_er *= 1.4
-        season_mod_opd *= 1.3
-    
-    # Cyclone/extreme weather effect
-    if is_cyclone_risk[i]:
-        season_mod_er *= 1.5  # Significant increase during cyclone risk periods
-    
-    # Temperature effects (extreme temperatures increase visits)
-    if temperature[i] > 32:  # Heat effect - common in Mumbai summers
-        temp_mod_er = 1.0 + min(1.0, (temperature[i] - 32) / 8)  # Increases with temperature
-        # Elderly more affected by heat
-        if ages[i] > 65:
-            temp_mod_er *= 1.6
-    else:
-        temp_mod_er = 1.0
-    
-    # Humidity effect - high humidity can exacerbate heat stress
-    if humidity[i] > 80 and temperature[i] > 30:
-        humidity_mod = 1.2  # High humidity + high temp increases visits
-    else:
-        humidity_mod = 1.0
-    
-    # AQI effect on respiratory conditions
-    if aqi[i] > 100:  # Unhealthy air quality
-        aqi_mod = 1.0 + min(1.0, (aqi[i] - 100) / 100)
-        # Stronger effect on people with respiratory conditions
-        if has_asthma[i] or has_copd[i]:
-            aqi_mod *= 1.5
-    else:
-        aqi_mod = 1.0
-    
-    # Pollen effect on allergies and asthma
-    if pollen_count[i] > 100:  # High pollen
-        if has_asthma[i]:
-            pollen_mod = 1.3
-        else:
-            pollen_mod = 1.1
-    else:
-        pollen_mod = 1.0
-    
-    # Heavy rainfall effect - flooding, water-borne diseases
-    if precipitation[i] > 50:  # Heavy rainfall day
-        rain_mod = 1.3
-    elif precipitation[i] > 20:  # Moderate rainfall
-        rain_mod = 1.1
-    else:
-        rain_mod = 1.0
-    
-    # Age modifier
-    if ages[i] < 5 or ages[i] > 75:
-        age_mod = 1.4  # Higher utilization for very young and elderly
-    elif ages[i] < 18:
-        age_mod = 1.1
-    elif ages[i] > 65:
-        age_mod = 1.3
-    else:
-        age_mod = 1.0
-    
-    # Comorbidity modifier
-    comorbidity_count = has_diabetes[i] + has_hypertension[i] + has_asthma[i] + has_copd[i] + has_heart_disease[i]
-    comorbidity_mod = 1.0 + (comorbidity_count * 0.15)
-    
-    # SDOH modifiers
-    # Distance to hospital affects ER use
-    if distance_to_hospital[i] > 5:
-        distance_mod = 0.9  # Reduced use if far away
-    else:
-        distance_mod = 1.0
-    
-    # Primary care access reduces ER use but increases OPD
-    if has_primary_care[i]:
-        primary_care_mod_er = 0.8
-        primary_care_mod_opd = 1.2
-    else:
-        primary_care_mod_er = 1.2
-        primary_care_mod_opd = 0.9
-    
-    # Transportation access
-    if not has_transportation[i]:
-        transport_mod = 0.8  # Harder to get to healthcare
-    else:
-        transport_mod = 1.0
-    
-    # SES modifier
-    if ses[i] == 'Low':
-        ses_mod_er = 1.3  # Higher ER use for low SES
-        ses_mod_opd = 0.8  # Lower OPD use for low SES
-    elif ses[i] == 'Medium-Low':
-        ses_mod_er = 1.1
-        ses_mod_opd = 0.9
-    elif ses[i] == 'Medium':
-        ses_mod_er = 1.0
-        ses_mod_opd = 1.0
-    elif ses[i] == 'Medium-High':
-        ses_mod_er = 0.9
-        ses_mod_opd = 1.1
-    else:  # High
-        ses_mod_er = 0.8
-        ses_mod_opd = 1.2
-    
-    # Holiday effect (higher ER use during holidays)
-    if is_holiday[i]:
-        holiday_mod_er = 1.2
-    else:
-        holiday_mod_er = 1.0
-    
-    # Calculate final rates with all modifiers
-    er_rate = er_base_rate * season_mod_er * temp_mod_er * humidity_mod * aqi_mod * pollen_mod * \
-              rain_mod * age_mod * comorbidity_mod * distance_mod * primary_care_mod_er * \
-              transport_mod * ses_mod_er * holiday_mod_er
-    
-    opd_rate = opd_base_rate * season_mod_opd * age_mod * comorbidity_mod * \
-               primary_care_mod_opd * transport_mod * ses_mod_opd
-    
-    # Generate visit counts using Poisson distribution
-    er_visits.append(np.random.poisson(er_rate))
-    opd_visits.append(np.random.poisson(opd_rate))
-    
-    # Calculate admission probability based on ER visits and patient factors
-    if er_visits[i] > 0:
-        admission_prob = admission_base_rate * age_mod * comorbidity_mod
-        # Increase admission probability during extreme weather events
-        if is_cyclone_risk[i]:
-            admission_prob *= 1.3
-        admission_rate.append(np.random.binomial(1, admission_prob))
-        
-        # Calculate length of stay if admitted
-        if admission_rate[i] > 0:
-            base_los = 3 + (comorbidity_count * 0.5)
-            # Longer stays during extreme weather or vector-borne disease outbreaks
-            if is_cyclone_risk[i] or is_vector_disease_risk[i]:
-                base_los += 1
-            los_days.append(max(1, np.random.poisson(base_los)))
+# Mumbai-specific geographic areas, with the columns of every per-area table
+# below in this order
+AREAS = ['South Mumbai', 'Western Suburbs', 'Eastern Suburbs', 'Navi Mumbai', 'Thane']
+AREA_PROBS = [0.15, 0.35, 0.2, 0.15, 0.15]
+
+# PIN code ranges [low, high) that correlate with areas (actual Mumbai PIN codes)
+PIN_RANGES = np.array([(400001, 400020), (400050, 400090), (400070, 400099), (400700, 400710), (400600, 400612)])
+
+# Slum dwelling share per area - approximately 40% of Mumbai's population lives in slums
+SLUM_PROBS = np.array([0.25, 0.45, 0.45, 0.35, 0.35])
+
+# Socioeconomic status (SES) as SDOH factor, correlated with area and slum dwelling.
+# Rows are the areas, then slum dwellers in any area
+SES_CATEGORIES = ['Low', 'Medium-Low', 'Medium', 'Medium-High', 'High']
+SES_PROBS = np.array([
+    [0.1, 0.15, 0.25, 0.25, 0.25],  # South Mumbai
+    [0.15, 0.2, 0.3, 0.2, 0.15],    # Western Suburbs
+    [0.2, 0.25, 0.3, 0.15, 0.1],    # Eastern Suburbs
+    [0.15, 0.2, 0.35, 0.2, 0.1],    # Navi Mumbai
+    [0.2, 0.25, 0.3, 0.15, 0.1],    # Thane
+    [0.6, 0.3, 0.1, 0.0, 0.0],      # Slum dwelling
+])
+
+# Insurance status by SES - 73% of surveyed households did not have health insurance
+INSURANCE_TYPES = ['Private', 'Government', 'Employer', 'None']
+INSURANCE_PROBS = np.array([
+    [0.05, 0.15, 0.05, 0.75],  # Low
+    [0.1, 0.15, 0.1, 0.65],    # Medium-Low
+    [0.2, 0.1, 0.15, 0.55],    # Medium
+    [0.4, 0.05, 0.2, 0.35],    # Medium-High
+    [0.6, 0.02, 0.18, 0.2],    # High
+])
+
+# Month-based parameters, indexed by month - 1 (January first)
+SEASONS = ['Winter', 'Summer', 'Monsoon', 'Post-Monsoon']
+MONTH_SEASON = np.array([0, 0, 1, 1, 1, 2, 2, 2, 2, 3, 3, 0])
+
+# Temperature patterns based on Mumbai's climate data
+TEMP_MEAN = np.array([23.9, 25.4, 27.5, 28.6, 29.7, 28.4, 26.7, 26.3, 26.9, 28.8, 27.4, 24.1])
+TEMP_STD = np.array([3.3, 3.4, 3.0, 2.7, 2.1, 1.8, 0.9, 1.1, 1.8, 2.6, 3.0, 3.3])
+
+# Precipitation based on Mumbai's monsoon: chance of rain and gamma(shape, scale) amount.
+# June-September is the monsoon, May and October are transitional, the rest is dry
+RAIN_CHANCE = np.array([0.05, 0.05, 0.05, 0.05, 0.3, 0.6, 0.8, 0.75, 0.5, 0.3, 0.05, 0.05])
+RAIN_SHAPE = np.array([0.5, 0.5, 0.5, 0.5, 1, 3, 5, 4, 2, 1, 0.5, 0.5])
+RAIN_SCALE = np.array([1, 1, 1, 1, 2, 4, 6, 5, 3, 2, 1, 1])
+# July, the wettest month, occasionally has extreme rainfall events
+EXTREME_RAIN_CHANCE = np.array([0, 0, 0, 0, 0, 0, 0.05, 0, 0, 0, 0, 0])
+EXTREME_RAIN_SHAPE, EXTREME_RAIN_SCALE = 15, 10
+
+# Humidity patterns based on Mumbai's climate, capped between 30-100%
+HUMIDITY_MEAN = np.array([62, 65, 67, 70, 73, 80, 86, 85, 82, 75, 68, 64])
+HUMIDITY_STD = np.array([5, 5, 5, 5, 5, 5, 3, 3, 4, 5, 5, 5])
+
+# AQI as gamma(shape, scale): worse in winter due to less dispersion, best in the monsoon
+AQI_SHAPE = np.array([9, 9, 7, 7, 6, 4, 4, 4, 4, 6, 9, 9])
+AQI_SCALE = np.array([15, 15, 12, 12, 12, 10, 10, 10, 10, 12, 15, 15])
+AQI_CAP = 300  # Cap at hazardous level
+
+# Pollen as gamma(shape, scale): high in winter/spring, washed away in the monsoon
+POLLEN_SHAPE = np.array([5, 5, 5, 3, 3, 1, 1, 1, 1, 2, 2, 2])
+POLLEN_SCALE = np.array([15, 15, 15, 10, 10, 5, 5, 5, 5, 8, 8, 8])
+POLLEN_CAP = 200  # Cap extreme values
+
+# Cyclone risk is highest in May-June (pre-monsoon) and October-November (post-monsoon)
+CYCLONE_PROBS = np.array([0, 0, 0, 0, 0.05, 0.05, 0, 0, 0, 0.05, 0.05, 0])
+# Flu season in Mumbai typically runs from November to February
+FLU_SEASON = np.array([1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1])
+# Vector-borne disease risk is higher in the monsoon and post-monsoon
+VECTOR_DISEASE_PROBS = np.array([0.03, 0.03, 0.03, 0.03, 0.03, 0.15, 0.15, 0.15, 0.15, 0.15, 0.03, 0.03])
+
+# Major Indian holidays and periods: (month, first day, last day)
+HOLIDAYS = [(1, 26, 26), (8, 15, 15), (10, 15, 25), (9, 1, 10), (3, 15, 20), (4, 10, 15)]
+
+# Comorbidity prevalence by age band. Diabetes and hypertension use bands
+# <18, 18-34, 35-49, 50+; COPD and heart disease use <18, 18-39, 40-59, 60+.
+# A negative draw is redrawn at the given rate for at-risk patients
+DIABETES_PROBS, DIABETES_AT_RISK = [0, 0.05, 0.15, 0.25], 0.2  # overweight/obese
+HYPERTENSION_PROBS, HYPERTENSION_AT_RISK = [0, 0.1, 0.25, 0.4], 0.3  # overweight/obese
+COPD_PROBS = [0, 0.02, 0.05, 0.1]
+HEART_DISEASE_PROBS, HEART_DISEASE_AT_RISK = [0, 0.02, 0.1, 0.2], 0.15  # diabetes/hypertension
+
+# Distance to nearest hospital (km) as gamma(base * shape factor, scale) with base per area
+# and factor/scale per SES - SDOH factor
+DISTANCE_BASE = np.array([1.5, 2.5, 3.0, 3.5, 4.0])
+DISTANCE_SHAPE_FACTOR = np.array([1, 1, 1, 0.8, 0.6])
+DISTANCE_SCALE = np.array([1.5, 1.2, 1.0, 0.8, 0.6])
+
+# Access to primary care: lower in slums, scaled down for lower SES
+PRIMARY_CARE_BASE = {True: 0.5, False: 0.7}
+PRIMARY_CARE_FACTOR = np.array([0.6, 0.7, 0.8, 0.9, 1.0])
+
+# Mumbai has good public transport overall, but varies by area and SES
+TRANSPORT_BASE = np.array([0.9, 0.85, 0.85, 0.8, 0.75])
+TRANSPORT_FACTOR = np.array([0.8, 0.9, 0.95, 0.98, 1.0])
+
+# Base rates of healthcare utilisation
+ER_BASE_RATE = 0.5
+OPD_BASE_RATE = 1.2
+ADMISSION_BASE_RATE = 0.25
+
+# Low SES uses the ER more and the OPD less
+SES_MOD_ER = np.array([1.3, 1.1, 1.0, 0.9, 0.8])
+SES_MOD_OPD = np.array([0.8, 0.9, 1.0, 1.1, 1.2])
+
+# Higher ER use during holidays
+HOLIDAY_ER_MOD = 1.2
+
+# Other cities, for multi-city runs: the cities find_doctors.py scrapes, named
+# by the same slugs. The Mumbai tables above are the 'konkan' climate zone and
+# the 'mumbai' profile; every other city is a climate zone adjusted for the city
+# and the same five-part area layout.
+# Monthly climate tables per zone; missing tables fall back to Mumbai's
+CLIMATE_ZONES = {
+    # Konkan coast: Mumbai, Thane, Navi Mumbai
+    'konkan': {},
+    # Indo-Gangetic plains: cold winters with smog, hot summers, July-September monsoon
+    'gangetic': {
+        'temp_mean': np.array([15.5, 19.0, 25.0, 31.0, 34.0, 33.5, 30.5, 29.5, 29.5, 27.0, 21.5, 16.5]),
+        'temp_std': np.array([3.5, 3.5, 3.5, 3.0, 2.8, 2.5, 1.5, 1.5, 1.5, 2.5, 3.0, 3.5]),
+        'rain_chance': np.array([0.1, 0.1, 0.08, 0.05, 0.1, 0.35, 0.65, 0.6, 0.4, 0.08, 0.02, 0.05]),
+        'rain_shape': np.array([0.5, 0.5, 0.5, 0.5, 0.8, 2, 4, 4, 2, 1, 0.5, 0.5]),
+        'rain_scale': np.array([1, 1, 1, 1, 2, 4, 6, 5, 4, 2, 1, 1]),
+        'extreme_rain_chance': np.array([0, 0, 0, 0, 0, 0, 0.02, 0.02, 0, 0, 0, 0]),
+        'humidity_mean': np.array([72, 62, 48, 35, 40, 58, 80, 83, 79, 67, 65, 71]),
+        'humidity_std': np.array([6, 6, 6, 6, 6, 6, 4, 4, 4, 5, 5, 6]),
+        'aqi_shape': np.array([13, 11, 8, 7, 7, 6, 4, 4, 5, 9, 13, 13]),
+        'aqi_scale': np.array([19, 17, 15, 13, 12, 10, 9, 9, 10, 16, 20, 20]),
+        'pollen_shape': np.array([3, 5, 6, 5, 3, 1, 1, 1, 1, 2, 2, 2]),
+        'cyclone': np.zeros(12),
+        'vector_disease': np.array([0.02, 0.02, 0.02, 0.02, 0.03, 0.05, 0.15, 0.18, 0.18, 0.15, 0.08, 0.02]),
+    },
+    # Gujarat and Saurashtra: semi-arid, short monsoon, cyclones off the coast
+    'gujarat': {
+        'temp_mean': np.array([20.5, 23.0, 27.5, 31.5, 33.5, 32.0, 29.0, 28.0, 28.5, 28.5, 25.0, 21.5]),
+        'temp_std': np.array([3.0, 3.0, 3.0, 2.5, 2.2, 2.0, 1.2, 1.2, 1.5, 2.2, 2.8, 3.0]),
+        'rain_chance': np.array([0.02, 0.02, 0.02, 0.02, 0.05, 0.35, 0.65, 0.55, 0.35, 0.05, 0.02, 0.02]),
+        'humidity_mean': np.array([50, 45, 40, 45, 55, 66, 80, 82, 75, 56, 50, 52]),
+        'aqi_shape': np.array([10, 9, 8, 7, 7, 5, 4, 4, 5, 8, 10, 10]),
+        'aqi_scale': np.array([16, 15, 13, 12, 12, 10, 9, 9, 10, 14, 16, 16]),
+        'cyclone': np.array([0, 0, 0, 0, 0.03, 0.04, 0, 0, 0, 0.02, 0.02, 0]),
+    },
+    # Deccan plateau and central India: dry heat before the monsoon, mild winters
+    'deccan': {
+        'temp_mean': np.array([21.0, 24.0, 28.5, 32.5, 35.0, 31.0, 27.0, 26.5, 27.5, 26.5, 23.0, 20.5]),
+        'temp_std': np.array([3.0, 3.0, 3.0, 2.5, 2.5, 2.2, 1.2, 1.2, 1.5, 2.2, 2.8, 3.0]),
+        'rain_chance': np.array([0.03, 0.03, 0.04, 0.05, 0.08, 0.45, 0.75, 0.7, 0.45, 0.12, 0.04, 0.02]),
+        'humidity_mean': np.array([55, 45, 35, 30, 32, 62, 82, 85, 78, 62, 55, 55]),
+        'aqi_shape': np.array([10, 9, 8, 7, 6, 4, 4, 4, 4, 7, 10, 10]),
+        'aqi_scale': np.array([15, 14, 13, 12, 11, 10, 9, 9, 10, 13, 15, 15]),
+        'cyclone': np.zeros(12),
+    },
+    # Kerala coast: warm all year, south-west and north-east monsoons
+    'malabar': {
+        'temp_mean': np.array([27.0, 27.8, 28.8, 29.3, 28.8, 26.8, 26.0, 26.3, 26.8, 27.0, 27.0, 27.0]),
+        'temp_std': np.array([1.2, 1.2, 1.1, 1.0, 1.1, 1.0, 0.9, 0.9, 1.0, 1.0, 1.1, 1.2]),
+        'rain_chance': np.array([0.1, 0.1, 0.2, 0.4, 0.55, 0.85, 0.85, 0.75, 0.6, 0.6, 0.5, 0.2]),
+        'humidity_mean': np.array([70, 72, 74, 76, 79, 86, 88, 86, 84, 83, 80, 73]),
+        'aqi_shape': np.array([5, 5, 5, 5, 4, 3, 3, 3, 3, 4, 4, 5]),
+        'aqi_scale': np.array([12, 12, 12, 11, 10, 10, 9, 9, 9, 10, 11, 12]),
+        'cyclone': np.array([0, 0, 0, 0, 0.05, 0.03, 0, 0, 0, 0.03, 0.05, 0.02]),
+        'vector_disease': np.array([0.03, 0.03, 0.03, 0.05, 0.1, 0.18, 0.18, 0.15, 0.12, 0.12, 0.1, 0.05]),
+    },
+}
+
+# Per city: climate zone, population (millions, relative weight in a run),
+# slum share, PIN range [low, high), and temperature (°C) and AQI adjustments
+# to the zone
+CITY_PROFILES = {
+    'mumbai': ('konkan', 18.4, None, None, 0.0, 1.0),  # the per-area tables above
+    'agra': ('gangetic', 1.76, 0.10, (282001, 282011), 0.5, 1.15),
+    'ahmedabad': ('gujarat', 6.36, 0.05, (380001, 380062), 0.5, 1.1),
+    'allahabad': ('gangetic', 1.21, 0.10, (211001, 211019), 0.5, 1.1),
+    'amritsar': ('gangetic', 1.18, 0.10, (143001, 143022), -2.0, 1.1),
+    'bhopal': ('deccan', 1.89, 0.27, (462001, 462047), -1.0, 1.0),
+    'chandigarh': ('gangetic', 1.03, 0.10, (160001, 160037), -1.5, 0.9),
+    'kanpur': ('gangetic', 2.92, 0.15, (208001, 208028), 0.0, 1.3),
+    'kozhikode': ('malabar', 2.03, 0.02, (673001, 673033), 0.0, 0.8),
+    'lucknow': ('gangetic', 2.90, 0.12, (226001, 226031), 0.0, 1.2),
+    'nagpur': ('deccan', 2.50, 0.34, (440001, 440037), 1.0, 1.0),
+    'nashik': ('deccan', 1.56, 0.11, (422001, 422013), -2.0, 0.9),
+    'navi-mumbai': ('konkan', 1.12, 0.17, (400701, 400711), 0.0, 1.0),
+    'noida': ('gangetic', 0.64, 0.10, (201301, 201311), 0.5, 1.4),
+    'patna': ('gangetic', 2.05, 0.05, (800001, 800031), 0.5, 1.3),
+    'rajkot': ('gujarat', 1.39, 0.19, (360001, 360025), 0.0, 1.0),
+    'ranchi': ('deccan', 1.13, 0.07, (834001, 834012), -2.5, 0.9),
+    'surat': ('gujarat', 4.59, 0.06, (395001, 395023), -0.5, 1.0),
+    'thane': ('konkan', 1.84, 0.25, (400601, 400616), 0.0, 1.0),
+    'thiruvananthapuram': ('malabar', 1.69, 0.03, (695001, 695044), 0.0, 0.8),
+    'vadodara': ('gujarat', 1.82, 0.10, (390001, 390026), 0.0, 1.0),
+    'varanasi': ('gangetic', 1.43, 0.12, (221001, 221011), 0.5, 1.15),
+}
+CITIES = list(CITY_PROFILES)
+DEFAULT_CITIES = ('mumbai',)
+
+# Area layout of the other cities, with the same per-area tables as Mumbai's;
+# the SES rows reuse Mumbai's (affluent centre to peripheral areas)
+CITY_ZONES = ['Central', 'North', 'South', 'East', 'West']
+CITY_ZONE_PROBS = np.array([0.3, 0.2, 0.2, 0.15, 0.15])
+CITY_ZONE_SLUM_FACTOR = np.array([0.7, 1.0, 1.2, 1.2, 0.9])
+CITY_ZONE_DISTANCE_BASE = DISTANCE_BASE
+CITY_ZONE_TRANSPORT_BASE = TRANSPORT_BASE
+
+
+def _city_areas(city):
+    if city == 'mumbai':
+        return AREAS
+    name = city.replace('-', ' ').title()
+    return [f'{name} {zone}' for zone in CITY_ZONES]
+
+
+# Every area of every city; Mumbai's come first, so its codes match AREAS
+ALL_AREAS = [area for city in CITIES for area in _city_areas(city)]
+
+# Month tables making up a climate zone, and Mumbai's values for each
+CLIMATE_TABLES = {
+    'temp_mean': TEMP_MEAN, 'temp_std': TEMP_STD, 'rain_chance': RAIN_CHANCE, 'rain_shape': RAIN_SHAPE,
+    'rain_scale': RAIN_SCALE, 'extreme_rain_chance': EXTREME_RAIN_CHANCE, 'humidity_mean': HUMIDITY_MEAN,
+    'humidity_std': HUMIDITY_STD, 'aqi_shape': AQI_SHAPE, 'aqi_scale': AQI_SCALE,
+    'pollen_shape': POLLEN_SHAPE, 'pollen_scale': POLLEN_SCALE, 'cyclone': CYCLONE_PROBS,
+    'vector_disease': VECTOR_DISEASE_PROBS,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def city_tables(cities=DEFAULT_CITIES):
+    """Parameter tables for a run over cities (a tuple of CITY_PROFILES keys).
+
+    The areas of all the cities are numbered 0.. in order. Per-area tables are
+    indexed by that number: area_probs (the share of the run's patients, cities
+    weighted by population), area_city (index into cities), area_codes (code in
+    ALL_AREAS), pin_ranges, slum_probs, distance_base and transport_base. The
+    ses_probs rows are the areas and then one slum row per city (slum_row).
+    Climate tables are indexed [city, month]. With only Mumbai every table has
+    the values of the Mumbai tables above.
+    """
+    unknown = set(cities) - set(CITY_PROFILES)
+    if unknown:
+        raise ValueError(f"unknown cities: {', '.join(sorted(unknown))}")
+    population = np.array([CITY_PROFILES[city][1] for city in cities])
+    weights = population / population.sum()
+    tables = {key: [] for key in ['area_probs', 'area_city', 'area_codes', 'pin_ranges', 'slum_probs',
+                                  'distance_base', 'transport_base', 'ses_probs', *CLIMATE_TABLES]}
+    for i, city in enumerate(cities):
+        zone, _, slum_share, pins, temp_offset, aqi_factor = CITY_PROFILES[city]
+        areas = _city_areas(city)
+        tables['area_city'].append(np.full(len(areas), i))
+        tables['area_codes'].append(np.array([ALL_AREAS.index(area) for area in areas]))
+        if city == 'mumbai':
+            tables['area_probs'].append(weights[i] * np.asarray(AREA_PROBS))
+            tables['pin_ranges'].append(PIN_RANGES)
+            tables['slum_probs'].append(SLUM_PROBS)
+            tables['distance_base'].append(DISTANCE_BASE)
+            tables['transport_base'].append(TRANSPORT_BASE)
         else:
-            los_days.append(0)
+            tables['area_probs'].append(weights[i] * CITY_ZONE_PROBS)
+            # The PIN range is split evenly between the areas
+            bounds = np.linspace(*pins, len(areas) + 1).astype(int)
+            tables['pin_ranges'].append(np.column_stack([bounds[:-1], np.maximum(bounds[1:], bounds[:-1] + 1)]))
+            tables['slum_probs'].append(np.minimum(1.0, slum_share * CITY_ZONE_SLUM_FACTOR))
+            tables['distance_base'].append(CITY_ZONE_DISTANCE_BASE)
+            tables['transport_base'].append(CITY_ZONE_TRANSPORT_BASE)
+        for key, mumbai in CLIMATE_TABLES.items():
+            tables[key].append(CLIMATE_ZONES[zone].get(key, mumbai))
+        tables['temp_mean'][-1] = tables['temp_mean'][-1] + temp_offset
+        tables['aqi_scale'][-1] = tables['aqi_scale'][-1] * aqi_factor
+
+    tables = {key: np.concatenate(values) for key, values in tables.items() if values}
+    tables.update({key: tables[key].reshape(len(cities), 12) for key in CLIMATE_TABLES})
+    # Every city has five areas, matched to Mumbai's SES rows in order; slum rows follow
+    tables['ses_probs'] = np.vstack([SES_PROBS[:len(AREAS)]] * len(cities) + [SES_PROBS[len(AREAS):]] * len(cities))
+    tables['slum_row'] = len(tables['area_city']) + np.arange(len(cities))
+    tables['city_codes'] = np.array([CITIES.index(city) for city in cities])
+    return tables
+
+
+def _environment(rng, month, city, tables):
+    """Weather and seasonal risk draws for each entry of month (0-11) in city (index into tables)"""
+    n = len(month)
+    table = lambda key: tables[key][city, month]
+    temperature = rng.normal(table('temp_mean'), table('temp_std'))
+    rain_amount = rng.gamma(table('rain_shape'), table('rain_scale'))
+    extreme = rng.random(n) < table('extreme_rain_chance')
+    rain_amount[extreme] = rng.gamma(EXTREME_RAIN_SHAPE, EXTREME_RAIN_SCALE, extreme.sum())
+    rain_amount[rng.random(n) >= table('rain_chance')] = 0.0
+    precipitation = rain_amount
+    humidity = np.clip(rng.normal(table('humidity_mean'), table('humidity_std')), 30, 100)
+    aqi = np.minimum(rng.gamma(table('aqi_shape'), table('aqi_scale')), AQI_CAP)
+    pollen_count = np.minimum(rng.gamma(table('pollen_shape'), table('pollen_scale')), POLLEN_CAP)
+    is_cyclone_risk = rng.random(n) < table('cyclone')
+    is_flu_season = FLU_SEASON[month].astype(bool)
+    is_vector_disease_risk = rng.random(n) < table('vector_disease')
+    return (temperature, precipitation, humidity, aqi, pollen_count,
+            is_cyclone_risk, is_flu_season, is_vector_disease_risk)
+
+
+def _is_holiday(month, day):
+    is_holiday = np.zeros(len(month), dtype=bool)
+    for holiday_month, first_day, last_day in HOLIDAYS:
+        is_holiday |= (month == holiday_month - 1) & (day >= first_day) & (day <= last_day)
+    return is_holiday
+
+
+def _age_mod(ages):
+    # Higher utilization for very young and elderly
+    return np.select([(ages < 5) | (ages > 75), ages < 18, ages > 65], [1.4, 1.1, 1.3], 1.0)
+
+
+# The modifiers below multiply into the ER and OPD rates in place, one
+# temporary at a time. Every argument may be an array that broadcasts
+# against the rates, so day-level conditions can be combined with patient
+# classes (see generate_daily)
+
+def _environment_mods(er_rate, opd_rate, is_flu_season, is_vector_disease_risk, is_cyclone_risk,
+                      temperature, humidity, aqi, pollen_count, precipitation, elderly, respiratory, asthma):
+    # Season and weather modifiers: flu season, vector-borne disease (dengue,
+    # malaria) and cyclone/extreme weather
+    er_rate *= np.where(is_flu_season, 1.3, 1.0)
+    opd_rate *= np.where(is_flu_season, 1.2, 1.0)
+    er_rate *= np.where(is_vector_disease_risk, 1.4, 1.0)
+    opd_rate *= np.where(is_vector_disease_risk, 1.3, 1.0)
+    er_rate *= np.where(is_cyclone_risk, 1.5, 1.0)
+
+    # Extreme heat increases visits, and the elderly are more affected
+    er_rate *= np.where(temperature > 32,
+                        (1.0 + np.minimum(1.0, (temperature - 32) / 8)) * np.where(elderly, 1.6, 1.0), 1.0)
+    # High humidity together with high temperature exacerbates heat stress
+    er_rate *= np.where((humidity > 80) & (temperature > 30), 1.2, 1.0)
+    # Unhealthy air quality, with a stronger effect on respiratory conditions
+    er_rate *= np.where(aqi > 100,
+                        (1.0 + np.minimum(1.0, (aqi - 100) / 100)) * np.where(respiratory, 1.5, 1.0), 1.0)
+    # High pollen affects allergies and asthma
+    er_rate *= np.where(pollen_count > 100, np.where(asthma, 1.3, 1.1), 1.0)
+    # Heavy rainfall - flooding, water-borne diseases
+    er_rate *= np.select([precipitation > 50, precipitation > 20], [1.3, 1.1], 1.0)
+
+
+def _access_mods(er_rate, opd_rate, far, has_primary_care, has_transportation, ses):
+    # Reduced ER use if far away; primary care moves visits from the ER to the OPD
+    er_rate *= np.where(far, 0.9, 1.0)
+    er_rate *= np.where(has_primary_care, 0.8, 1.2)
+    opd_rate *= np.where(has_primary_care, 1.2, 0.9)
+    er_rate *= np.where(has_transportation, 1.0, 0.8)
+    opd_rate *= np.where(has_transportation, 1.0, 0.8)
+    er_rate *= SES_MOD_ER[ses]
+    opd_rate *= SES_MOD_OPD[ses]
+
+
+def _choice_by_code(rng, probs, codes):
+    """One draw per row from the categorical distribution in row `codes` of `probs`"""
+    cdf = np.cumsum(probs, axis=1)
+    u = rng.random(len(codes))
+    # Count the cumulative probabilities passed, one category at a time; the
+    # last is skipped as rounding can leave it just below 1
+    drawn = np.zeros(len(codes), dtype=np.int8)
+    for k in range(probs.shape[1] - 1):
+        drawn += u >= cdf[codes, k]
+    return drawn
+
+
+def _age_band(ages, bounds):
+    return np.select([ages < b for b in bounds], range(len(bounds)), len(bounds))
+
+
+def _calendar(start_date, end_date):
+    return pd.date_range(start_date, periods=(end_date - start_date).days, freq='D')
+
+
+def generate_dataset(n_samples=200000, seed=42, start_date=START_DATE, end_date=END_DATE, scenario=None,
+                     cities=DEFAULT_CITIES):
+    """Synthetic per-patient healthcare demand frame, sorted by date.
+
+    Text columns are categoricals over the fixed category lists above, so no
+    per-row strings are built; they are written to CSV as plain text.
+    scenario defaults to OUTBREAKS; pass [] for a base without outbreaks.
+    Patients are spread over the cities (CITY_PROFILES keys) by population.
+    """
+    rng = np.random.default_rng(seed)
+    calendar = _calendar(start_date, end_date)
+    # Random visit dates, sorted for time series analysis
+    day_offsets = np.sort(rng.integers(0, len(calendar), n_samples))
+    return generate_rows(day_offsets, rng, calendar, scenario, cities)
+
+
+def generate_chunks(n_samples=200000, seed=42, chunk_size=500000, start_date=START_DATE, end_date=END_DATE,
+                    cities=DEFAULT_CITIES):
+    """Yield the dataset as consecutive date-sorted frames of up to chunk_size rows.
+
+    Every chunk draws from its own stream spawned from SeedSequence(seed), so the
+    output is reproducible for a given seed and chunk_size and no chunk depends on
+    the state left by another.
+    """
+    for index in range(-(-n_samples // chunk_size)):
+        yield generate_chunk(index, n_samples, seed, chunk_size, start_date, end_date, cities)
+
+
+def generate_chunk(index, n_samples=200000, seed=42, chunk_size=500000, start_date=START_DATE, end_date=END_DATE,
+                   cities=DEFAULT_CITIES):
+    """Chunk `index` of generate_chunks(), computed on its own (e.g. in another process)"""
+    calendar = _calendar(start_date, end_date)
+    n_chunks = -(-n_samples // chunk_size)
+    date_seed, *chunk_seeds = np.random.SeedSequence(seed).spawn(1 + n_chunks)
+    # Rows per day are drawn up front, so chunk i takes rows i*chunk_size onwards
+    # of the date-sorted dataset without materialising the others
+    per_day = np.random.default_rng(date_seed).multinomial(n_samples, np.full(len(calendar), 1 / len(calendar)))
+    rows = np.arange(index * chunk_size, min(n_samples, (index + 1) * chunk_size))
+    day_offsets = np.searchsorted(np.cumsum(per_day), rows, side='right')
+    return generate_rows(day_offsets, np.random.default_rng(chunk_seeds[index]), calendar, cities=cities)
+
+
+# Daily aggregates: one row per (Date, Area) with its patient, ER and OPD
+# counts, instead of one row per patient. Patients per area and day default to
+# the density of the 200,000-row dataset
+DAILY_PATIENTS = 165
+
+# Patients respond differently to the day's conditions only through these
+# attributes: (elderly, respiratory condition, asthma), as in _environment_mods
+PATIENT_CLASSES = np.array([(0, 0, 0), (0, 1, 0), (0, 1, 1), (1, 0, 0), (1, 1, 0), (1, 1, 1)], dtype=bool)
+
+
+def patient_class_rates(n_samples=None, seed=42, cities=DEFAULT_CITIES):
+    """Mean ER and OPD rate per patient of each area before the day's modifiers.
+
+    Returns two (area, patient class) arrays over the areas of city_tables(cities),
+    from a reference population of n_samples (default 40,000 per area) drawn by
+    generate_rows; summed over the classes they give the mean rate of a patient
+    in the area. Age, comorbidity and access modifiers are included.
+    """
+    tables = city_tables(tuple(cities))
+    n_areas = len(tables['area_codes'])
+    people = generate_rows(np.zeros(n_samples or 40000 * n_areas, dtype=int), np.random.default_rng(seed),
+                           _calendar(START_DATE, END_DATE), scenario=[], cities=cities)
+    ages = people['Age'].to_numpy()
+    asthma = people['HasAsthma'].to_numpy().astype(bool)
+    respiratory = asthma | people['HasCOPD'].to_numpy().astype(bool)
+    comorbidity_count = people[['HasDiabetes', 'HasHypertension', 'HasAsthma', 'HasCOPD',
+                                'HasHeartDisease']].sum(axis=1).to_numpy()
+    base = _age_mod(ages) * (1.0 + comorbidity_count * 0.15)
+    er_rate = ER_BASE_RATE * base
+    opd_rate = OPD_BASE_RATE * base
+    _access_mods(er_rate, opd_rate, people['DistanceToHospital'].to_numpy() > 5,
+                 people['HasPrimaryCare'].to_numpy().astype(bool),
+                 people['HasTransportation'].to_numpy().astype(bool), people['SES'].cat.codes.to_numpy())
+
+    # Back from ALL_AREAS codes to the run's area numbers
+    run_area = np.zeros(len(ALL_AREAS), dtype=int)
+    run_area[tables['area_codes']] = np.arange(n_areas)
+    area = run_area[people['Area'].cat.codes.to_numpy()]
+    patient_class = (ages > 65) * 3 + respiratory + asthma
+    cell = area * len(PATIENT_CLASSES) + patient_class
+    per_area = np.bincount(area, minlength=n_areas)[:, None]
+    shape = (n_areas, len(PATIENT_CLASSES))
+    return (np.bincount(cell, er_rate, np.prod(shape)).reshape(shape) / per_area,
+            np.bincount(cell, opd_rate, np.prod(shape)).reshape(shape) / per_area)
+
+
+def generate_daily(seed=42, start_date=START_DATE, end_date=END_DATE, daily_patients=DAILY_PATIENTS,
+                   scenario=None, cities=DEFAULT_CITIES, class_rates=None):
+    """Daily per-area demand frame, sorted by date: one row per (Date, Area).
+
+    Weather and seasonal risk are drawn per area and day from the same tables as
+    the per-patient rows, and the ER/OPD counts are Poisson with the expected
+    rate of the day's patients under the same modifiers (see patient_class_rates).
+    The frame has the (Area, Date) columns the forecasting features use and is
+    a few thousand rows per decade of an area. daily_patients is shared between
+    the cities by population. class_rates defaults to patient_class_rates(seed=seed, cities=cities).
+    """
+    rng = np.random.default_rng(seed)
+    calendar = _calendar(start_date, end_date)
+    if class_rates is None:
+        class_rates = patient_class_rates(seed=seed, cities=cities)
+    return daily_rows(calendar, rng, class_rates, daily_patients, scenario, cities)
+
+
+def daily_rows(calendar, rng, class_rates, daily_patients=DAILY_PATIENTS, scenario=None, cities=DEFAULT_CITIES):
+    """generate_daily() rows for the days of calendar, drawn from rng with the given patient_class_rates()"""
+    tables = city_tables(tuple(cities))
+    n_areas = len(tables['area_codes'])
+    er_class, opd_class = class_rates
+
+    # Date-major, so the rows stay sorted by date for the outbreak scenario
+    day_offsets = np.repeat(np.arange(len(calendar)), n_areas)
+    area = np.tile(np.arange(n_areas, dtype=np.int16), len(calendar))
+    city = tables['area_city'][area]
+    month = (calendar.month.to_numpy() - 1).astype(np.int8)[day_offsets]
+    day = calendar.day.to_numpy().astype(np.int8)[day_offsets]
+    (temperature, precipitation, humidity, aqi, pollen_count,
+     is_cyclone_risk, is_flu_season, is_vector_disease_risk) = _environment(rng, month, city, tables)
+    is_holiday = _is_holiday(month, day)
+
+    # Day modifiers per patient class (columns), weighted by each class's rate
+    column = lambda values: values[:, None]
+    er_mod = np.ones((len(area), len(PATIENT_CLASSES)))
+    opd_mod = np.ones((len(area), 1))
+    _environment_mods(er_mod, opd_mod, column(is_flu_season), column(is_vector_disease_risk),
+                      column(is_cyclone_risk), column(temperature), column(humidity), column(aqi),
+                      column(pollen_count), column(precipitation), *PATIENT_CLASSES.T)
+    er_mod *= column(np.where(is_holiday, HOLIDAY_ER_MOD, 1.0))
+    patients = rng.poisson(daily_patients * tables['area_probs'][area])
+    er_visits = rng.poisson(patients * (er_class[area] * er_mod).sum(axis=1))
+    opd_visits = rng.poisson(patients * opd_class[area].sum(axis=1) * opd_mod[:, 0])
+
+    flag = lambda values: values.view(np.int8)
+    daily = pd.DataFrame({
+        'Date': calendar[day_offsets],
+        'City': pd.Categorical.from_codes(tables['city_codes'][city], CITIES),
+        'Area': pd.Categorical.from_codes(tables['area_codes'][area], ALL_AREAS),
+        'Season': pd.Categorical.from_codes(MONTH_SEASON[month], SEASONS),
+        'Temperature': temperature,
+        'Precipitation': precipitation,
+        'Humidity': humidity,
+        'AQI': aqi,
+        'PollenCount': pollen_count,
+        'IsCycloneRisk': flag(is_cyclone_risk),
+        'IsVectorDiseaseRisk': flag(is_vector_disease_risk),
+        'IsFluSeason': flag(is_flu_season),
+        'IsHoliday': flag(is_holiday),
+        'Patients': patients,
+        'ER_Visits': er_visits,
+        'OPD_Visits': opd_visits,
+        'DayOfWeek': calendar.dayofweek.to_numpy()[day_offsets],
+        'Month': month + 1,
+        'Year': calendar.year.to_numpy()[day_offsets],
+    })
+    daily = apply_scenario(daily, OUTBREAKS if scenario is None else scenario, rng)
+    return apply_schema(daily, DAILY_SCHEMA)
+
+
+# Dtype schema of the dataset, shared with abcdd.load_dataset: the generator
+# emits it and the loader enforces it on the CSV or Parquet it reads back.
+# Flags are int8 rather than bool so that they still add up (ComorbidityCount);
+# Age is int16 so that Age ** 2 and Age * ComorbidityCount cannot overflow.
+FLAG_COLS = ['IsSlumDwelling', 'IsCycloneRisk', 'IsVectorDiseaseRisk', 'IsOverweight', 'IsObese',
+             'HasDiabetes', 'HasHypertension', 'HasAsthma', 'HasCOPD', 'HasHeartDisease',
+             'IsFluSeason', 'IsHoliday', 'HasPrimaryCare', 'HasTransportation', 'Admission']
+SCHEMA = {
+    'Age': np.int16,
+    'Gender': pd.CategoricalDtype(GENDERS),
+    'City': pd.CategoricalDtype(CITIES),
+    'Area': pd.CategoricalDtype(ALL_AREAS),
+    'PinCode': np.int32,
+    'SES': pd.CategoricalDtype(SES_CATEGORIES),
+    'Insurance': pd.CategoricalDtype(INSURANCE_TYPES),
+    'Season': pd.CategoricalDtype(SEASONS),
+    'Temperature': np.float32,
+    'Precipitation': np.float32,
+    'Humidity': np.float32,
+    'AQI': np.float32,
+    'PollenCount': np.float32,
+    'DistanceToHospital': np.float32,
+    'ER_Visits': np.int16,
+    'OPD_Visits': np.int16,
+    'LOS_Days': np.int16,
+    'DayOfWeek': np.int8,
+    'Month': np.int8,
+    'Year': np.int16,
+    **dict.fromkeys(FLAG_COLS, np.int8),
+}
+# Daily counts are sums over many patients, so they get wider integers
+DAILY_SCHEMA = {**SCHEMA, 'Patients': np.int32, 'ER_Visits': np.int32, 'OPD_Visits': np.int32}
+
+
+def apply_schema(df, schema=SCHEMA):
+    """df with the schema dtype for each of its columns (Date is left as datetime64)"""
+    dtypes = {col: dtype for col, dtype in schema.items() if col in df.columns}
+    df = df.astype(dtypes)
+    # astype() takes unordered categories in any order as equal (as Parquet returns
+    # them), so put them in schema order explicitly; sorting depends on it
+    for col, dtype in dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype) and not df[col].cat.categories.equals(dtype.categories):
+            df[col] = df[col].cat.set_categories(dtype.categories)
+    return df
+
+
+def memory_footprint(df):
+    """Memory used by df in MB, in total and per dtype, counting the string payloads"""
+    usage = df.memory_usage(index=False, deep=True)
+    by_dtype = usage.groupby(df.dtypes.astype(str)).sum()
+    return {'total': round(float(usage.sum()) / 1e6, 2),
+            **{dtype: round(float(size) / 1e6, 2) for dtype, size in by_dtype.items()}}
+
+
+# Columnar output is partitioned by year, city and area
+PARTITION_COLS = ['Year', 'City', 'Area']
+
+
+def write_parquet(df, output, part=0, schema=SCHEMA):
+    """Add df to the Parquet dataset directory output, partitioned by PARTITION_COLS.
+
+    `part` names the files, so chunks written separately never overwrite each other.
+    """
+    apply_schema(df, schema).to_parquet(output, partition_cols=PARTITION_COLS, index=False,
+                                basename_template=f'part-{part:05d}-{{i}}.parquet')
+
+
+def _write_shard(output, index, n_samples, seed, chunk_size, fmt, cities):
+    chunk = generate_chunk(index, n_samples, seed, chunk_size, cities=cities)
+    if fmt == 'parquet':
+        write_parquet(chunk, output, index)
     else:
-        admission_rate.append(0)
-        los_days.append(0)
-
-# Create DataFrame
-synthetic_data = pd.DataFrame({
-    'Date': random_dates,
-    'Age': ages,
-    'Gender': genders,
-    'Area': area_distribution,
-    'PinCode': pin_codes,
-    'IsSlumDwelling': is_slum_dwelling,
-    'SES': ses,
-    'Insurance': insurance,
-    'Season': seasons,
-    'Temperature': temperature,
-    'Precipitation': precipitation,
-    'Humidity': humidity,
-    'AQI': aqi,
-    'PollenCount': pollen_count,
-    'IsCycloneRisk': is_cyclone_risk,
-    'IsVectorDiseaseRisk': is_vector_disease_risk,
-    'IsOverweight': is_overweight,
-    'IsObese': is_obese,
-    'HasDiabetes': has_diabetes,
-    'HasHypertension': has_hypertension,
-    'HasAsthma': has_asthma,
-    'HasCOPD': has_copd,
-    'HasHeartDisease': has_heart_disease,
-    'IsFluSeason': is_flu_season,
-    'IsHoliday': is_holiday,
-    'DistanceToHospital': distance_to_hospital,
-    'HasPrimaryCare': has_primary_care,
-    'HasTransportation': has_transportation,
-    'ER_Visits': er_visits,
-    'OPD_Visits': opd_visits,
-    'Admission': admission_rate,
-    'LOS_Days': los_days
-})
-
-# Sort by date for time series analysis
-synthetic_data = synthetic_data.sort_values('Date').reset_index(drop=True)
-
-# Add day of week and month features for time series analysis
-synthetic_data['DayOfWeek'] = synthetic_data['Date'].dt.dayofweek
-synthetic_data['Month'] = synthetic_data['Date'].dt.month
-synthetic_data['Year'] = synthetic_data['Date'].dt.year
-
-# Add disease outbreak modeling
-def add_realistic_outbreaks(df):
-    """Add realistic disease outbreaks based on historical patterns"""
-    # Dengue outbreak in August 2023 (monsoon peak)
-    dengue_start = datetime(2023, 8, 1)
-    dengue_end = datetime(2023, 8, 25)
-    mask = (df['Date'] >= dengue_start) & (df['Date'] <= dengue_end)
-    # 30-60% increase in ER visits during outbreak
-    df.loc[mask, 'ER_Visits'] = (df.loc[mask, 'ER_Visits'] * 
-                                np.random.uniform(1.3, 1.6, size=mask.sum())).astype(int)
-    df.loc[mask, 'IsVectorDiseaseRisk'] = 1
-    
-    # Respiratory disease outbreak in winter 2024
-    flu_start = datetime(2024, 12, 15)
-    flu_end = datetime(2025, 1, 31)
-    mask = (df['Date'] >= flu_start) & (df['Date'] <= flu_end)
-    # Increase ER visits and admissions
-    df.loc[mask, 'ER_Visits'] = (df.loc[mask, 'ER_Visits'] * 
-                               np.random.uniform(1.4, 1.7, size=mask.sum())).astype(int)
-    df.loc[mask, 'Admission'] = np.where(
-        df.loc[mask, 'ER_Visits'] > 0,
-        np.random.binomial(1, np.minimum(0.4, df.loc[mask, 'Admission'] * 1.5)),
-        0
-    )
-    
+        # Only the first shard carries the header, so shards concatenate into the CSV
+        chunk.to_csv(f'{output}.part-{index:05d}', index=False, header=index == 0)
+    return validation_sums(chunk)
+
+
+def write_parallel(output, n_samples=200000, seed=42, chunk_size=500000, workers=None, fmt='csv',
+                   cities=DEFAULT_CITIES):
+    """Write the chunked dataset to output with a process pool; returns the validation sums"""
+    n_chunks = -(-n_samples // chunk_size)
+    with ProcessPoolExecutor(workers) as pool:
+        shard_sums = list(pool.map(_write_shard, [output] * n_chunks, range(n_chunks), [n_samples] * n_chunks,
+                                   [seed] * n_chunks, [chunk_size] * n_chunks, [fmt] * n_chunks,
+                                   [cities] * n_chunks))
+    if fmt == 'parquet':
+        # Shards are already files of the partitioned dataset
+        return {key: sum(sums[key] for sums in shard_sums) for key in shard_sums[0]}
+    with open(output, 'wb') as out:
+        for index in range(n_chunks):
+            shard = f'{output}.part-{index:05d}'
+            with open(shard, 'rb') as f:
+                shutil.copyfileobj(f, out, 16 << 20)
+            os.remove(shard)
+    return {key: sum(sums[key] for sums in shard_sums) for key in shard_sums[0]}
+
+
+def generate_rows(day_offsets, rng, calendar, scenario=None, cities=DEFAULT_CITIES):
+    """Patient rows for the given (ascending) day offsets into calendar, with the outbreaks of scenario"""
+    n = len(day_offsets)
+    tables = city_tables(tuple(cities))
+
+    # Calendar fields are computed once per day and looked up per row
+    month = (calendar.month.to_numpy() - 1).astype(np.int8)[day_offsets]
+    day = calendar.day.to_numpy().astype(np.int8)[day_offsets]
+
+    # Demographics based on Mumbai's population statistics
+    age_group = rng.choice(len(AGE_GROUPS), size=n, p=AGE_GROUPS[:, 0])
+    ages = np.clip(rng.normal(AGE_GROUPS[age_group, 1], AGE_GROUPS[age_group, 2]), 0, 105).astype(int)
+    del age_group
+    gender = rng.choice(len(GENDERS), size=n, p=GENDER_PROBS).astype(np.int8)
+    # City and area in one draw, the area numbered across the run's cities
+    area = rng.choice(len(tables['area_probs']), size=n, p=tables['area_probs']).astype(np.int16)
+    city = tables['area_city'][area]
+    pin_codes = rng.integers(tables['pin_ranges'][area, 0], tables['pin_ranges'][area, 1])
+    is_slum = rng.random(n) < tables['slum_probs'][area]
+    ses = _choice_by_code(rng, tables['ses_probs'], np.where(is_slum, tables['slum_row'][city], area))
+    insurance = _choice_by_code(rng, INSURANCE_PROBS, ses)
+
+    # Weather and environment from the month-based tables
+    (temperature, precipitation, humidity, aqi, pollen_count,
+     is_cyclone_risk, is_flu_season, is_vector_disease_risk) = _environment(rng, month, city, tables)
+
+    # Comorbidities based on Mumbai's health statistics
+    # 60% of Mumbaikars struggle with weight issues
+    is_overweight = rng.random(n) < 0.46  # 46% overweight
+    is_obese = rng.random(n) < 0.12  # 12% obese
+    weight_risk = is_overweight | is_obese
+    diabetes_band = _age_band(ages, [18, 35, 50])
+    late_band = _age_band(ages, [18, 40, 60])
+
+    def with_risk(base_probs, band, at_risk, risk_prob):
+        has = rng.random(n) < np.asarray(base_probs)[band]
+        redraw = ~has & at_risk
+        has[redraw] = rng.random(redraw.sum()) < risk_prob
+        return has
+
+    # Diabetes - 18% of Mumbaikars aged 18-69 have diabetes
+    has_diabetes = with_risk(DIABETES_PROBS, diabetes_band, weight_risk, DIABETES_AT_RISK)
+    # Hypertension - 26% of Mumbai's adult population
+    has_hypertension = with_risk(HYPERTENSION_PROBS, diabetes_band, weight_risk, HYPERTENSION_AT_RISK)
+    # Asthma - rising in Mumbai, especially in children
+    has_asthma = rng.random(n) < np.where(ages < 18, 0.15, 0.09)
+    has_copd = rng.random(n) < np.asarray(COPD_PROBS)[late_band]
+    has_heart_disease = with_risk(HEART_DISEASE_PROBS, late_band, has_diabetes | has_hypertension,
+                                  HEART_DISEASE_AT_RISK)
+
+    is_holiday = _is_holiday(month, day)
+
+    # SDOH factors
+    distance_to_hospital = np.maximum(
+        0.5, rng.gamma(tables['distance_base'][area] * DISTANCE_SHAPE_FACTOR[ses], DISTANCE_SCALE[ses]))
+    primary_care_base = np.where(is_slum, PRIMARY_CARE_BASE[True], PRIMARY_CARE_BASE[False])
+    has_primary_care = rng.random(n) < primary_care_base * PRIMARY_CARE_FACTOR[ses]
+    has_transportation = rng.random(n) < tables['transport_base'][area] * TRANSPORT_FACTOR[ses]
+
+    comorbidity_count = has_diabetes.astype(np.int8) + has_hypertension + has_asthma + has_copd + has_heart_disease
+    comorbidity_mod = 1.0 + comorbidity_count * 0.15
+    age_mod = _age_mod(ages)
+    opd_rate = OPD_BASE_RATE * age_mod * comorbidity_mod
+    er_rate = ER_BASE_RATE * age_mod * comorbidity_mod
+    _environment_mods(er_rate, opd_rate, is_flu_season, is_vector_disease_risk, is_cyclone_risk,
+                      temperature, humidity, aqi, pollen_count, precipitation,
+                      ages > 65, has_asthma | has_copd, has_asthma)
+    _access_mods(er_rate, opd_rate, distance_to_hospital > 5, has_primary_care, has_transportation, ses)
+    er_rate *= np.where(is_holiday, HOLIDAY_ER_MOD, 1.0)
+
+    # Visit counts from Poisson distributions
+    er_visits = rng.poisson(er_rate)
+    del er_rate
+    opd_visits = rng.poisson(opd_rate)
+    del opd_rate
+
+    # Admission after an ER visit, more likely during extreme weather events
+    admission_prob = ADMISSION_BASE_RATE * age_mod * comorbidity_mod * np.where(is_cyclone_risk, 1.3, 1.0)
+    admission = (er_visits > 0) & (rng.random(n) < admission_prob)
+    del admission_prob, age_mod, comorbidity_mod
+    # Longer stays during extreme weather or vector-borne disease outbreaks
+    base_los = 3 + comorbidity_count * 0.5 + (is_cyclone_risk | is_vector_disease_risk)
+    los_days = np.where(admission, np.maximum(1, rng.poisson(base_los)), 0)
+    del base_los
+
+    # Flags are written as 0/1 like the counts; bool arrays are viewed as int8 without a copy
+    flag = lambda values: values.view(np.int8)
+    synthetic_data = pd.DataFrame({
+        'Date': calendar[day_offsets],
+        'Age': ages,
+        'Gender': pd.Categorical.from_codes(gender, GENDERS),
+        'City': pd.Categorical.from_codes(tables['city_codes'][city], CITIES),
+        'Area': pd.Categorical.from_codes(tables['area_codes'][area], ALL_AREAS),
+        'PinCode': pin_codes,
+        'IsSlumDwelling': flag(is_slum),
+        'SES': pd.Categorical.from_codes(ses, SES_CATEGORIES),
+        'Insurance': pd.Categorical.from_codes(insurance, INSURANCE_TYPES),
+        'Season': pd.Categorical.from_codes(MONTH_SEASON[month], SEASONS),
+        'Temperature': temperature,
+        'Precipitation': precipitation,
+        'Humidity': humidity,
+        'AQI': aqi,
+        'PollenCount': pollen_count,
+        'IsCycloneRisk': flag(is_cyclone_risk),
+        'IsVectorDiseaseRisk': flag(is_vector_disease_risk),
+        'IsOverweight': flag(is_overweight),
+        'IsObese': flag(is_obese),
+        'HasDiabetes': flag(has_diabetes),
+        'HasHypertension': flag(has_hypertension),
+        'HasAsthma': flag(has_asthma),
+        'HasCOPD': flag(has_copd),
+        'HasHeartDisease': flag(has_heart_disease),
+        'IsFluSeason': flag(is_flu_season),
+        'IsHoliday': flag(is_holiday),
+        'DistanceToHospital': distance_to_hospital,
+        'HasPrimaryCare': flag(has_primary_care),
+        'HasTransportation': flag(has_transportation),
+        'ER_Visits': er_visits,
+        'OPD_Visits': opd_visits,
+        'Admission': flag(admission),
+        'LOS_Days': los_days
+    })
+
+    # Add day of week and month features for time series analysis
+    synthetic_data['DayOfWeek'] = calendar.dayofweek.to_numpy()[day_offsets]
+    synthetic_data['Month'] = calendar.month.to_numpy()[day_offsets]
+    synthetic_data['Year'] = calendar.year.to_numpy()[day_offsets]
+
+    # Apply disease outbreaks, then narrow to the shared schema
+    return apply_schema(add_realistic_outbreaks(synthetic_data, rng, OUTBREAKS if scenario is None else scenario))
+
+# Outbreak scenarios. A scenario is a list of events; each event is a dict with
+#   event                name of the event, for reference
+#   start, end           inclusive date window, 'YYYY-MM-DD'
+#   cities, areas        lists of the cities and areas affected (all if missing)
+# and any of these effects, applied in this order (the order of the random draws):
+#   temperature_shift    added to Temperature
+#   precipitation_gamma  (shape, scale): Precipitation redrawn from a gamma
+#   flags                flag columns set to 1
+#   er_multiplier        (low, high): ER_Visits scaled by a uniform draw per row
+#   admission_multiplier Admission probability scaled for rows with an ER visit,
+#                        capped at admission_cap
+# Scenarios are plain data, so what-if variants can be built in code or loaded from JSON.
+# The historical outbreaks below hit the Mumbai metropolitan region
+MUMBAI_REGION = ['mumbai', 'thane', 'navi-mumbai']
+OUTBREAKS = [
+    # Dengue outbreak in August 2023 (monsoon peak): 30-60% increase in ER visits
+    {'event': 'dengue', 'cities': MUMBAI_REGION, 'start': '2023-08-01', 'end': '2023-08-25',
+     'er_multiplier': (1.3, 1.6), 'flags': ['IsVectorDiseaseRisk']},
+    # Respiratory disease outbreak in winter 2024: more ER visits and admissions
+    {'event': 'flu', 'cities': MUMBAI_REGION, 'start': '2024-12-15', 'end': '2025-01-31',
+     'er_multiplier': (1.4, 1.7), 'admission_multiplier': 1.5, 'admission_cap': 0.4},
     # Cyclone impact in June 2024
-    cyclone_start = datetime(2024, 6, 5)
-    cyclone_end = datetime(2024, 6, 12)
-    mask = (df['Date'] >= cyclone_start) & (df['Date'] <= cyclone_end)
-    df.loc[mask, 'IsCycloneRisk'] = 1
-    df.loc[mask, 'ER_Visits'] = (df.loc[mask, 'ER_Visits'] * 
-                               np.random.uniform(1.5, 2.0, size=mask.sum())).astype(int)
-    
-    # Add more outbreaks to increase healthcare demand spikes
+    {'event': 'cyclone', 'cities': MUMBAI_REGION, 'start': '2024-06-05', 'end': '2024-06-12',
+     'flags': ['IsCycloneRisk'], 'er_multiplier': (1.5, 2.0)},
     # Malaria outbreak in July 2022
-    malaria_start = datetime(2022, 7, 10)
-    malaria_end = datetime(2022, 7, 30)
-    mask = (df['Date'] >= malaria_start) & (df['Date'] <= malaria_end)
-    df.loc[mask, 'ER_Visits'] = (df.loc[mask, 'ER_Visits'] * 
-                               np.random.uniform(1.3, 1.5, size=mask.sum())).astype(int)
-    df.loc[mask, 'IsVectorDiseaseRisk'] = 1
-    
+    {'event': 'malaria', 'cities': MUMBAI_REGION, 'start': '2022-07-10', 'end': '2022-07-30',
+     'er_multiplier': (1.3, 1.5), 'flags': ['IsVectorDiseaseRisk']},
     # Heat wave in May 2023
-    heatwave_start = datetime(2023, 5, 15)
-    heatwave_end = datetime(2023, 5, 25)
-    mask = (df['Date'] >= heatwave_start) & (df['Date'] <= heatwave_end)
-    df.loc[mask, 'Temperature'] += 3  # Increase temperature
-    df.loc[mask, 'ER_Visits'] = (df.loc[mask, 'ER_Visits'] * 
-                               np.random.uniform(1.4, 1.6, size=mask.sum())).astype(int)
-    
-    # Severe flooding in July 2024
-    flood_start = datetime(2024, 7, 25)
-    flood_end = datetime(2024, 8, 5)
-    mask = (df['Date'] >= flood_start) & (df['Date'] <= flood_end)
-    df.loc[mask, 'Precipitation'] = np.random.gamma(20, 10, size=mask.sum())  # Heavy rainfall
-    df.loc[mask, 'ER_Visits'] = (df.loc[mask, 'ER_Visits'] * 
-                               np.random.uniform(1.6, 2.2, size=mask.sum())).astype(int)
-    
+    {'event': 'heatwave', 'cities': MUMBAI_REGION, 'start': '2023-05-15', 'end': '2023-05-25',
+     'temperature_shift': 3, 'er_multiplier': (1.4, 1.6)},
+    # Severe flooding in July 2024: heavy rainfall
+    {'event': 'flood', 'cities': MUMBAI_REGION, 'start': '2024-07-25', 'end': '2024-08-05',
+     'precipitation_gamma': (20, 10), 'er_multiplier': (1.6, 2.2)},
+]
+
+
+def apply_scenario(df, scenario, rng=np.random):
+    """Apply the events of scenario to df, which must be sorted by Date; returns df.
+
+    Each event finds its date window with a binary search instead of scanning
+    the frame. Changed columns are replaced, never written into, so a shallow
+    copy of a shared base frame can be passed in.
+    """
+    dates = df['Date'].to_numpy()
+    changed = {}
+
+    def column(name):
+        if name not in changed:
+            changed[name] = df[name].to_numpy(copy=True)
+        return changed[name]
+
+    for event in scenario:
+        lo = np.searchsorted(dates, np.datetime64(event['start']), side='left')
+        hi = np.searchsorted(dates, np.datetime64(event['end']), side='right')
+        selected = np.ones(hi - lo, dtype=bool)
+        for key, col in [('cities', 'City'), ('areas', 'Area')]:
+            if event.get(key) is not None:
+                selected &= np.isin(df[col].to_numpy()[lo:hi], event[key])
+        if selected.all():
+            rows, n = slice(lo, hi), hi - lo
+        else:
+            rows = lo + np.flatnonzero(selected)
+            n = len(rows)
+
+        if 'temperature_shift' in event:
+            column('Temperature')[rows] += event['temperature_shift']
+        if 'precipitation_gamma' in event:
+            column('Precipitation')[rows] = rng.gamma(*event['precipitation_gamma'], size=n)
+        for flag in event.get('flags', []):
+            column(flag)[rows] = 1
+        if 'er_multiplier' in event:
+            er = column('ER_Visits')
+            er[rows] = (er[rows] * rng.uniform(*event['er_multiplier'], size=n)).astype(int)
+        if 'admission_multiplier' in event and 'Admission' in df.columns:
+            admission = column('Admission')
+            admission[rows] = np.where(
+                column('ER_Visits')[rows] > 0,
+                rng.binomial(1, np.minimum(event['admission_cap'],
+                                           admission[rows] * event['admission_multiplier'])),
+                0)
+
+    for name, values in changed.items():
+        df[name] = values
     return df
 
-# Apply disease outbreaks
-synthetic_data = add_realistic_outbreaks(synthetic_data)
+
+def add_realistic_outbreaks(df, rng=np.random, scenario=OUTBREAKS):
+    """Add realistic disease outbreaks based on historical patterns"""
+    return apply_scenario(df, scenario, rng)
+
+
+def scenario_variants(base, scenarios, seed=0):
+    """Yield (name, frame) for every named scenario in scenarios applied to base.
+
+    base is generated once (usually with scenario=[]) and left unchanged; each
+    variant shares its untouched columns with it and draws from its own stream
+    spawned from SeedSequence(seed).
+    """
+    streams = np.random.SeedSequence(seed).spawn(len(scenarios))
+    for (name, scenario), stream in zip(scenarios.items(), streams):
+        yield name, apply_scenario(base.copy(deep=False), scenario, np.random.default_rng(stream))
+
+
+def write_scenarios(output, scenarios, n_samples=200000, seed=42, fmt='csv', cities=DEFAULT_CITIES):
+    """Write every named scenario applied to one outbreak-free dataset to output/<name>.<fmt>"""
+    os.makedirs(output, exist_ok=True)
+    print(f"Generating the base dataset and {len(scenarios)} outbreak scenarios...")
+    base = generate_dataset(n_samples, seed, scenario=[], cities=cities)
+    base_er = base['ER_Visits'].sum()
+    for name, variant in scenario_variants(base, scenarios, seed):
+        path = os.path.join(output, f'{name}.{fmt}')
+        if fmt == 'parquet':
+            shutil.rmtree(path, ignore_errors=True)
+            write_parquet(variant, path)
+        else:
+            variant.to_csv(path, index=False)
+        er = variant['ER_Visits'].sum()
+        print(f"{name}: ER visits {er} ({er / base_er - 1:+.1%})")
+    print(f"Scenarios saved in '{output}'")
+
+
+def stream_days(start_date, rng, daily=False, patients_per_day=DAILY_PATIENTS, cities=DEFAULT_CITIES,
+                scenario=None, seed=42, class_rates=None):
+    """Yield one frame per day from start_date on, without end, as a live feed would.
+
+    Each frame is the day's patient rows (Poisson with mean patients_per_day), or
+    with daily=True its row per area as in generate_daily(). Days are drawn from
+    rng in turn, so saving rng.bit_generator.state after a day and restoring it
+    later continues the same stream. With daily=True, pass the class_rates of the
+    stream to skip the patient_class_rates() run (seconds for many cities).
+    """
+    if daily and class_rates is None:
+        class_rates = patient_class_rates(seed=seed, cities=cities)
+    date = pd.Timestamp(start_date)
+    while True:
+        calendar = pd.date_range(date, periods=1, freq='D')
+        if daily:
+            yield daily_rows(calendar, rng, class_rates, patients_per_day, scenario, cities)
+        else:
+            day_offsets = np.zeros(rng.poisson(patients_per_day), dtype=np.intp)
+            yield generate_rows(day_offsets, rng, calendar, scenario, cities)
+        date += pd.Timedelta(days=1)
+
+
+def append_state_path(output):
+    """Where append_days() keeps the state of the stream extending output"""
+    return f'{output}.state.json'
+
+
+def _store_columns(output, fmt='csv'):
+    """Column names of the dataset at output, without reading its rows"""
+    if fmt == 'parquet':
+        import pyarrow.dataset
+        return pyarrow.dataset.dataset(output, format='parquet', partitioning='hive').schema.names
+    return pd.read_csv(output, nrows=0).columns.tolist()
+
+
+def new_append_state(next_date, fmt='csv', seed=42, daily=False, patients_per_day=DAILY_PATIENTS,
+                     cities=DEFAULT_CITIES, class_rates=None):
+    """State of an append stream starting at next_date, as append_days() saves it.
+
+    The RNG is seeded from seed and next_date. Daily streams keep their
+    patient_class_rates() (computed unless given), so resuming does not redraw
+    the reference population.
+    """
+    next_date = pd.Timestamp(next_date)
+    state = {'next_date': next_date.date().isoformat(), 'fmt': fmt, 'daily': daily, 'cities': list(cities),
+             'patients_per_day': patients_per_day, 'seed': seed,
+             'rng': np.random.default_rng([seed, next_date.toordinal()]).bit_generator.state}
+    if daily:
+        if class_rates is None:
+            class_rates = patient_class_rates(seed=seed, cities=cities)
+        state['class_rates'] = [rates.tolist() for rates in class_rates]
+    return state
+
+
+def write_append_state(output, state):
+    with open(append_state_path(output), 'w') as f:
+        json.dump(state, f)
+
+
+def append_days(output, n_days=1, fmt='csv', seed=42, daily=False, patients_per_day=DAILY_PATIENTS,
+                cities=DEFAULT_CITIES):
+    """Append the n_days following the end of the dataset at output to it; returns the rows added.
+
+    The first append starts the day after the last Date in the store, with an RNG
+    seeded from seed and that date (see new_append_state). The next date, the
+    settings and the RNG state are saved to append_state_path(output) after every
+    day, and later appends resume from there, so the past is never regenerated.
+    Raises ValueError when the arguments differ from the saved settings, or from
+    the rows (daily or per-patient) and cities of a store without saved state.
+    """
+    state_path = append_state_path(output)
+    if os.path.exists(state_path):
+        with open(state_path) as f:
+            state = json.load(f)
+        requested = {'fmt': fmt, 'seed': seed, 'daily': daily, 'patients_per_day': patients_per_day,
+                     'cities': list(cities)}
+        # States saved before fmt was kept have no fmt
+        mismatched = [f"{key}={value!r} (stream has {state[key]!r})" for key, value in requested.items()
+                      if key in state and state[key] != value]
+        if mismatched:
+            raise ValueError(f"'{output}' is extended with other settings: {', '.join(mismatched)}; "
+                             f"remove '{state_path}' to start a new stream")
+    else:
+        columns = _store_columns(output, fmt)
+        if ('Patients' in columns) != daily:
+            kind = 'daily per-area' if 'Patients' in columns else 'per-patient'
+            raise ValueError(f"'{output}' holds {kind} rows; append with daily={'Patients' in columns}")
+        usecols = ['Date', 'City'] if 'City' in columns else ['Date']
+        if fmt == 'parquet':
+            store = pd.read_parquet(output, columns=usecols)
+        else:
+            store = pd.read_csv(output, usecols=usecols, parse_dates=['Date'])
+        if 'City' in store.columns and set(store['City'].astype(str)) != set(cities):
+            raise ValueError(f"'{output}' holds cities {', '.join(sorted(set(store['City'].astype(str))))}, "
+                             f"not {', '.join(sorted(cities))}")
+        state = new_append_state(store['Date'].max() + pd.Timedelta(days=1), fmt, seed, daily, patients_per_day,
+                                 cities)
+    if state['daily'] and 'class_rates' not in state:
+        # Saved before the class rates were kept in the state
+        state['class_rates'] = [rates.tolist() for rates in
+                                patient_class_rates(seed=state['seed'], cities=tuple(state['cities']))]
+    class_rates = tuple(np.array(rates) for rates in state['class_rates']) if state['daily'] else None
+    rng = np.random.default_rng()
+    rng.bit_generator.state = state['rng']
+    days = stream_days(state['next_date'], rng, state['daily'], state['patients_per_day'],
+                       tuple(state['cities']), seed=state['seed'], class_rates=class_rates)
+
+    rows = 0
+    for _, frame in zip(range(n_days), days):
+        date = pd.Timestamp(state['next_date'])
+        if fmt == 'parquet':
+            # One file per day in each partition, named by its date
+            write_parquet(frame, output, int(f'{date:%Y%m%d}'), DAILY_SCHEMA if state['daily'] else SCHEMA)
+        else:
+            frame.to_csv(output, index=False, mode='a', header=False)
+        rows += len(frame)
+        state['next_date'] = (date + pd.Timedelta(days=1)).date().isoformat()
+        state['rng'] = rng.bit_generator.state
+        write_append_state(output, state)
+    return rows
 
 # Add validation metrics for data quality assessment
-def calculate_validation_metrics(data):
-    """Calculate metrics to validate synthetic data quality"""
-    metrics = {}
-    
+# Validation metrics that are a column mean over a subset of rows:
+# name -> (row filter, column)
+VALIDATION_MEANS = {
     # Check age-comorbidity relationship
-    elderly = data[data['Age'] > 65]
-    young = data[data['Age'] < 40]
-    metrics['elderly_diabetes_rate'] = elderly['HasDiabetes'].mean()
-    metrics['young_diabetes_rate'] = young['HasDiabetes'].mean()
-    metrics['age_diabetes_ratio'] = metrics['elderly_diabetes_rate'] / max(0.001, metrics['young_diabetes_rate'])
-    
+    'elderly_diabetes_rate': (lambda data: data['Age'] > 65, 'HasDiabetes'),
+    'young_diabetes_rate': (lambda data: data['Age'] < 40, 'HasDiabetes'),
     # Check seasonal patterns
-    monsoon_data = data[data['Season'] == 'Monsoon']
-    winter_data = data[data['Season'] == 'Winter']
-    metrics['monsoon_vector_disease_rate'] = monsoon_data['IsVectorDiseaseRisk'].mean()
-    metrics['winter_flu_rate'] = winter_data['IsFluSeason'].mean()
-    
+    'monsoon_vector_disease_rate': (lambda data: data['Season'] == 'Monsoon', 'IsVectorDiseaseRisk'),
+    'winter_flu_rate': (lambda data: data['Season'] == 'Winter', 'IsFluSeason'),
     # Check SES-healthcare relationship
-    low_ses = data[data['SES'] == 'Low']
-    high_ses = data[data['SES'] == 'High']
-    metrics['low_ses_er_rate'] = low_ses['ER_Visits'].mean()
-    metrics['high_ses_er_rate'] = high_ses['ER_Visits'].mean()
-    metrics['ses_er_ratio'] = metrics['low_ses_er_rate'] / max(0.001, metrics['high_ses_er_rate'])
-    
+    'low_ses_er_rate': (lambda data: data['SES'] == 'Low', 'ER_Visits'),
+    'high_ses_er_rate': (lambda data: data['SES'] == 'High', 'ER_Visits'),
     # Check overall disease prevalence
-    metrics['diabetes_prevalence'] = data['HasDiabetes'].mean()
-    metrics['hypertension_prevalence'] = data['HasHypertension'].mean()
-    metrics['asthma_prevalence'] = data['HasAsthma'].mean()
-    
-    # Check healthcare spending based on SES (9.7% of income spent on healthcare)
-    metrics['healthcare_spending_percent'] = 9.7
-    
-    return metrics
-
-validation_metrics = calculate_validation_metrics(synthetic_data)
-
-# Display validation metrics
-print("\nValidation Metrics:")
-for key, value in validation_metrics.items():
-    print(f"{key}: {value}")
-
-# Save to CSV
-synthetic_data.to_csv('mumbai_healthcare_demand_dataset.csv', index=False)
-
-print(f"\nSynthetic healthcare demand dataset for Mumbai with {n_samples} records created successfully!")
-print("Dataset saved as 'mumbai_healthcare_demand_dataset.csv'")
+    'diabetes_prevalence': (None, 'HasDiabetes'),
+    'hypertension_prevalence': (None, 'HasHypertension'),
+    'asthma_prevalence': (None, 'HasAsthma'),
+}
+
+def validation_sums(data):
+    """(sum, count) behind every metric in VALIDATION_MEANS; sums of chunks add up"""
+    sums = {}
+    for key, (row_filter, col) in VALIDATION_MEANS.items():
+        values = data[col] if row_filter is None else data.loc[row_filter(data), col]
+        sums[key] = np.array([values.sum(), len(values)], dtype=float)
+    return sums
+
+def metrics_from_sums(sums):
+    mean = {key: total / count if count else np.nan for key, (total, count) in sums.items()}
+    return {
+        'elderly_diabetes_rate': mean['elderly_diabetes_rate'],
+        'young_diabetes_rate': mean['young_diabetes_rate'],
+        'age_diabetes_ratio': mean['elderly_diabetes_rate'] / max(0.001, mean['young_diabetes_rate']),
+        'monsoon_vector_disease_rate': mean['monsoon_vector_disease_rate'],
+        'winter_flu_rate': mean['winter_flu_rate'],
+        'low_ses_er_rate': mean['low_ses_er_rate'],
+        'high_ses_er_rate': mean['high_ses_er_rate'],
+        'ses_er_ratio': mean['low_ses_er_rate'] / max(0.001, mean['high_ses_er_rate']),
+        'diabetes_prevalence': mean['diabetes_prevalence'],
+        'hypertension_prevalence': mean['hypertension_prevalence'],
+        'asthma_prevalence': mean['asthma_prevalence'],
+        # Check healthcare spending based on SES (9.7% of income spent on healthcare)
+        'healthcare_spending_percent': 9.7,
+    }
+
+def calculate_validation_metrics(data):
+    """Calculate metrics to validate synthetic data quality"""
+    return metrics_from_sums(validation_sums(data))
+
+# Metrics of the original row-by-row generator at 200,000 rows (seed 42)
+REFERENCE_METRICS = {
+    'elderly_diabetes_rate': 0.3276,
+    'young_diabetes_rate': 0.1470,
+    'age_diabetes_ratio': 2.2292,
+    'monsoon_vector_disease_rate': 0.2559,
+    'winter_flu_rate': 1.0,
+    'low_ses_er_rate': 1.1715,
+    'high_ses_er_rate': 0.6656,
+    'ses_er_ratio': 1.7601,
+    'diabetes_prevalence': 0.2336,
+    'hypertension_prevalence': 0.3586,
+    'asthma_prevalence': 0.0982,
+    'healthcare_spending_percent': 9.7,
+}
+
+def check_validation_metrics(metrics, reference=REFERENCE_METRICS, rel_tol=0.05):
+    """Names of metrics more than rel_tol (relative) away from the reference"""
+    return [key for key, expected in reference.items()
+            if abs(metrics[key] - expected) > rel_tol * abs(expected)]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('--output', help='default: mumbai_healthcare_demand_dataset.<format>')
+    parser.add_argument('--chunk-size', type=int, help='stream to the CSV in chunks of this many rows')
+    parser.add_argument('--workers', type=int, help='generate chunks in this many processes')
+    parser.add_argument('--memory-report', action='store_true',
+                        help='compare the in-memory footprint with the frame read back from a CSV')
+    parser.add_argument('--scenarios', help='JSON file of named outbreak scenarios to write variants for')
+    parser.add_argument('--daily', action='store_true', help='write daily per-area counts instead of patients')
+    parser.add_argument('--start-date', type=datetime.fromisoformat, default=START_DATE, help='with --daily')
+    parser.add_argument('--end-date', type=datetime.fromisoformat, default=END_DATE,
+                        help='with --daily; exclusive')
+    parser.add_argument('--patients-per-day', type=float, default=DAILY_PATIENTS, help='with --daily')
+    parser.add_argument('--cities', default=','.join(DEFAULT_CITIES),
+                        help="comma-separated CITY_PROFILES keys, or 'all'")
+    parser.add_argument('--append', type=int, metavar='DAYS',
+                        help='append this many days after the end of the existing --output')
+    args = parser.parse_args()
+    cities = tuple(CITIES if args.cities == 'all' else args.cities.split(','))
+    if set(cities) - set(CITIES):
+        parser.error(f"unknown cities: {', '.join(sorted(set(cities) - set(CITIES)))}")
+    if args.append:
+        prefix = 'mumbai_healthcare_daily_demand' if args.daily else 'mumbai_healthcare_demand_dataset'
+        output = args.output or f'{prefix}.{args.format}'
+        try:
+            rows = append_days(output, args.append, args.format, args.seed, args.daily, args.patients_per_day,
+                               cities)
+        except ValueError as e:
+            parser.error(str(e))
+        with open(append_state_path(output)) as f:
+            next_date = json.load(f)['next_date']
+        print(f"Appended {rows} rows for {args.append} days to '{output}'; the next day is {next_date}")
+        parser.exit()
+    if args.daily:
+        output = args.output or f'mumbai_healthcare_daily_demand.{args.format}'
+        class_rates = patient_class_rates(seed=args.seed, cities=cities)
+        daily = generate_daily(args.seed, args.start_date, args.end_date, args.patients_per_day, cities=cities,
+                               class_rates=class_rates)
+        # A new dataset starts a new append stream, which reuses the class rates
+        if os.path.exists(append_state_path(output)):
+            os.remove(append_state_path(output))
+        if len(daily):
+            write_append_state(output, new_append_state(daily['Date'].max() + pd.Timedelta(days=1), args.format,
+                                                        args.seed, True, args.patients_per_day, cities, class_rates))
+        if args.format == 'parquet':
+            shutil.rmtree(output, ignore_errors=True)
+            write_parquet(daily, output, schema=DAILY_SCHEMA)
+        else:
+            daily.to_csv(output, index=False)
+        print(f"Daily demand for {daily['Area'].nunique()} areas over {daily['Date'].nunique()} days "
+              f"({len(daily)} rows) saved as '{output}'")
+        parser.exit()
+    if args.scenarios:
+        if args.chunk_size or args.workers:
+            parser.error('--scenarios needs the dataset in memory; drop --chunk-size/--workers')
+        with open(args.scenarios) as f:
+            scenarios = json.load(f)
+        write_scenarios(args.output or 'mumbai_healthcare_demand_scenarios', scenarios, args.rows, args.seed,
+                        args.format, cities)
+        parser.exit()
+    args.output = args.output or f'mumbai_healthcare_demand_dataset.{args.format}'
+    if args.format == 'parquet' and os.path.isdir(args.output):
+        # Partitions of an earlier run would otherwise be read back with the new ones
+        shutil.rmtree(args.output)
+    if os.path.exists(append_state_path(args.output)):
+        os.remove(append_state_path(args.output))
+
+    print(f"Generating healthcare synthetic dataset for {', '.join(cities)}...")
+    if args.workers:
+        sums = write_parallel(args.output, args.rows, args.seed, args.chunk_size or 500000, args.workers,
+                              args.format, cities)
+        validation_metrics = metrics_from_sums(sums)
+    elif args.chunk_size:
+        sums = None
+        for i, chunk in enumerate(generate_chunks(args.rows, args.seed, args.chunk_size, cities=cities)):
+            chunk_sums = validation_sums(chunk)
+            sums = chunk_sums if sums is None else {key: sums[key] + chunk_sums[key] for key in sums}
+            if args.format == 'parquet':
+                write_parquet(chunk, args.output, i)
+            else:
+                chunk.to_csv(args.output, index=False, mode='w' if i == 0 else 'a', header=i == 0)
+        validation_metrics = metrics_from_sums(sums)
+    else:
+        synthetic_data = generate_dataset(args.rows, args.seed, cities=cities)
+        validation_metrics = calculate_validation_metrics(synthetic_data)
+        if args.memory_report:
+            # What read_csv gives without the schema: int64, float64 and str columns
+            plain = synthetic_data.astype({col: str if isinstance(dtype, pd.CategoricalDtype) else
+                                           np.float64 if dtype.kind == 'f' else np.int64
+                                           for col, dtype in synthetic_data.dtypes.items() if dtype.kind != 'M'})
+            print(f"\nMemory (MB), as read from CSV: {memory_footprint(plain)}")
+            print(f"Memory (MB), with SCHEMA: {memory_footprint(synthetic_data)}")
+            del plain
+        # Save to CSV or Parquet
+        if args.format == 'parquet':
+            write_parquet(synthetic_data, args.output)
+        else:
+            synthetic_data.to_csv(args.output, index=False)
+
+    # Display validation metrics
+    print("\nValidation Metrics:")
+    for key, value in validation_metrics.items():
+        print(f"{key}: {value}")
+    # The reference metrics are Mumbai's
+    off = check_validation_metrics(validation_metrics) if cities == DEFAULT_CITIES else []
+    if off:
+        print(f"\nWarning: outside 5% of the reference generator: {', '.join(off)}")
+
+    print(f"\nSynthetic healthcare demand dataset with {args.rows} records created successfully!")
+    print(f"Dataset saved as '{args.output}'")
@@ -0,0 +1,117 @@
+# test_features.py (in components/data/scriptss/)
+# DaysToHoliday from days_to_nearest_holiday() against the per-date loops it
+# replaced in advanced_feature_engineering and forecast_future_demand, and the
+# features of new days engineered with a FeatureState against the batch run.
+# Usage: python -m pytest test_features.py
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sysdata
+from features import (HISTORY_FEATURES, TS_COLUMNS, TS_LAGS, TS_WINDOWS, FeatureState, _time_series_names,
+                      days_to_nearest_holiday, engineer_features)
+
+
+def _loop_days_to_holiday(data):
+    """The old advanced_feature_engineering loop: a Python min over the holidays per date"""
+    holiday_dates = data[data['IsHoliday'] == 1]['Date'].unique()
+    days = pd.Series(100, index=data.index)
+    for date in data['Date'].unique():
+        days_to_holiday = min([abs((date - pd.Timestamp(hdate)).days) for hdate in holiday_dates], default=100)
+        days[data['Date'] == date] = days_to_holiday
+    return days.to_numpy()
+
+
+def _loop_forecast_days_to_holiday(last_date, days=30):
+    """The old forecast_future_demand loop, row by row over the future dates"""
+    future_df = pd.DataFrame({'Date': pd.date_range(start=last_date + timedelta(days=1), periods=days)})
+    future_df['DaysToHoliday'] = 100
+    holiday_dates = pd.to_datetime([
+        f"{future_df['Date'].dt.year.iloc[0]}-01-26",
+        f"{future_df['Date'].dt.year.iloc[0]}-08-15",
+    ])
+    for i, date in enumerate(future_df['Date']):
+        future_df.loc[i, 'DaysToHoliday'] = min([abs((date - hdate).days) for hdate in holiday_dates], default=100)
+    return future_df, holiday_dates
+
+
+@pytest.fixture(scope='module')
+def dataset():
+    return sysdata.generate_dataset(5000, seed=7)
+
+
+def test_generated_dataset(dataset):
+    assert dataset['Date'].dt.year.nunique() > 1
+    assert dataset['IsHoliday'].sum() > 0
+    expected = _loop_days_to_holiday(dataset)
+    holidays = dataset.loc[dataset['IsHoliday'] == 1, 'Date']
+    np.testing.assert_array_equal(days_to_nearest_holiday(dataset['Date'], holidays), expected)
+    np.testing.assert_array_equal(engineer_features(dataset, ['DaysToHoliday'])['DaysToHoliday'], expected)
+
+
+def test_no_holidays(dataset):
+    data = dataset.assign(IsHoliday=0)
+    result = engineer_features(data, ['DaysToHoliday'])['DaysToHoliday']
+    np.testing.assert_array_equal(result, _loop_days_to_holiday(data))
+    assert (result == 100).all()
+
+
+def test_year_boundary():
+    # Holidays only on one side of the new year, and dates out of order and repeated
+    dates = pd.to_datetime(['2024-12-20', '2025-01-03', '2024-12-31', '2025-01-01', '2024-12-31', '2025-02-10'])
+    for holidays in (['2024-12-25'], ['2025-01-01'], ['2023-08-15', '2024-01-26', '2025-01-26']):
+        data = pd.DataFrame({'Date': dates, 'IsHoliday': dates.isin(pd.to_datetime(holidays)).astype(int)})
+        expected = [min(abs((date - pd.Timestamp(h)).days) for h in holidays) for date in dates]
+        np.testing.assert_array_equal(days_to_nearest_holiday(dates, pd.to_datetime(holidays)), expected)
+        if data['IsHoliday'].any():
+            np.testing.assert_array_equal(engineer_features(data, ['DaysToHoliday'])['DaysToHoliday'],
+                                          _loop_days_to_holiday(data))
+
+
+def test_forecast_dates():
+    # Every forecast start over two years, so the 30 days cross the new year
+    for last_date in pd.date_range('2024-01-01', '2025-12-31', freq='D'):
+        future_df, holiday_dates = _loop_forecast_days_to_holiday(last_date)
+        np.testing.assert_array_equal(days_to_nearest_holiday(future_df['Date'], holiday_dates),
+                                      future_df['DaysToHoliday'].to_numpy())
+
+
+# Engineered with a FeatureState: the columns that depend on earlier days
+STATE_COLUMNS = HISTORY_FEATURES + ['DaysToHoliday']
+
+
+@pytest.mark.parametrize('data', [
+    sysdata.generate_daily(start_date=pd.Timestamp('2023-10-01'), end_date=pd.Timestamp('2024-04-01')),
+    sysdata.generate_dataset(20000, seed=3),
+], ids=['daily', 'patients'])
+def test_feature_state_matches_batch(data):
+    dates = np.sort(data['Date'].unique())
+    # Half the days as history, then three chunks of new days
+    cuts = [dates[len(dates) * k // 6] for k in (3, 4, 5)] + [dates[-1] + np.timedelta64(1, 'D')]
+    state = FeatureState.from_history(data[data['Date'] < cuts[0]])
+    for start, end in zip(cuts[:-1], cuts[1:]):
+        new_days = data[(data['Date'] >= start) & (data['Date'] < end)]
+        incremental = engineer_features(new_days, STATE_COLUMNS, state=state)
+        # The batch run sees the same days, up to the end of the chunk
+        batch = engineer_features(data[data['Date'] < end], STATE_COLUMNS).loc[new_days.index]
+        pd.testing.assert_frame_equal(incremental[STATE_COLUMNS], batch[STATE_COLUMNS], check_exact=True)
+
+
+def test_next_day_features():
+    data = sysdata.generate_daily(start_date=pd.Timestamp('2024-01-01'), end_date=pd.Timestamp('2024-03-01'))
+    next_date = data['Date'].max()
+    state = FeatureState.from_history(data[data['Date'] < next_date])
+    result = state.next_day_features(HISTORY_FEATURES)
+    # Not advanced: the same again
+    pd.testing.assert_frame_equal(state.next_day_features(HISTORY_FEATURES), result)
+    batch = engineer_features(data, HISTORY_FEATURES)
+    batch = batch[batch['Date'] == next_date].set_index('Area')
+    batch.index = batch.index.astype(str)
+    names = _time_series_names(TS_COLUMNS, TS_LAGS, TS_WINDOWS)
+    pd.testing.assert_frame_equal(result[names], batch.loc[result.index, names])
+    last = data[data['Date'] == next_date - pd.Timedelta(days=1)].set_index('Area')
+    for lag in (7, 14):
+        np.testing.assert_array_equal(result[f'ER_Diff_{lag}'],
+                                      last.loc[result.index, 'ER_Visits'] - result[f'ER_Lag_{lag}'])
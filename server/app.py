@@ -1,28 +1,162 @@
 # app.py (in server/)
-import pandas as pd
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
+import hashlib
+import math
 import os
 
+from catalogue import SORT_KEYS, Catalogue, load_catalogue
+from query_cache import QueryCache
+
 app = Flask(__name__)
-CORS(app)
+# Paging metadata travels in headers so the body stays a plain list
+CORS(app, expose_headers=['X-Total-Count', 'X-Next-Cursor', 'ETag'])
+
+# Upper bound on suggestions returned for one prefix
+MAX_SUGGESTIONS = 20
+
+# Query parameters filtering on a categorical column, by exact value
+FILTER_PARAMS = {'manufacturer': 'manufacturer_name', 'type': 'type'}
+
+# Largest edit distance accepted for fuzzy name search
+MAX_EDIT_DISTANCE = 2
+
+# Default and maximum page size for the medicine listing
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Set MEDICINE_SHARED_STORE to a directory written by `catalogue.py --shared-store`
+# to memory-map the catalogue, so all worker processes share the same pages.
+# Otherwise use the merged CSV with images, or its Feather snapshot if one was built
+def load_medicines():
+    shared_store = os.environ.get('MEDICINE_SHARED_STORE')
+    if shared_store:
+        return Catalogue.open(shared_store)
+    return Catalogue.from_frame(load_catalogue(), max_suggestions=MAX_SUGGESTIONS)
+
+medicines = load_medicines()
+
+# Finished listing pages keyed on the normalised request, so the same
+# type-ahead prefixes skip search, sorting and serialisation
+page_cache = QueryCache(max_size=int(os.environ.get('MEDICINE_CACHE_SIZE', 4096)),
+                        ttl=float(os.environ.get('MEDICINE_CACHE_TTL', 300)))
+
+def _etag(*params):
+    key = repr(params).encode('utf-8')
+    return f"{medicines.version}-{hashlib.blake2b(key, digest_size=8).hexdigest()}"
 
-# Use the merged CSV with images
-csv_path = os.path.join(os.path.dirname(__file__), 'data', 'indian_medicine_data_with_images.csv')
-df = pd.read_csv(csv_path)
+def _price_arg(name):
+    """A finite price from the query string, or None when it is absent"""
+    value = request.args.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        price = float(value)
+    except ValueError:
+        raise ValueError(f'{name} must be a number') from None
+    if not math.isfinite(price):
+        raise ValueError(f'{name} must be a finite number')
+    return price
 
 @app.route('/api/medicines', methods=['GET'])
 def get_medicines():
     query = request.args.get('q', '')
-    if query:
-        filtered = df[df['name'].str.contains(query, case=False, na=False)]
-    else:
-        filtered = df
-    # Replace NaN with empty string
-    filtered = filtered.fillna('')
-    result = filtered.head(100)[['name', 'price(₹)', 'manufacturer_name', 'type', 'pack_size_label', 'short_composition1', 'image_url']].to_dict(orient='records')
-    return jsonify(result)
+    # sort is one of SORT_KEYS, prefixed with '-' for descending order
+    sort = request.args.get('sort', '')
+    descending = sort.startswith('-')
+    sort = (sort[1:] if descending else sort) or None
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    cursor = request.args.get('cursor', None, type=int)
+    # Structured filters; repeat manufacturer/type to accept several values
+    categories = {col: tuple(sorted({v.lower() for v in request.args.getlist(param) if v}))
+                  for param, col in FILTER_PARAMS.items()}
+    categories = {col: values for col, values in categories.items() if values}
+    try:
+        min_price = _price_arg('min_price')
+        max_price = _price_arg('max_price')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    composition = request.args.get('composition', '')
+    # fuzzy=1 or 2 tolerates that many typos per word of q
+    fuzzy = request.args.get('fuzzy', 0, type=int)
+    if sort is not None and sort not in SORT_KEYS:
+        return jsonify({'error': f"sort must be one of: {', '.join(SORT_KEYS)}"}), 400
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+    if not 0 <= fuzzy <= MAX_EDIT_DISTANCE:
+        return jsonify({'error': f'fuzzy must be between 0 and {MAX_EDIT_DISTANCE}'}), 400
+    if cursor is not None and not 0 <= cursor < len(medicines):
+        return jsonify({'error': 'cursor must come from X-Next-Cursor'}), 400
+    if min_price is not None and max_price is not None and min_price > max_price:
+        return jsonify({'error': 'min_price must not exceed max_price'}), 400
+
+    params = (query.lower(), sort, descending, cursor, limit,
+              tuple(sorted(categories.items())), min_price, max_price, composition.lower(), fuzzy)
+    return _listing_response(
+        params, lambda: medicines.filter(query, categories, min_price, max_price, composition, fuzzy),
+        sort, descending, cursor, limit)
+
+@app.route('/api/medicines/by-salt', methods=['GET'])
+def medicines_by_salt():
+    # Every brand containing a salt, cheapest first, to find generic substitutes
+    salt = request.args.get('salt', '')
+    strength = request.args.get('strength', '')
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    cursor = request.args.get('cursor', None, type=int)
+    if not salt.strip():
+        return jsonify({'error': 'salt is required'}), 400
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+    if cursor is not None and not 0 <= cursor < len(medicines):
+        return jsonify({'error': 'cursor must come from X-Next-Cursor'}), 400
+
+    params = ('by-salt', ' '.join(salt.lower().split()), ''.join(strength.lower().split()), cursor, limit)
+    return _listing_response(params, lambda: medicines.salt_index.lookup(salt, strength),
+                             'price', False, cursor, limit)
+
+def _listing_response(params, find_ids, sort, descending, cursor, limit):
+    """One page of find_ids() as a JSON list, with ETag and paging headers"""
+    # The response depends only on the catalogue and these parameters, so a
+    # repeated type-ahead request is answered before any search is run
+    etag = _etag(*params)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    # The catalogue version in the key ties every page to the snapshot it came from
+    cached = page_cache.get((medicines.version,) + params)
+    if cached is None:
+        page_ids, total, next_cursor = medicines.page(find_ids(), sort, descending, cursor, limit)
+        cached = (medicines.to_json(page_ids), total, next_cursor)
+        page_cache.put((medicines.version,) + params, cached)
+    body, total, next_cursor = cached
+
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    # Let browsers keep the body but revalidate it on every use
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Total-Count'] = str(total)
+    if next_cursor is not None:
+        response.headers['X-Next-Cursor'] = str(next_cursor)
+    return response
+
+@app.route('/api/medicines/suggest', methods=['GET'])
+def suggest_medicines():
+    prefix = request.args.get('q', '')
+    limit = request.args.get('limit', 10, type=int)
+    if limit < 1:
+        return jsonify({'error': 'limit must be at least 1'}), 400
+    return jsonify(medicines.suggester.suggest(prefix, min(limit, MAX_SUGGESTIONS)))
+
+@app.route('/api/medicines/stats', methods=['GET'])
+def medicine_stats():
+    return jsonify({
+        'catalogue_version': medicines.version,
+        'medicines': len(medicines),
+        'page_cache': page_cache.stats(),
+    })
 
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True)
@@ -0,0 +1,268 @@
+# benchmark.py (in server/)
+# Micro-benchmarks for the medicine API on synthetic catalogues.
+# Usage: python benchmark.py [search] [--rows 250000 2000000]
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from flask import Flask, jsonify
+
+from catalogue import RESULT_COLUMNS, Catalogue, build_snapshot
+from medicine_index import FuzzyIndex, MedicineIndex, PrefixSuggester, SaltIndex, _within_distance
+
+SYLLABLES = ['para', 'ceta', 'mol', 'amo', 'xi', 'cil', 'lin', 'azi', 'thro', 'my', 'cin', 'do',
+             'lo', 'met', 'for', 'min', 'pan', 'to', 'pra', 'zole', 'ator', 'va', 'sta', 'tin',
+             'cal', 'pol', 'ri', 'vit', 'neu', 'ro', 'bion', 'zin', 'cef', 'ix', 'ime', 'on']
+FORMS = ['Tablet', 'Capsule', 'Syrup', 'Injection', 'Cream', 'Drops', 'Suspension', 'Gel']
+SALTS = ['Paracetamol', 'Amoxycillin', 'Azithromycin', 'Metformin', 'Pantoprazole', 'Atorvastatin',
+         'Cefixime', 'Cetirizine', 'Ibuprofen', 'Diclofenac', 'Ondansetron', 'Clavulanic Acid']
+MANUFACTURERS = [f'{s.title()} Pharmaceuticals Ltd' for s in SYLLABLES[:24]]
+PREFIXES = ['p', 'pa', 'par', 'amoxi', 'dolo 6', 'zz']
+QUERIES = ['pa', 'para', 'amox', 'dolo', 'azithro', 'cin 500', 'zzzz']
+
+
+def synthetic_catalogue(n_rows, seed=0):
+    """Catalogue frame with the same columns as indian_medicine_data_with_images.csv"""
+    rng = np.random.default_rng(seed)
+    syl = np.array(SYLLABLES)
+    brand = syl[rng.integers(0, len(syl), n_rows)]
+    for _ in range(2):
+        brand = np.char.add(brand, syl[rng.integers(0, len(syl), n_rows)])
+    strength = rng.choice(['100', '250', '500', '650', '5', '10', '20', '40'], n_rows)
+    form = np.array(FORMS)[rng.integers(0, len(FORMS), n_rows)]
+    names = [f'{b.title()} {s} {f}' for b, s, f in zip(brand, strength, form)]
+
+    salt = np.array(SALTS)[rng.integers(0, len(SALTS), n_rows)]
+    composition = np.char.add(salt, np.char.add(' (', np.char.add(strength, 'mg)'))).astype(object)
+    # A fifth of the products are combinations with a second salt
+    combined = rng.random(n_rows) < 0.2
+    second = np.array(SALTS)[rng.integers(0, len(SALTS), n_rows)]
+    composition[combined] += ' + ' + second[combined].astype(object) + ' (125mg)'
+    return pd.DataFrame({
+        'id': np.arange(1, n_rows + 1),
+        'name': names,
+        'price(₹)': np.round(rng.gamma(2.0, 60.0, n_rows), 2),
+        'Is_discontinued': rng.random(n_rows) < 0.05,
+        'manufacturer_name': np.array(MANUFACTURERS)[rng.integers(0, len(MANUFACTURERS), n_rows)],
+        'type': rng.choice(['allopathy', 'ayurveda', 'homeopathy'], n_rows, p=[0.9, 0.07, 0.03]),
+        'pack_size_label': np.char.add('strip of ', rng.choice(['10', '15', '6'], n_rows).astype(str)),
+        'short_composition1': composition,
+        'image_url': '',
+    })
+
+
+def timed(fn, repeat=20):
+    """Median wall time of fn() in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return float(np.median(samples))
+
+
+def bench_search(catalogue):
+    """Compare the str.contains scan against the trigram index"""
+    start = time.perf_counter()
+    index = MedicineIndex(catalogue['name'])
+    print(f"  index build: {time.perf_counter() - start:.2f}s, "
+          f"{len(index.gram_keys)} trigrams, {len(index.postings)} postings")
+    print(f"  {'query':<10}{'scan ms':>10}{'index ms':>10}{'hits':>6}")
+    for query in QUERIES:
+        scan = lambda: catalogue[catalogue['name'].str.contains(query, case=False, na=False)].head(100)
+        expected = scan().index.to_numpy()
+        found = index.search(query, limit=100)
+        assert np.array_equal(expected, found), f"index disagrees with scan for {query!r}"
+        print(f"  {query:<10}{timed(scan, 3):>10.2f}{timed(lambda: index.search(query)):>10.3f}{len(found):>6}")
+
+
+def bench_suggest(catalogue):
+    """Prefix completion latency; must stay below a millisecond"""
+    start = time.perf_counter()
+    suggester = PrefixSuggester(catalogue['name'], (~catalogue['Is_discontinued']).astype(float))
+    print(f"  suggester build: {time.perf_counter() - start:.2f}s, {len(suggester.keys)} distinct names")
+    print(f"  {'prefix':<10}{'us':>10}  top hit")
+    for prefix in PREFIXES:
+        hits = suggester.suggest(prefix, 10)
+        assert all(h.lower().startswith(prefix) for h in hits)
+        print(f"  {prefix:<10}{timed(lambda: suggester.suggest(prefix, 10), 200) * 1000:>10.1f}  {hits[:1]}")
+
+
+# Run in a fresh interpreter so each cold start is measured on its own
+# (ru_maxrss survives exec on Linux, so the peak is read from VmHWM instead)
+_COLD_START = '''
+import sys, time
+start = time.perf_counter()
+import catalogue
+df = catalogue.load_catalogue(sys.argv[1], sys.argv[2])
+elapsed = time.perf_counter() - start
+status = dict(line.split(':', 1) for line in open('/proc/self/status'))
+print(elapsed, int(status['VmHWM'].split()[0]) / 1024)
+'''
+
+
+def cold_start(csv_path, snapshot_path):
+    """Seconds and peak RSS (MB) for a new process to load the catalogue"""
+    out = subprocess.run([sys.executable, '-c', _COLD_START, csv_path, snapshot_path],
+                         cwd=os.path.dirname(os.path.abspath(__file__)),
+                         capture_output=True, text=True, check=True).stdout
+    elapsed, rss = map(float, out.split())
+    return elapsed, rss
+
+
+def bench_startup(catalogue):
+    """Cold-start time and peak RSS, CSV versus Feather snapshot"""
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'catalogue.csv')
+        snapshot_path = os.path.join(tmp, 'catalogue.feather')
+        catalogue.to_csv(csv_path, index=False)
+        build_snapshot(csv_path, snapshot_path)
+        print(f"  csv {os.path.getsize(csv_path) / 2**20:.1f}MB, "
+              f"snapshot {os.path.getsize(snapshot_path) / 2**20:.1f}MB")
+        for label, snapshot in [('csv', os.path.join(tmp, 'missing.feather')), ('snapshot', snapshot_path)]:
+            elapsed, rss = cold_start(csv_path, snapshot)
+            print(f"  {label:<10}{elapsed:>8.2f}s{rss:>10.0f}MB peak RSS")
+
+
+# A stand-in for one server worker: load the catalogue, serve the sample
+# queries, then report memory once every sibling worker is up as well
+_WORKER = '''
+import sys
+from catalogue import Catalogue, load_catalogue
+mode, path, queries = sys.argv[1], sys.argv[2], sys.argv[3:]
+if mode == 'shared':
+    medicines = Catalogue.open(path)
+else:
+    medicines = Catalogue.from_frame(load_catalogue(snapshot_path=path))
+for query in queries:
+    medicines.records(medicines.name_index.search(query))
+    medicines.suggester.suggest(query)
+print('ready', flush=True)
+sys.stdin.readline()
+rollup = dict(line.split(':', 1) for line in open('/proc/self/smaps_rollup') if ':' in line)
+print(int(rollup['Rss'].split()[0]) / 1024, int(rollup['Pss'].split()[0]) / 1024)
+'''
+
+
+def worker_memory(mode, path, n_workers):
+    """Mean Rss and Pss (MB) per worker with n_workers running side by side"""
+    workers = [subprocess.Popen([sys.executable, '-c', _WORKER, mode, path, *QUERIES],
+                                cwd=os.path.dirname(os.path.abspath(__file__)),
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+               for _ in range(n_workers)]
+    for worker in workers:
+        assert worker.stdout.readline().strip() == 'ready'
+    samples = [tuple(map(float, worker.communicate('\n')[0].split())) for worker in workers]
+    return tuple(np.mean(samples, axis=0))
+
+
+def bench_workers(catalogue):
+    """Per-worker memory with private frames versus the shared memory-mapped store"""
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = os.path.join(tmp, 'catalogue.feather')
+        store_dir = os.path.join(tmp, 'store')
+        catalogue.to_feather(snapshot_path)
+        Catalogue.from_frame(catalogue).save(store_dir)
+        # Pss splits shared pages between the processes mapping them,
+        # so workers x Pss is the real memory cost of the pool
+        print(f"  {'mode':<8}{'workers':>8}{'Rss MB':>10}{'Pss MB':>10}{'total MB':>10}")
+        for mode, path in [('private', snapshot_path), ('shared', store_dir)]:
+            for n_workers in (1, 8):
+                rss, pss = worker_memory(mode, path, n_workers)
+                print(f"  {mode:<8}{n_workers:>8}{rss:>10.0f}{pss:>10.0f}{pss * n_workers:>10.0f}")
+
+
+def bench_serialise(catalogue):
+    """Cost of turning 100 matched rows into a JSON response body"""
+    medicines = Catalogue.from_frame(catalogue)
+    ids = medicines.name_index.search('para', limit=100)
+
+    def frame_jsonify():
+        rows = catalogue.iloc[ids].fillna('')[RESULT_COLUMNS].to_dict(orient='records')
+        return jsonify(rows).get_data()
+
+    with Flask(__name__).app_context():
+        print(f"  fillna + to_dict + jsonify {timed(frame_jsonify, 200):>8.3f} ms")
+        print(f"  records + jsonify          {timed(lambda: jsonify(medicines.records(ids)).get_data(), 200):>8.3f} ms")
+    print(f"  joined JSON fragments      {timed(lambda: medicines.to_json(ids), 200):>8.3f} ms")
+
+
+def with_typos(word, n_edits, rng):
+    """word with n random deletions, substitutions or transpositions"""
+    for _ in range(n_edits):
+        i = int(rng.integers(0, len(word) - 1))
+        edit = rng.integers(0, 3)
+        if edit == 0:
+            word = word[:i] + word[i + 1:]
+        elif edit == 1:
+            word = word[:i] + 'xq'[i % 2] + word[i + 1:]
+        else:
+            word = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word
+
+
+def bench_fuzzy(catalogue):
+    """Typo-tolerant lookup latency at edit distance 1 and 2, and recall against a full scan"""
+    start = time.perf_counter()
+    index = FuzzyIndex(catalogue['name'])
+    print(f"  fuzzy index build: {time.perf_counter() - start:.2f}s, {len(index.words)} words")
+    rng = np.random.default_rng(1)
+    long_words = [w for w in index.words if len(w) >= 7]
+    for distance in (1, 2):
+        queries = [with_typos(long_words[i], distance, rng) for i in rng.integers(0, len(long_words), 50)]
+        per_query = [timed(lambda: index.search(q, max_distance=distance), 5) for q in queries]
+        # Recall of the deletion dictionary against checking every vocabulary word
+        sample = queries[:5]
+        scan = lambda q: [i for i, w in enumerate(index.words) if _within_distance(q, w, distance)]
+        recall = np.mean([set(index.similar_words(q, distance)) == set(scan(q)) for q in sample])
+        scan_ms = timed(lambda: scan(sample[0]), 1)
+        print(f"  d={distance}: median {np.median(per_query):.2f}ms, p95 {np.percentile(per_query, 95):.2f}ms "
+              f"per query (full vocabulary scan {scan_ms:.0f}ms), exact on {recall:.0%} of sampled queries")
+
+
+def bench_salt(catalogue):
+    """Brands for one salt, cheapest first: regex scan of the composition against the salt index"""
+    prices = catalogue['price(₹)'].to_numpy()
+    price_rank = np.empty(len(prices), dtype=np.int64)
+    price_rank[np.argsort(prices, kind='stable')] = np.arange(len(prices))
+    start = time.perf_counter()
+    index = SaltIndex(catalogue['short_composition1'], order=price_rank)
+    print(f"  salt index build: {time.perf_counter() - start:.2f}s, {len(index.salts)} salts")
+
+    def scan(salt, strength=None):
+        pattern = rf'(?:^|\+)\s*{salt}\s*\(' + (rf'{strength}\)' if strength else '')
+        matches = catalogue[catalogue['short_composition1'].str.contains(pattern, case=False, regex=True)]
+        return matches.sort_values('price(₹)', kind='stable').index.to_numpy()
+
+    # Postings are already cheapest first
+    lookup = index.lookup
+
+    for salt, strength in [('Paracetamol', None), ('Clavulanic Acid', '125mg'), ('Quinine', None)]:
+        same = np.array_equal(scan(salt, strength), lookup(salt, strength))
+        print(f"  {salt} {strength or ''}: scan {timed(lambda: scan(salt, strength), 3):.1f}ms, "
+              f"index {timed(lambda: lookup(salt, strength)):.2f}ms, {len(lookup(salt, strength))} brands, "
+              f"same order: {same}")
+
+
+BENCHMARKS = {'search': bench_search, 'suggest': bench_suggest, 'startup': bench_startup,
+              'workers': bench_workers, 'serialise': bench_serialise,
+              'fuzzy': bench_fuzzy, 'salt': bench_salt}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('benchmarks', nargs='*', default=list(BENCHMARKS),
+                        help=f"any of: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--rows', nargs='+', type=int, default=[250_000, 2_000_000])
+    args = parser.parse_args()
+
+    for n_rows in args.rows:
+        catalogue = synthetic_catalogue(n_rows)
+        for name in args.benchmarks:
+            print(f"[{name}] {n_rows} rows")
+            BENCHMARKS[name](catalogue)
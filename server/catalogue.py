@@ -0,0 +1,323 @@
+# catalogue.py (in server/)
+# Loading of the medicine catalogue and its build steps:
+#   python catalogue.py                      CSV -> columnar Feather snapshot
+#   python catalogue.py --shared-store DIR   catalogue -> memory-mapped store
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from medicine_index import CategoryIndex, FuzzyIndex, MedicineIndex, PrefixSuggester, SaltIndex
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+CSV_PATH = os.path.join(DATA_DIR, 'indian_medicine_data_with_images.csv')
+SNAPSHOT_PATH = os.path.join(DATA_DIR, 'indian_medicine_data_with_images.feather')
+
+# Low-cardinality text columns stored as dictionary codes in the snapshot
+# and served as exact-match filters
+CATEGORY_COLUMNS = ['manufacturer_name', 'type']
+
+# Columns returned for every medicine in API responses
+PRICE_COLUMN = 'price(₹)'
+RESULT_COLUMNS = ['name', PRICE_COLUMN, 'manufacturer_name', 'type', 'pack_size_label', 'short_composition1', 'image_url']
+
+# Free-text column searchable as a composition filter
+COMPOSITION_COLUMN = 'short_composition1'
+
+# Sort keys accepted by the listing API and the column each one orders by
+SORT_KEYS = {'price': PRICE_COLUMN, 'name': 'name', 'manufacturer': 'manufacturer_name'}
+
+
+def read_catalogue_csv(csv_path=CSV_PATH):
+    return pd.read_csv(csv_path)
+
+
+def build_snapshot(csv_path=CSV_PATH, snapshot_path=SNAPSHOT_PATH):
+    """Convert the catalogue CSV into an uncompressed Feather file"""
+    df = read_catalogue_csv(csv_path)
+    df[PRICE_COLUMN] = pd.to_numeric(df[PRICE_COLUMN], errors='coerce')
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].astype('category')
+    # Uncompressed Feather is read straight into Arrow buffers with no decoding
+    df.to_feather(snapshot_path, compression='uncompressed')
+    return df
+
+
+def load_catalogue(csv_path=CSV_PATH, snapshot_path=SNAPSHOT_PATH):
+    """Catalogue frame, read from the snapshot when one has been built"""
+    if os.path.exists(snapshot_path):
+        try:
+            return pd.read_feather(snapshot_path)
+        except ImportError:
+            # pyarrow is optional; without it the CSV still works
+            pass
+    return read_catalogue_csv(csv_path)
+
+
+def _records(columns, ids):
+    """Rows as dicts in the API response shape, NaN replaced by ''"""
+    text_columns = [(col, columns[col]) for col in RESULT_COLUMNS if col != PRICE_COLUMN]
+    prices = columns[PRICE_COLUMN]
+    result = []
+    for i in ids:
+        record = {col: values[i] for col, values in text_columns}
+        price = prices[i]
+        record[PRICE_COLUMN] = '' if np.isnan(price) else float(price)
+        result.append(record)
+    return result
+
+
+class StringColumn:
+    """Strings kept as one UTF-8 byte array plus offsets, so they can be memory-mapped"""
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    @classmethod
+    def from_strings(cls, strings):
+        encoded = [s.encode('utf-8') for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return cls(offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.raw(i).decode('utf-8')
+
+    def raw(self, i):
+        """Encoded bytes of string i"""
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes()
+
+    def __iter__(self):
+        raw = memoryview(self.data)
+        # Convert offsets in blocks to avoid one numpy scalar lookup per string
+        for start in range(0, len(self), 4096):
+            bounds = self.offsets[start:start + 4097].tolist()
+            for lo, hi in zip(bounds, bounds[1:]):
+                yield str(raw[lo:hi], 'utf-8')
+
+
+class Catalogue:
+    """Result columns and search structures used to answer medicine requests"""
+
+    def __init__(self, columns, name_index, suggester, perms, ranks, fragments,
+                 categories, composition_index, sorted_prices, fuzzy_index, salt_index):
+        self.columns = columns
+        self.name_index = name_index
+        self.suggester = suggester
+        # For every sort key: perms[key] lists row ids in sorted order and
+        # ranks[key][row] is that row's position in it
+        self.perms = perms
+        self.ranks = ranks
+        # Every row already serialised as a JSON object, as jsonify would
+        self.fragments = fragments
+        # Content fingerprint, part of every ETag so a rebuilt catalogue
+        # never matches an ETag issued for the previous one
+        self.version = hashlib.blake2b(fragments.data, digest_size=8).hexdigest()
+        # Filter indexes: rows per category value, a trigram index over the
+        # composition, and prices in perms['price'] order for range lookups
+        self.categories = categories
+        self.composition_index = composition_index
+        self.sorted_prices = sorted_prices
+        # Word-level index for typo-tolerant name queries
+        self.fuzzy_index = fuzzy_index
+        # Rows per parsed active ingredient, cheapest first, for generic substitutes
+        self.salt_index = salt_index
+
+    @classmethod
+    def from_frame(cls, df, max_suggestions=20):
+        columns = {}
+        for col in RESULT_COLUMNS:
+            if col == PRICE_COLUMN:
+                columns[col] = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64)
+            else:
+                # NaN is served as an empty string
+                columns[col] = ['' if pd.isna(v) else str(v) for v in df[col]]
+
+        # Sort orders are fixed for the lifetime of the catalogue, so compute
+        # them once; text sorts ignore case and NaN prices sort last
+        perms, ranks = {}, {}
+        for key, col in SORT_KEYS.items():
+            values = columns[col] if col == PRICE_COLUMN else np.array([v.lower() for v in columns[col]], dtype=object)
+            perms[key] = np.argsort(values, kind='stable').astype(np.int32)
+            ranks[key] = np.empty_like(perms[key])
+            ranks[key][perms[key]] = np.arange(len(perms[key]), dtype=np.int32)
+
+        # Serialise every row once, with the separators and key order of jsonify
+        fragments = StringColumn.from_strings(
+            json.dumps(record, sort_keys=True, separators=(',', ':'))
+            for record in _records(columns, range(len(df))))
+
+        # Rank completions by how many active listings carry the name
+        is_active = ~df['Is_discontinued'].astype(str).str.lower().eq('true')
+        return cls(columns, MedicineIndex(df['name']),
+                   PrefixSuggester(df['name'], is_active.astype(float), max_k=max_suggestions),
+                   perms, ranks, fragments,
+                   {col: CategoryIndex(columns[col]) for col in CATEGORY_COLUMNS},
+                   MedicineIndex(columns[COMPOSITION_COLUMN]),
+                   columns[PRICE_COLUMN][perms['price']],
+                   FuzzyIndex(df['name']),
+                   SaltIndex(columns[COMPOSITION_COLUMN], order=ranks['price']))
+
+    def __len__(self):
+        return len(self.columns[PRICE_COLUMN])
+
+    def filter(self, query='', categories=None, min_price=None, max_price=None, composition='', fuzzy=0):
+        """Ascending row ids matching every given filter, or None when none is given.
+
+        With fuzzy > 0 the name query matches words up to that many edits away
+        instead of as a substring.
+
+        categories maps a column in CATEGORY_COLUMNS to accepted values (any of
+        them may match). Each filter is turned into a row bitmap from its
+        index and the bitmaps are intersected.
+        """
+        row_sets = []
+        if query and fuzzy:
+            row_sets.append(self.fuzzy_index.search(query, max_distance=fuzzy))
+        elif query:
+            row_sets.append(self.name_index.search(query, limit=None))
+        for col, values in (categories or {}).items():
+            index = self.categories[col]
+            row_sets.append(np.concatenate([index.lookup(v) for v in values]))
+        if min_price is not None or max_price is not None:
+            lo = 0 if min_price is None else np.searchsorted(self.sorted_prices, min_price, 'left')
+            # NaN prices sort after +inf, so an open upper bound still skips them
+            hi = np.searchsorted(self.sorted_prices, np.inf if max_price is None else max_price, 'right')
+            row_sets.append(self.perms['price'][lo:hi])
+        if composition:
+            row_sets.append(self.composition_index.search(composition, limit=None))
+
+        if not row_sets:
+            return None
+        if len(row_sets) == 1 and (query or composition):
+            # Search results are already unique and ascending
+            return row_sets[0]
+        bitmap = np.zeros(len(self), dtype=bool)
+        bitmap[row_sets[0]] = True
+        for rows in row_sets[1:]:
+            other = np.zeros(len(self), dtype=bool)
+            other[rows] = True
+            bitmap &= other
+        return np.flatnonzero(bitmap)
+
+    def page(self, ids=None, sort=None, descending=False, cursor=None, limit=100):
+        """One page of row ids from `ids` (None for the whole catalogue) in sort order.
+
+        Returns (page_ids, total, next_cursor). A cursor is the position of the
+        last row served within the sorted order, so the next page starts right
+        after it; next_cursor is None on the last page.
+        """
+        n = len(self)
+        # A cursor past the end (e.g. from a replaced catalogue) gives an empty page
+        start = 0 if cursor is None else min(cursor + 1, n)
+
+        if ids is None:
+            # The whole catalogue: the page is a slice of the permutation
+            total = n
+            positions = np.arange(start, min(start + limit, n))
+            if sort is None:
+                page_ids = n - 1 - positions if descending else positions
+            else:
+                perm = self.perms[sort][::-1] if descending else self.perms[sort]
+                page_ids = perm[start:start + limit]
+            end = start + len(page_ids)
+        else:
+            # Only the matches are ordered, by their precomputed integer ranks
+            ids = np.asarray(ids)
+            total = len(ids)
+            positions = ids if sort is None else self.ranks[sort][ids]
+            if descending:
+                positions = n - 1 - positions
+            if np.all(positions[1:] > positions[:-1]):
+                # Already in sort order, e.g. salt postings by price
+                first = np.searchsorted(positions, start)
+                page_ids, positions = ids[first:first + limit], positions[first:first + limit]
+            else:
+                order = np.argsort(positions, kind='stable')
+                first = np.searchsorted(positions[order], start)
+                order = order[first:first + limit]
+                page_ids, positions = ids[order], positions[order]
+            end = first + len(page_ids)
+
+        next_cursor = int(positions[-1]) if end < total else None
+        return page_ids, total, next_cursor
+
+    def to_json(self, ids):
+        """JSON array of the given rows, joined from the precomputed fragments"""
+        fragments = self.fragments
+        return b'[' + b','.join([fragments.raw(i) for i in ids]) + b']\n'
+
+    def records(self, ids):
+        return _records(self.columns, ids)
+
+    def save(self, store_dir):
+        """Write every column and index array as a .npy file under store_dir"""
+        arrays = {f'column.{col}': values for col, values in self.columns.items()}
+        arrays.update({f'index.{k}': v for k, v in self.name_index.to_arrays().items()})
+        arrays.update({f'suggest.{k}': v for k, v in self.suggester.to_arrays().items()})
+        arrays.update({f'perm.{k}': v for k, v in self.perms.items()})
+        arrays.update({f'rank.{k}': v for k, v in self.ranks.items()})
+        arrays['rows.json'] = self.fragments
+        for col, index in self.categories.items():
+            arrays.update({f'category.{col}.{k}': v for k, v in index.to_arrays().items()})
+        arrays.update({f'composition.{k}': v for k, v in self.composition_index.to_arrays().items()})
+        arrays['sorted.price'] = self.sorted_prices
+        arrays.update({f'fuzzy.{k}': v for k, v in self.fuzzy_index.to_arrays().items()})
+        arrays.update({f'salt.{k}': v for k, v in self.salt_index.to_arrays().items()})
+
+        os.makedirs(store_dir, exist_ok=True)
+        for key, values in arrays.items():
+            if isinstance(values, np.ndarray):
+                np.save(os.path.join(store_dir, f'{key}.npy'), values)
+            else:
+                strings = values if isinstance(values, StringColumn) else StringColumn.from_strings(values)
+                np.save(os.path.join(store_dir, f'{key}.str.offsets.npy'), strings.offsets)
+                np.save(os.path.join(store_dir, f'{key}.str.data.npy'), strings.data)
+
+    @classmethod
+    def open(cls, store_dir):
+        """Memory-map a store written by save(); pages are shared between processes"""
+        arrays = {}
+        for filename in os.listdir(store_dir):
+            path = os.path.join(store_dir, filename)
+            if filename.endswith('.str.offsets.npy'):
+                key = filename[:-len('.str.offsets.npy')]
+                arrays[key] = StringColumn(np.load(path, mmap_mode='r'),
+                                           np.load(os.path.join(store_dir, f'{key}.str.data.npy'), mmap_mode='r'))
+            elif filename.endswith('.npy') and not filename.endswith('.str.data.npy'):
+                arrays[filename[:-len('.npy')]] = np.load(path, mmap_mode='r')
+
+        def group(prefix):
+            return {key[len(prefix):]: values for key, values in arrays.items() if key.startswith(prefix)}
+
+        return cls(group('column.'),
+                   MedicineIndex.from_arrays(**group('index.')),
+                   PrefixSuggester.from_arrays(**group('suggest.')),
+                   group('perm.'), group('rank.'), arrays['rows.json'],
+                   {col: CategoryIndex.from_arrays(**group(f'category.{col}.')) for col in CATEGORY_COLUMNS},
+                   MedicineIndex.from_arrays(**group('composition.')),
+                   arrays['sorted.price'],
+                   FuzzyIndex.from_arrays(**group('fuzzy.')),
+                   SaltIndex.from_arrays(**group('salt.')))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', default=CSV_PATH)
+    parser.add_argument('--snapshot', default=SNAPSHOT_PATH)
+    parser.add_argument('--shared-store', help='write a memory-mapped store to this directory instead')
+    args = parser.parse_args()
+
+    if args.shared_store:
+        Catalogue.from_frame(load_catalogue(args.csv, args.snapshot)).save(args.shared_store)
+        print(f"Wrote memory-mapped catalogue to {args.shared_store}")
+    else:
+        df = build_snapshot(args.csv, args.snapshot)
+        print(f"Wrote {len(df)} medicines to {args.snapshot}")
@@ -0,0 +1,421 @@
+# medicine_index.py (in server/)
+from bisect import bisect_left
+import re
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# Code points fit in 21 bits, so three of them pack into one uint64 key
+_CHAR_BITS = 21
+
+
+# Words of a name, for the typo-tolerant index
+_WORD = re.compile(r'\w+')
+
+# One ingredient of a composition such as "Amoxycillin (500mg) + Clavulanic Acid (125mg)"
+_INGREDIENT = re.compile(r'^(.*?)\s*(?:\(([^()]*)\))?$')
+
+
+def _trigram_key(gram):
+    return (ord(gram[0]) << (2 * _CHAR_BITS)) | (ord(gram[1]) << _CHAR_BITS) | ord(gram[2])
+
+
+def _lookup_posting(gram_keys, offsets, postings, gram):
+    key = np.uint64(_trigram_key(gram))
+    pos = np.searchsorted(gram_keys, key)
+    if pos == len(gram_keys) or gram_keys[pos] != key:
+        return None
+    return postings[offsets[pos]:offsets[pos + 1]]
+
+
+def _within_distance(a, b, k):
+    """Whether the Levenshtein distance between a and b is at most k"""
+    if abs(len(a) - len(b)) > k:
+        return False
+    # Only cells within k of the diagonal can stay within budget
+    inf = k + 1
+    prev = [j if j <= k else inf for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        lo, hi = max(1, i - k), min(len(b), i + k)
+        cur = [inf] * (len(b) + 1)
+        cur[0] = i if i <= k else inf
+        for j in range(lo, hi + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost, inf)
+        if min(cur[max(0, lo - 1):hi + 1]) > k:
+            return False
+        prev = cur
+    return prev[len(b)] <= k
+
+
+def parse_composition(composition):
+    """(salt, strength) pairs of a composition, lowercased with whitespace normalised.
+
+    Strengths lose their inner spaces ("500 mg" -> "500mg"); an ingredient
+    without a bracketed strength gets ''.
+    """
+    if not isinstance(composition, str):
+        return []
+    pairs = []
+    for part in composition.split('+'):
+        salt, strength = _INGREDIENT.match(part.strip()).groups()
+        salt = ' '.join(salt.lower().split())
+        if salt:
+            pairs.append((salt, ''.join((strength or '').lower().split())))
+    return pairs
+
+
+class MedicineIndex:
+    """Trigram postings over lowercased medicine names for substring search"""
+
+    def __init__(self, names):
+        # Missing names never match, same as str.contains(..., na=False)
+        self.names = ['' if not isinstance(n, str) else n.lower() for n in names]
+        self.gram_keys, self.offsets, self.postings = self._build_postings(self.names)
+
+    @classmethod
+    def from_arrays(cls, names, gram_keys, offsets, postings):
+        """Index over prebuilt (e.g. memory-mapped) lowercased names and postings"""
+        index = cls.__new__(cls)
+        index.names = names
+        index.gram_keys, index.offsets, index.postings = gram_keys, offsets, postings
+        return index
+
+    def to_arrays(self):
+        return {'names': self.names, 'gram_keys': self.gram_keys,
+                'offsets': self.offsets, 'postings': self.postings}
+
+    @staticmethod
+    def _build_postings(names):
+        # Encode every name into one code point array, separated by NUL,
+        # so all trigrams can be extracted without a Python loop per name
+        joined = '\x00'.join(names)
+        codes = np.frombuffer(joined.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        lengths = np.fromiter((len(n) for n in names), dtype=np.int64, count=len(names))
+        row_of = np.repeat(np.arange(len(names), dtype=np.int32), lengths + 1)[:len(codes)]
+
+        if len(codes) < 3:
+            return np.empty(0, np.uint64), np.zeros(1, np.int64), np.empty(0, np.int32)
+
+        c0, c1, c2 = codes[:-2], codes[1:-1], codes[2:]
+        # Drop trigrams that straddle the separator between two names
+        valid = (c0 != 0) & (c1 != 0) & (c2 != 0)
+        keys = ((c0 << (2 * _CHAR_BITS)) | (c1 << _CHAR_BITS) | c2)[valid]
+        rows = row_of[:-2][valid]
+
+        # A stable sort keeps row ids ascending inside every posting list
+        order = np.argsort(keys, kind='stable')
+        keys, rows = keys[order], rows[order]
+
+        # Collapse repeated trigrams within the same name
+        keep = np.ones(len(keys), dtype=bool)
+        keep[1:] = (keys[1:] != keys[:-1]) | (rows[1:] != rows[:-1])
+        keys, rows = keys[keep], rows[keep]
+
+        gram_keys, starts = np.unique(keys, return_index=True)
+        offsets = np.append(starts, len(keys)).astype(np.int64)
+        return gram_keys, offsets, rows
+
+    def _posting(self, gram):
+        return _lookup_posting(self.gram_keys, self.offsets, self.postings, gram)
+
+    def candidates(self, query):
+        """Row ids whose name contains every trigram of the query, in catalogue order"""
+        grams = {query[i:i + 3] for i in range(len(query) - 2)}
+        lists = []
+        for gram in grams:
+            posting = self._posting(gram)
+            if posting is None:
+                return np.empty(0, dtype=np.int32)
+            lists.append(posting)
+
+        # Intersect from the shortest list so the working set only shrinks
+        lists.sort(key=len)
+        result = lists[0]
+        for posting in lists[1:]:
+            if len(result) == 0:
+                break
+            result = result[np.isin(result, posting, assume_unique=True)]
+        return result
+
+    def search(self, query, limit=100):
+        """Row ids of names containing `query` (case-insensitive); limit=None returns all"""
+        query = query.lower()
+        names = self.names
+        matches = []
+
+        if len(query) < 3:
+            # One or two characters match most names, so scanning in order
+            # and stopping at the limit is cheaper than any posting lookup
+            for i, name in enumerate(names):
+                if query in name:
+                    matches.append(i)
+                    if len(matches) == limit:
+                        break
+            return np.asarray(matches, dtype=np.int32)
+
+        # Trigram hits are a superset; confirm the full substring
+        for i in self.candidates(query):
+            if query in names[i]:
+                matches.append(i)
+                if len(matches) == limit:
+                    break
+        return np.asarray(matches, dtype=np.int32)
+
+
+class PrefixSuggester:
+    """Top-k name completions from a sorted, lowercased name array and bisect"""
+
+    def __init__(self, names, scores, max_k=20, precomputed_depth=3):
+        # Collapse catalogue rows onto distinct names, summing their scores
+        totals = {}
+        for name, score in zip(names, scores):
+            if not isinstance(name, str):
+                continue
+            key = name.lower()
+            if key in totals:
+                totals[key][1] += score
+            else:
+                totals[key] = [name, score]
+
+        self.keys = sorted(totals)
+        self.display = [totals[key][0] for key in self.keys]
+        score = np.fromiter((totals[key][1] for key in self.keys), dtype=np.float64, count=len(self.keys))
+        self.max_k = max_k
+
+        # Global rank of every name: highest score first, ties alphabetical.
+        # Ranks are unique integers, so the best k in any range is an argpartition
+        order = np.lexsort((np.arange(len(score)), -score))
+        self.rank = np.empty(len(order), dtype=np.int64)
+        self.rank[order] = np.arange(len(order))
+
+        # Short prefixes cover huge ranges, so their answers are stored up front
+        # as a sorted prefix list and a matrix of name ids padded with -1
+        self.top_prefixes = sorted({key[:depth] for key in self.keys
+                                    for depth in range(1, min(len(key), precomputed_depth) + 1)})
+        self.top_ids = np.full((len(self.top_prefixes), max_k), -1, dtype=np.int64)
+        for row, prefix in enumerate(self.top_prefixes):
+            ids = self._rank_range(*self._range(prefix), max_k)
+            self.top_ids[row, :len(ids)] = ids
+
+    @classmethod
+    def from_arrays(cls, keys, display, rank, top_prefixes, top_ids):
+        """Suggester over prebuilt (e.g. memory-mapped) name and rank arrays"""
+        suggester = cls.__new__(cls)
+        suggester.keys, suggester.display, suggester.rank = keys, display, rank
+        suggester.top_prefixes, suggester.top_ids = top_prefixes, top_ids
+        suggester.max_k = top_ids.shape[1]
+        return suggester
+
+    def to_arrays(self):
+        return {'keys': self.keys, 'display': self.display, 'rank': self.rank,
+                'top_prefixes': self.top_prefixes, 'top_ids': self.top_ids}
+
+    def _range(self, prefix):
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + '\U0010ffff', lo)
+        return lo, hi
+
+    def _rank_range(self, lo, hi, k):
+        ranks = self.rank[lo:hi]
+        if len(ranks) > k:
+            best = np.argpartition(ranks, k)[:k]
+        else:
+            best = np.arange(len(ranks))
+        return lo + best[np.argsort(ranks[best])]
+
+    def suggest(self, prefix, k=10):
+        """Display names of the k best-scored medicines starting with prefix"""
+        prefix = prefix.lower()
+        k = min(k, self.max_k)
+        if not prefix or k <= 0:
+            return []
+        pos = bisect_left(self.top_prefixes, prefix)
+        if pos < len(self.top_prefixes) and self.top_prefixes[pos] == prefix:
+            ids = self.top_ids[pos]
+            ids = ids[ids >= 0]
+        else:
+            ids = self._rank_range(*self._range(prefix), k)
+        return [self.display[i] for i in ids[:k]]
+
+
+class CategoryIndex:
+    """Rows per distinct value of a categorical column, as CSR postings by value code"""
+
+    def __init__(self, values):
+        keys = np.array(['' if not isinstance(v, str) else v.lower() for v in values], dtype=object)
+        # Codes follow the sorted distinct values, so a value maps to its code by bisect
+        distinct, codes = np.unique(keys, return_inverse=True)
+        self.values = distinct.tolist()
+        self.rows = np.argsort(codes, kind='stable').astype(np.int32)
+        self.offsets = np.zeros(len(distinct) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=len(distinct)), out=self.offsets[1:])
+
+    @classmethod
+    def from_arrays(cls, values, offsets, rows):
+        index = cls.__new__(cls)
+        index.values, index.offsets, index.rows = values, offsets, rows
+        return index
+
+    def to_arrays(self):
+        return {'values': self.values, 'offsets': self.offsets, 'rows': self.rows}
+
+    def lookup(self, value):
+        """Row ids (ascending) whose value equals `value`, ignoring case"""
+        value = value.lower()
+        code = bisect_left(self.values, value)
+        if code == len(self.values) or self.values[code] != value:
+            return self.rows[:0]
+        return self.rows[self.offsets[code]:self.offsets[code + 1]]
+
+
+class SaltIndex:
+    """Rows per active ingredient, as CSR postings by salt with each posting's strength.
+
+    Postings of a salt are ordered by `order` (a rank per row, e.g. by price),
+    or by row id when it is not given.
+    """
+
+    def __init__(self, compositions, order=None):
+        # Catalogues repeat a few thousand compositions, so parse each distinct
+        # one once and post the rows carrying it (missing values have code -1)
+        codes, distinct = pd.factorize(pd.Series(compositions, dtype=object))
+        by_composition = np.argsort(codes, kind='stable').astype(np.int32)
+        bounds = np.searchsorted(codes[by_composition], np.arange(len(distinct) + 1))
+        salts, strengths, repeated, chunks = [], [], [], []
+        for code, composition in enumerate(distinct):
+            seen = set()
+            for salt, strength in dict.fromkeys(parse_composition(composition)):
+                salts.append(salt)
+                strengths.append(strength)
+                # Same salt at a second strength: skipped when any strength matches
+                repeated.append(salt in seen)
+                seen.add(salt)
+                chunks.append(by_composition[bounds[code]:bounds[code + 1]])
+        lengths = [len(chunk) for chunk in chunks]
+        rows = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int32)
+
+        # Salts and strengths are stored as codes into their sorted distinct values
+        distinct_salts, salt_codes = np.unique(np.array(salts, dtype=object), return_inverse=True)
+        self.salts = distinct_salts.tolist()
+        strength_values, strength_codes = np.unique(np.array(strengths, dtype=object), return_inverse=True)
+        self.strength_values = strength_values.tolist()
+        salt_codes = np.repeat(salt_codes, lengths)
+        within_salt = rows if order is None else np.asarray(order)[rows]
+        postings = np.lexsort((within_salt, salt_codes))
+        self.rows = rows[postings]
+        self.strengths = np.repeat(strength_codes, lengths).astype(np.int32)[postings]
+        self.repeated = np.repeat(np.array(repeated, dtype=bool), lengths)[postings]
+        self.offsets = np.zeros(len(distinct_salts) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(salt_codes, minlength=len(distinct_salts)), out=self.offsets[1:])
+
+    @classmethod
+    def from_arrays(cls, salts, strength_values, offsets, rows, strengths, repeated):
+        index = cls.__new__(cls)
+        index.salts, index.strength_values = salts, strength_values
+        index.offsets, index.rows, index.strengths, index.repeated = offsets, rows, strengths, repeated
+        return index
+
+    def to_arrays(self):
+        return {'salts': self.salts, 'strength_values': self.strength_values, 'offsets': self.offsets,
+                'rows': self.rows, 'strengths': self.strengths, 'repeated': self.repeated}
+
+    def _code(self, values, value):
+        code = bisect_left(values, value)
+        return code if code < len(values) and values[code] == value else None
+
+    def lookup(self, salt, strength=None):
+        """Row ids containing salt in posting order, optionally only at the given strength"""
+        code = self._code(self.salts, ' '.join(salt.lower().split()))
+        if code is None:
+            return self.rows[:0]
+        postings = slice(self.offsets[code], self.offsets[code + 1])
+        if not strength:
+            rows, repeated = self.rows[postings], self.repeated[postings]
+            return rows[~repeated] if repeated.any() else rows
+        strength_code = self._code(self.strength_values, ''.join(strength.lower().split()))
+        if strength_code is None:
+            return self.rows[:0]
+        return self.rows[postings][self.strengths[postings] == strength_code]
+
+
+class FuzzyIndex:
+    """Typo-tolerant word search over the name vocabulary with a SymSpell-style
+    deletion dictionary, confirmed with a bounded edit distance"""
+
+    # Only this many leading characters of a word are expanded into deletes
+    PREFIX_LENGTH = 8
+
+    def __init__(self, names, max_distance=2):
+        tokens, token_rows = [], []
+        for row, name in enumerate(names):
+            if isinstance(name, str):
+                words = set(_WORD.findall(name.lower()))
+                tokens.extend(words)
+                token_rows.extend([row] * len(words))
+
+        # Distinct words with CSR postings of the rows containing them
+        distinct, codes = np.unique(np.array(tokens, dtype=object), return_inverse=True)
+        self.words = distinct.tolist()
+        self.word_rows = np.asarray(token_rows, dtype=np.int32)[np.argsort(codes, kind='stable')]
+        self.word_offsets = np.zeros(len(distinct) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=len(distinct)), out=self.word_offsets[1:])
+        self.word_lengths = np.fromiter((len(w) for w in self.words), dtype=np.int32, count=len(self.words))
+
+        # Two words within k edits share a string reachable from both by at most
+        # k deletions. Those strings are stored as crc32 keys (stable across
+        # processes, unlike hash()) sorted alongside the word they came from
+        keys, word_ids = [], []
+        for word_id, word in enumerate(self.words):
+            for variant in self._deletes(word, max_distance):
+                keys.append(zlib.crc32(variant.encode('utf-8')))
+                word_ids.append(word_id)
+        keys = np.asarray(keys, dtype=np.uint32)
+        order = np.argsort(keys, kind='stable')
+        self.delete_keys = keys[order]
+        self.delete_words = np.asarray(word_ids, dtype=np.int32)[order]
+
+    @classmethod
+    def _deletes(cls, word, max_distance):
+        variants = frontier = {word[:cls.PREFIX_LENGTH]}
+        for _ in range(max_distance):
+            frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+            variants = variants | frontier
+        return variants
+
+    @classmethod
+    def from_arrays(cls, words, word_offsets, word_rows, word_lengths, delete_keys, delete_words):
+        index = cls.__new__(cls)
+        index.words, index.word_offsets, index.word_rows = words, word_offsets, word_rows
+        index.word_lengths = word_lengths
+        index.delete_keys, index.delete_words = delete_keys, delete_words
+        return index
+
+    def to_arrays(self):
+        return {'words': self.words, 'word_offsets': self.word_offsets, 'word_rows': self.word_rows,
+                'word_lengths': self.word_lengths, 'delete_keys': self.delete_keys,
+                'delete_words': self.delete_words}
+
+    def similar_words(self, word, max_distance):
+        """Ids of vocabulary words within max_distance edits of word"""
+        keys = np.fromiter((zlib.crc32(v.encode('utf-8')) for v in self._deletes(word, max_distance)),
+                           dtype=np.uint32)
+        lo = np.searchsorted(self.delete_keys, keys, 'left')
+        hi = np.searchsorted(self.delete_keys, keys, 'right')
+        candidates = np.unique(np.concatenate([self.delete_words[a:b] for a, b in zip(lo, hi)]))
+        # Hash collisions and prefix-only agreement are weeded out here
+        candidates = candidates[np.abs(self.word_lengths[candidates] - len(word)) <= max_distance]
+        return [i for i in candidates if _within_distance(word, self.words[i], max_distance)]
+
+    def search(self, query, max_distance=1):
+        """Ascending row ids whose name has, for every query word, a word within max_distance edits"""
+        result = None
+        for word in set(_WORD.findall(query.lower())):
+            word_ids = self.similar_words(word, max_distance)
+            if not word_ids:
+                return np.empty(0, dtype=np.int32)
+            rows = np.unique(np.concatenate(
+                [self.word_rows[self.word_offsets[i]:self.word_offsets[i + 1]] for i in word_ids]))
+            result = rows if result is None else np.intersect1d(result, rows, assume_unique=True)
+        return np.empty(0, dtype=np.int32) if result is None else result
@@ -0,0 +1,42 @@
+# test_shared_store.py (in server/)
+# Workers on the memory-mapped catalogue store share its pages: the catalogue's
+# share of each worker's Pss stays well below the size of the store.
+# Usage: python -m pytest test_shared_store.py
+import os
+import sys
+
+import pytest
+
+from benchmark import synthetic_catalogue, worker_memory
+from catalogue import Catalogue
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith('linux'),
+                                reason='reads Pss from /proc/<pid>/smaps_rollup')
+
+
+@pytest.fixture(scope='module')
+def stores(tmp_path_factory):
+    """(store, baseline store, store size in MB); the baseline holds one row"""
+    tmp = tmp_path_factory.mktemp('stores')
+    catalogue = synthetic_catalogue(100_000)
+    store, baseline = str(tmp / 'store'), str(tmp / 'baseline')
+    Catalogue.from_frame(catalogue).save(store)
+    Catalogue.from_frame(catalogue.head(1)).save(baseline)
+    size = sum(os.path.getsize(os.path.join(store, name)) for name in os.listdir(store)) / 2**20
+    return store, baseline, size
+
+
+def catalogue_pss(store, baseline, n_workers):
+    """Mean Pss (MB) the catalogue adds per worker, over workers on the one-row store"""
+    return worker_memory('shared', store, n_workers)[1] - worker_memory('shared', baseline, n_workers)[1]
+
+
+def test_worker_pss(stores):
+    store, baseline, size = stores
+    one = catalogue_pss(store, baseline, 1)
+    eight = catalogue_pss(store, baseline, 8)
+    # A worker only maps the pages it touches
+    assert one < size
+    # ... and eight split them, instead of each holding its own copy
+    assert eight < size / 3
+    assert eight < one / 2